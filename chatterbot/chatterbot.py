@@ -1,7 +1,11 @@
 import logging
+from contextlib import ExitStack
 from chatterbot.storage import StorageAdapter
 from chatterbot.logic import LogicAdapter
-from chatterbot.search import TextSearch, IndexedTextSearch
+from chatterbot.search import SearchAlgorithmRegistry
+from chatterbot.preprocessors import PreprocessorPipeline
+from chatterbot.instrumentation import instrument_storage_adapter
+from chatterbot.response_cache import track_storage_writes
 from chatterbot import utils
 
 
@@ -19,6 +23,8 @@ class ChatBot(object):
             'chatterbot.logic.BestMatch'
         ])
 
+        instrumentation = kwargs.get('instrumentation', 'chatterbot.instrumentation.Instrumentation')
+
         # Check that each adapter is a valid subclass of it's respective parent
         utils.validate_adapter_class(storage_adapter, StorageAdapter)
 
@@ -27,19 +33,56 @@ class ChatBot(object):
 
         self.storage = utils.initialize_class(storage_adapter, **kwargs)
 
-        primary_search_algorithm = IndexedTextSearch(self, **kwargs)
-        text_search_algorithm = TextSearch(self, **kwargs)
+        # Receives timing events for each stage of generating a response
+        if isinstance(instrumentation, (str, dict, )):
+            self.instrumentation = utils.initialize_class(instrumentation)
+        else:
+            self.instrumentation = instrumentation
+
+        instrument_storage_adapter(self.storage, self.instrumentation)
+
+        # Saves the responses to inputs that are repeated
+        response_cache = kwargs.get('response_cache')
+
+        if isinstance(response_cache, (str, dict, )):
+            self.response_cache = utils.initialize_class(response_cache)
+        else:
+            self.response_cache = response_cache
+
+        if self.response_cache is not None:
+            track_storage_writes(self.storage, self.response_cache)
+
+        # Predicts the tags of the statements that are likely to match an input
+        tag_classifier = kwargs.get('tag_classifier')
+
+        if isinstance(tag_classifier, (str, dict, )):
+            self.tag_classifier = utils.initialize_class(tag_classifier)
+        else:
+            self.tag_classifier = tag_classifier
+
+        search_algorithms = kwargs.get('search_algorithms', [
+            'chatterbot.search.IndexedTextSearch',
+            'chatterbot.search.TextSearch',
+            'chatterbot.search.BM25Search'
+        ])
 
-        self.search_algorithms = {
-            primary_search_algorithm.name: primary_search_algorithm,
-            text_search_algorithm.name: text_search_algorithm
-        }
+        # Search algorithms are created when a logic adapter first uses them
+        self.search_algorithms = SearchAlgorithmRegistry(self, search_algorithms, **kwargs)
 
         for adapter in logic_adapters:
             utils.validate_adapter_class(adapter, LogicAdapter)
             logic_adapter = utils.initialize_class(adapter, self, **kwargs)
             self.logic_adapters.append(logic_adapter)
 
+        if self.response_cache is not None:
+            # Creating a statement can only change the responses to inputs that share a
+            # token with it if the storage adapter and every logic adapter search for
+            # statements by token. The SQL storage adapters match part of a token.
+            self.response_cache.invalidate_by_token = self.storage.searches_by_token and all(
+                getattr(adapter.search_algorithm, 'searches_by_token', False)
+                for adapter in self.logic_adapters
+            )
+
         preprocessors = kwargs.get(
             'preprocessors', [
                 'chatterbot.preprocessors.clean_whitespace'
@@ -51,11 +94,24 @@ class ChatBot(object):
         for preprocessor in preprocessors:
             self.preprocessors.append(utils.import_module(preprocessor))
 
+        self._preprocessor_pipeline = PreprocessorPipeline(self.preprocessors)
+
         self.logger = kwargs.get('logger', logging.getLogger(__name__))
 
         # Allow the bot to save input it receives so that it can learn
         self.read_only = kwargs.get('read_only', False)
 
+    @property
+    def preprocessor_pipeline(self):
+        """
+        Return a pipeline that applies the chat bot's preprocessors.
+        The pipeline is rebuilt when the list of preprocessors changes.
+        """
+        if self._preprocessor_pipeline.preprocessors != tuple(self.preprocessors):
+            self._preprocessor_pipeline = PreprocessorPipeline(self.preprocessors)
+
+        return self._preprocessor_pipeline
+
     def get_response(self, statement=None, **kwargs):
         """
         Return the bot's response based on the input.
@@ -101,37 +157,76 @@ class ChatBot(object):
 
         input_statement.add_tags(*tags)
 
+        with self.instrumentation.timer('get_response'):
+            return self._get_response(
+                input_statement,
+                additional_response_selection_parameters,
+                persist_values_to_response
+            )
+
+    def _get_response(self, input_statement, additional_response_selection_parameters, persist_values_to_response):
         # Preprocess the input statement
-        for preprocessor in self.preprocessors:
-            input_statement = preprocessor(input_statement)
+        with self.instrumentation.timer('preprocess'):
+            input_statement = self.preprocessor_pipeline(input_statement)
 
-        # Make sure the input statement has its search text saved
+        cached_response = None
 
-        if not input_statement.search_text:
-            input_statement.search_text = self.storage.tagger.get_text_index_string(input_statement.text)
+        if self.response_cache is not None:
+            cache_key = self.response_cache.get_key(
+                input_statement.text,
+                [adapter.class_name for adapter in self.logic_adapters],
+                additional_response_selection_parameters
+            )
 
-        if not input_statement.search_in_response_to and input_statement.in_response_to:
-            input_statement.search_in_response_to = self.storage.tagger.get_text_index_string(input_statement.in_response_to)
+            # Read the count before the response is generated so that a response
+            # selected while the storage adapter is written to is not saved
+            write_count = self.response_cache.write_count
 
-        response = self.generate_response(input_statement, additional_response_selection_parameters)
+            cached_response = self.response_cache.get(cache_key)
 
-        # Update any response data that needs to be changed
-        if persist_values_to_response:
-            for response_key in persist_values_to_response:
-                response_value = persist_values_to_response[response_key]
-                if response_key == 'tags':
-                    input_statement.add_tags(*response_value)
-                    response.add_tags(*response_value)
-                else:
-                    setattr(input_statement, response_key, response_value)
-                    setattr(response, response_key, response_value)
+        # The search text is only needed to select a response or to learn from the input
+        if cached_response is None or not self.read_only:
 
-        if not self.read_only:
-            # want to learn that response is valid for input statement
-            self.learn_response(response, input_statement)
+            # Make sure the input statement has its search text saved
+            with self.instrumentation.timer('tag'):
+                if not input_statement.search_text:
+                    input_statement.search_text = self.storage.tagger.get_text_index_string(input_statement.text)
 
-            # also save the input statement
-            self.storage.create(**input_statement.serialize())
+                if not input_statement.search_in_response_to and input_statement.in_response_to:
+                    input_statement.search_in_response_to = self.storage.tagger.get_text_index_string(input_statement.in_response_to)
+
+        # Use a single unit of work for all of the storage calls made for this response
+        with self.storage.unit_of_work():
+            if cached_response is not None:
+                response = self.create_response(input_statement, *cached_response)
+            else:
+                response = self.generate_response(input_statement, additional_response_selection_parameters)
+
+                if self.response_cache is not None:
+                    self.response_cache.set(cache_key, response, write_count, input_statement.search_text)
+
+            # Update any response data that needs to be changed
+            if persist_values_to_response:
+                for response_key in persist_values_to_response:
+                    response_value = persist_values_to_response[response_key]
+                    if response_key == 'tags':
+                        input_statement.add_tags(*response_value)
+                        response.add_tags(*response_value)
+                    else:
+                        setattr(input_statement, response_key, response_value)
+                        setattr(response, response_key, response_value)
+
+            if not self.read_only:
+                with self.instrumentation.timer('learn'), ExitStack() as stack:
+                    if self.response_cache is not None:
+                        # Learning from the response does not change the response saved for this input
+                        stack.enter_context(self.response_cache.learning(cache_key))
+
+                    # want to learn that response is valid for input statement
+                    self.learn_response(response, input_statement)
+
+                    # also save the input statement
+                    self.storage.create(**input_statement.serialize())
 
         return response
 
@@ -141,22 +236,24 @@ class ChatBot(object):
 
         :param input_statement: The input statement to be processed.
         """
-        Statement = self.storage.get_object('statement')
-
         results = []
         result = None
         max_confidence = -1
 
         for adapter in self.logic_adapters:
-            if adapter.can_process(input_statement):
+            with self.instrumentation.timer('can_process', adapter=adapter.class_name):
+                can_process = adapter.can_process(input_statement)
+
+            if can_process:
+
+                with self.instrumentation.timer('process', adapter=adapter.class_name):
+                    output = adapter.process(input_statement, additional_response_selection_parameters)
 
-                output = adapter.process(input_statement, additional_response_selection_parameters)
                 results.append(output)
 
                 self.logger.info(
-                    '{} selected "{}" as a response with a confidence of {}'.format(
-                        adapter.class_name, output.text, output.confidence
-                    )
+                    '%s selected "%s" as a response with a confidence of %s',
+                    adapter.class_name, output.text, output.confidence
                 )
 
                 if output.confidence > max_confidence:
@@ -164,7 +261,7 @@ class ChatBot(object):
                     max_confidence = output.confidence
             else:
                 self.logger.info(
-                    'Not processing the statement using {}'.format(adapter.class_name)
+                    'Not processing the statement using %s', adapter.class_name
                 )
 
         class ResultOption:
@@ -197,14 +294,22 @@ class ChatBot(object):
             if most_common.count > 1:
                 result = most_common.statement
 
+        return self.create_response(input_statement, result.text, result.confidence)
+
+    def create_response(self, input_statement, text, confidence):
+        """
+        Return the chat bot's response to an input statement.
+        """
+        Statement = self.storage.get_object('statement')
+
         response = Statement(
-            text=result.text,
+            text=text,
             in_response_to=input_statement.text,
             conversation=input_statement.conversation,
             persona='bot:' + self.name
         )
 
-        response.confidence = result.confidence
+        response.confidence = confidence
 
         return response
 
@@ -233,10 +338,14 @@ class ChatBot(object):
             if not statement.search_in_response_to:        
                 statement.search_in_response_to = self.storage.tagger.get_text_index_string(previous_statement)
 
-        self.logger.info('Adding "{}" as a response to "{}"'.format(
+        self.logger.info(
+            'Adding "%s" as a response to "%s"',
             statement.text,
             previous_statement_text
-        ))
+        )
+
+        if self.tag_classifier is not None and self.tag_classifier.trained:
+            self.tag_classifier.learn(statement)
 
         # Save the response
         return self.storage.create(**statement.serialize())
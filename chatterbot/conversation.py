@@ -19,6 +19,8 @@ class StatementMixin(object):
         'in_response_to',
         'search_in_response_to',
         'created_at',
+        'occurrences',
+        'last_seen_at',
     ]
 
     extra_statement_field_names = []
@@ -41,6 +43,14 @@ class StatementMixin(object):
         """
         self.tags.extend(tags)
 
+    def get_last_seen_at(self):
+        """
+        Return the date and time that the statement was last seen.
+        Statements that have only been seen once were last seen when
+        they were created.
+        """
+        return self.last_seen_at or self.created_at
+
     def serialize(self):
         """
         :returns: A dictionary representation of the statement object.
@@ -77,6 +87,8 @@ class Statement(StatementMixin):
         'in_response_to',
         'search_in_response_to',
         'created_at',
+        'occurrences',
+        'last_seen_at',
         'confidence',
         'storage',
     )
@@ -100,6 +112,18 @@ class Statement(StatementMixin):
         if not self.created_at.tzinfo:
             self.created_at = self.created_at.replace(tzinfo=UTC)
 
+        # The number of times that this statement has been seen
+        self.occurrences = kwargs.get('occurrences') or 1
+
+        self.last_seen_at = kwargs.get('last_seen_at')
+
+        if self.last_seen_at is not None:
+            if not isinstance(self.last_seen_at, datetime):
+                self.last_seen_at = date_parser.parse(self.last_seen_at)
+
+            if not self.last_seen_at.tzinfo:
+                self.last_seen_at = self.last_seen_at.replace(tzinfo=UTC)
+
         # This is the confidence with which the chat bot believes
         # this is an accurate response. This value is set when the
         # statement is returned by the chat bot.
@@ -118,3 +142,40 @@ class Statement(StatementMixin):
         Save the statement in the database.
         """
         self.storage.update(self)
+
+
+class StatementRecord(object):
+    """
+    A lightweight, partially loaded statement. Storage adapters return
+    these from ``filter`` when a ``fields`` list is provided so that
+    only the requested columns need to be read from the database.
+
+    Fields that were not requested are set to ``None``.
+    """
+
+    __slots__ = (
+        'id',
+        'text',
+        'search_text',
+        'conversation',
+        'persona',
+        'tags',
+        'in_response_to',
+        'search_in_response_to',
+        'created_at',
+        'occurrences',
+        'last_seen_at',
+        'confidence',
+    )
+
+    def __init__(self, **kwargs):
+        for field_name in self.__slots__:
+            setattr(self, field_name, kwargs.get(field_name))
+
+        self.confidence = 0
+
+    def __str__(self):
+        return self.text
+
+    def __repr__(self):
+        return '<StatementRecord text:%s>' % (self.text)
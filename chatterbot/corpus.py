@@ -1,12 +1,22 @@
 import os
 import io
 import glob
+import gzip
+import json
+import hashlib
 import yaml
 from chatterbot_corpus.corpus import DATA_DIRECTORY
 
 
 CORPUS_EXTENSION = 'yml'
 
+COMPILED_CORPUS_EXTENSION = 'corpus.gz'
+
+COMPILED_CORPUS_VERSION = 1
+
+# Use the C implementation of the YAML loader when it is available
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
 
 def get_file_path(dotted_path, extension='json'):
     """
@@ -35,7 +45,7 @@ def read_corpus(file_name):
     Read and return the data from a corpus json file.
     """
     with io.open(file_name, encoding='utf-8') as data_file:
-        return yaml.load(data_file)
+        return yaml.load(data_file, Loader=YAML_LOADER)
 
 
 def list_corpus_files(dotted_path):
@@ -68,3 +78,49 @@ def load_corpus(*data_file_paths):
         categories = corpus_data.get('categories', [])
 
         yield corpus, categories, file_path
+
+
+def get_corpus_hash(*data_file_paths):
+    """
+    Return a hash of the contents of the specified corpus files.
+    """
+    corpus_hash = hashlib.sha256()
+
+    for file_path in data_file_paths:
+        with open(file_path, 'rb') as data_file:
+            corpus_hash.update(hashlib.sha256(data_file.read()).digest())
+
+    return corpus_hash.hexdigest()
+
+
+def is_compiled_corpus(file_path):
+    """
+    Return True if the file path is for a compiled corpus file.
+    """
+    return file_path.endswith('.' + COMPILED_CORPUS_EXTENSION)
+
+
+def write_compiled_corpus(file_name, data):
+    """
+    Write the data for a compiled corpus to a compressed file.
+    """
+    data['version'] = COMPILED_CORPUS_VERSION
+
+    with gzip.open(file_name, 'wt', encoding='utf-8') as data_file:
+        json.dump(data, data_file, ensure_ascii=False, separators=(',', ':'))
+
+
+def read_compiled_corpus(file_name):
+    """
+    Read and return the data from a compiled corpus file.
+    """
+    with gzip.open(file_name, 'rt', encoding='utf-8') as data_file:
+        data = json.load(data_file)
+
+    if data.get('version') != COMPILED_CORPUS_VERSION:
+        raise ValueError(
+            'The compiled corpus {} was created with an unsupported version '
+            'of ChatterBot and must be compiled again.'.format(file_name)
+        )
+
+    return data
@@ -49,7 +49,8 @@ class AbstractBaseStatement(models.Model, StatementMixin):
     """
 
     text = models.CharField(
-        max_length=constants.STATEMENT_TEXT_MAX_LENGTH
+        max_length=constants.STATEMENT_TEXT_MAX_LENGTH,
+        db_index=True
     )
 
     search_text = models.CharField(
@@ -80,6 +81,17 @@ class AbstractBaseStatement(models.Model, StatementMixin):
         max_length=constants.PERSONA_MAX_LENGTH
     )
 
+    occurrences = models.PositiveIntegerField(
+        default=1,
+        help_text='The number of times that the statement has been seen.'
+    )
+
+    last_seen_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text='The date and time that the statement was last seen at.'
+    )
+
     tags = models.ManyToManyField(
         TAG_MODEL,
         related_name='statements'
@@ -105,7 +117,7 @@ class AbstractBaseStatement(models.Model, StatementMixin):
         Return the list of tags for this statement.
         (Overrides the method from StatementMixin)
         """
-        return list(self.tags.values_list('name', flat=True))
+        return [tag.name for tag in self.tags.all()]
 
     def add_tags(self, *tags):
         """
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    """
+    Combine statements that have the same text and in_response_to values
+    into a single statement that keeps their total number of occurrences.
+    """
+
+    help = 'Combine duplicate statements into a single statement with an occurrence count.'
+
+    def handle(self, *args, **options):
+        from chatterbot.ext.django_chatterbot import settings
+        from chatterbot.storage import DjangoStorageAdapter
+        from chatterbot.tagging import LowercaseTagger
+
+        # Statements are not tagged when they are compacted
+        storage = DjangoStorageAdapter(
+            django_app_name=settings.CHATTERBOT['django_app_name'],
+            deduplicate_statements=settings.CHATTERBOT.get('deduplicate_statements', False),
+            tagger=LowercaseTagger
+        )
+
+        removed_count = storage.compact()
+
+        self.stdout.write('Removed {} duplicate statements.'.format(removed_count))
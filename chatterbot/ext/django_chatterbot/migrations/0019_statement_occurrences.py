@@ -0,0 +1,33 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_chatterbot', '0018_text_max_length'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='statement',
+            name='occurrences',
+            field=models.PositiveIntegerField(
+                default=1,
+                help_text='The number of times that the statement has been seen.'
+            ),
+        ),
+        migrations.AddField(
+            model_name='statement',
+            name='last_seen_at',
+            field=models.DateTimeField(
+                blank=True,
+                null=True,
+                help_text='The date and time that the statement was last seen at.'
+            ),
+        ),
+        migrations.AlterField(
+            model_name='statement',
+            name='text',
+            field=models.CharField(db_index=True, max_length=255),
+        ),
+    ]
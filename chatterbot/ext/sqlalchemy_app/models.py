@@ -1,4 +1,4 @@
-from sqlalchemy import Table, Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Table, Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from sqlalchemy.ext.declarative import declared_attr, declarative_base
@@ -29,11 +29,31 @@ class ModelBase(object):
 Base = declarative_base(cls=ModelBase)
 
 
+# Increased when columns or indexes are added to the tables, so that
+# databases created by an earlier version are upgraded when they are opened
+SCHEMA_VERSION = 1
+
+
+schema_version_table = Table(
+    'schema_version',
+    Base.metadata,
+    Column('version', Integer, nullable=False)
+)
+
+
+# Only created in databases of deduplicated statements, which have one
+# statement for each pair of text and in_response_to values
+UNIQUE_STATEMENT_INDEX_NAME = 'ix_statement_unique_text_in_response_to'
+
+
 tag_association_table = Table(
     'tag_association',
     Base.metadata,
     Column('tag_id', Integer, ForeignKey('tag.id')),
-    Column('statement_id', Integer, ForeignKey('statement.id'))
+    Column('statement_id', Integer, ForeignKey('statement.id')),
+
+    # The ids of the statements with each tag, used to filter statements by tag
+    Index('ix_tag_association_tag_id_statement_id', 'tag_id', 'statement_id')
 )
 
 
@@ -55,6 +75,11 @@ class Statement(Base, StatementMixin):
 
     confidence = 0
 
+    __table_args__ = (
+        # Used to find the existing statement for a response
+        Index('ix_statement_text_in_response_to', 'text', 'in_response_to'),
+    )
+
     text = Column(
         String(constants.STATEMENT_TEXT_MAX_LENGTH)
     )
@@ -99,6 +124,18 @@ class Statement(Base, StatementMixin):
         server_default=''
     )
 
+    occurrences = Column(
+        Integer,
+        nullable=False,
+        default=1,
+        server_default='1'
+    )
+
+    last_seen_at = Column(
+        DateTime(timezone=True),
+        nullable=True
+    )
+
     def get_tags(self):
         """
         Return a list of tags for this statement.
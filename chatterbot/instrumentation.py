@@ -0,0 +1,193 @@
+"""
+Instrumentation receives timing events for each stage of generating a response.
+"""
+import threading
+from time import perf_counter
+from contextlib import contextmanager
+from functools import wraps
+
+
+# The storage adapter methods that read statements, which are timed when
+# instrumentation is enabled. Writes are timed by the storage adapter.
+STORAGE_READ_METHODS = (
+    'count',
+    'filter',
+    'get_random',
+)
+
+
+class Instrumentation(object):
+    """
+    The base instrumentation class. Events are ignored by default.
+
+    Subclasses should set ``enabled`` to ``True`` and override
+    ``record`` to handle timing events.
+
+    Events are recorded with the name of the stage and its duration in
+    seconds. Some events include labels, such as the ``adapter`` that
+    processed a statement or the storage ``method`` that was called:
+
+    - ``get_response``
+    - ``preprocess``
+    - ``tag``
+    - ``can_process`` (``adapter``)
+    - ``process`` (``adapter``)
+    - ``storage`` (``method``)
+    - ``learn``
+    """
+
+    enabled = False
+
+    def __init__(self, **kwargs):
+        pass
+
+    def record(self, event, duration, **labels):
+        """
+        Record the duration of an event.
+        """
+        pass
+
+    @contextmanager
+    def timer(self, event, **labels):
+        """
+        A context manager that records the time taken by the code within it.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        start_time = perf_counter()
+        try:
+            yield
+        finally:
+            self.record(event, perf_counter() - start_time, **labels)
+
+
+class HistogramInstrumentation(Instrumentation):
+    """
+    Collects timing events into cumulative histograms, in the
+    same form as a Prometheus histogram metric.
+
+    :param buckets: The upper bounds of the histogram buckets in seconds.
+    :param prefix: The prefix used for metric names when exporting.
+    """
+
+    enabled = True
+
+    DEFAULT_BUCKETS = (
+        0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+    )
+
+    def __init__(self, buckets=None, prefix='chatterbot', **kwargs):
+        super().__init__(**kwargs)
+        self.buckets = tuple(sorted(buckets or self.DEFAULT_BUCKETS))
+        self.prefix = prefix
+        self.histograms = {}
+        self.lock = threading.Lock()
+
+    def record(self, event, duration, **labels):
+        key = (event, tuple(sorted(labels.items())))
+
+        with self.lock:
+            histogram = self.histograms.get(key)
+
+            if histogram is None:
+                histogram = {
+                    'buckets': [0] * len(self.buckets),
+                    'count': 0,
+                    'sum': 0.0,
+                }
+                self.histograms[key] = histogram
+
+            for index, upper_bound in enumerate(self.buckets):
+                if duration <= upper_bound:
+                    histogram['buckets'][index] += 1
+
+            histogram['count'] += 1
+            histogram['sum'] += duration
+
+    def get_histogram(self, event, **labels):
+        """
+        Return the histogram for an event, or None if it has not been recorded.
+        """
+        return self.histograms.get((event, tuple(sorted(labels.items()))))
+
+    def export(self):
+        """
+        Return the histograms in the Prometheus text exposition format.
+        """
+        lines = []
+
+        with self.lock:
+            for (event, labels), histogram in sorted(self.histograms.items()):
+                name = '{}_{}_seconds'.format(self.prefix, event)
+                label_text = ','.join('{}="{}"'.format(key, value) for key, value in labels)
+
+                for upper_bound, count in zip(self.buckets, histogram['buckets']):
+                    bucket_labels = ','.join(filter(None, [label_text, 'le="{}"'.format(upper_bound)]))
+                    lines.append('{}_bucket{{{}}} {}'.format(name, bucket_labels, count))
+
+                bucket_labels = ','.join(filter(None, [label_text, 'le="+Inf"']))
+                lines.append('{}_bucket{{{}}} {}'.format(name, bucket_labels, histogram['count']))
+
+                suffix = '{{{}}}'.format(label_text) if label_text else ''
+                lines.append('{}_sum{} {}'.format(name, suffix, histogram['sum']))
+                lines.append('{}_count{} {}'.format(name, suffix, histogram['count']))
+
+        return '\n'.join(lines) + '\n'
+
+
+def instrument_storage_adapter(storage, instrumentation):
+    """
+    Time each call made to the storage adapter's methods.
+    Results from ``filter`` are timed until they have been fully read.
+    """
+    if not instrumentation.enabled:
+        return
+
+    for method_name in STORAGE_READ_METHODS:
+        method = getattr(storage, method_name)
+
+        if method_name == 'filter':
+            setattr(storage, method_name, _timed_generator(method, instrumentation))
+        else:
+            setattr(storage, method_name, _timed_method(method, method_name, instrumentation))
+
+    def record_write(method_name, statements, duration):
+        instrumentation.record('storage', duration, method=method_name)
+
+    storage.add_write_listener(record_write)
+
+
+def _timed_method(method, method_name, instrumentation):
+
+    @wraps(method)
+    def timed_method(*args, **kwargs):
+        with instrumentation.timer('storage', method=method_name):
+            return method(*args, **kwargs)
+
+    return timed_method
+
+
+def _timed_generator(method, instrumentation):
+
+    @wraps(method)
+    def timed_generator(*args, **kwargs):
+        results = method(*args, **kwargs)
+        duration = 0
+
+        try:
+            while True:
+                start_time = perf_counter()
+                try:
+                    result = next(results)
+                except StopIteration:
+                    break
+                finally:
+                    duration += perf_counter() - start_time
+
+                yield result
+        finally:
+            instrumentation.record('storage', duration, method='filter')
+
+    return timed_generator
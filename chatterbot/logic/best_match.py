@@ -37,9 +37,10 @@ class BestMatch(LogicAdapter):
             if result.confidence >= self.maximum_similarity_threshold:
                 break
 
-        self.chatbot.logger.info('Using "{}" as a close match to "{}" with a confidence of {}'.format(
+        self.chatbot.logger.info(
+            'Using "%s" as a close match to "%s" with a confidence of %s',
             closest_match.text, input_statement.text, closest_match.confidence
-        ))
+        )
 
         recent_repeated_responses = None
 
@@ -51,9 +52,10 @@ class BestMatch(LogicAdapter):
             )
 
             for index, recent_repeated_response in enumerate(recent_repeated_responses):
-                self.chatbot.logger.info('{}. Excluding recent repeated response of "{}"'.format(
+                self.chatbot.logger.info(
+                    '%s. Excluding recent repeated response of "%s"',
                     index, recent_repeated_response
-                ))
+                )
 
         response_selection_parameters = {
             'search_in_response_to': closest_match.search_text,
@@ -84,9 +86,8 @@ class BestMatch(LogicAdapter):
 
         if response_list:
             self.chatbot.logger.info(
-                'Selecting response from {} optimal responses.'.format(
-                    len(response_list)
-                )
+                'Selecting response from %s optimal responses.',
+                len(response_list)
             )
 
             response = self.select_response(
@@ -96,16 +97,15 @@ class BestMatch(LogicAdapter):
             )
 
             response.confidence = closest_match.confidence
-            self.chatbot.logger.info('Response selected. Using "{}"'.format(response.text))
+            self.chatbot.logger.info('Response selected. Using "%s"', response.text)
         elif alternate_response_list:
             '''
             The case where there was no responses returned for the selected match
             but a value exists for the statement the match is in response to.
             '''
             self.chatbot.logger.info(
-                'Selecting response from {} optimal alternate responses.'.format(
-                    len(alternate_response_list)
-                )
+                'Selecting response from %s optimal alternate responses.',
+                len(alternate_response_list)
             )
             response = self.select_response(
                 input_statement,
@@ -114,7 +114,7 @@ class BestMatch(LogicAdapter):
             )
 
             response.confidence = closest_match.confidence
-            self.chatbot.logger.info('Alternate response selected. Using "{}"'.format(response.text))
+            self.chatbot.logger.info('Alternate response selected. Using "%s"', response.text)
         else:
             response = self.get_default_response(input_statement)
 
@@ -1,22 +1,20 @@
 """
 Statement pre-processors.
 """
+import re
+import html
+import unicodedata
+
+
+# Linebreaks, tabs and spaces that should be collapsed into a single space
+WHITESPACE_PATTERN = re.compile('[ \n\r\t]+')
 
 
 def clean_whitespace(statement):
     """
     Remove any consecutive whitespace characters from the statement text.
     """
-    import re
-
-    # Replace linebreaks and tabs with spaces
-    statement.text = statement.text.replace('\n', ' ').replace('\r', ' ').replace('\t', ' ')
-
-    # Remove any leeding or trailing whitespace
-    statement.text = statement.text.strip()
-
-    # Remove consecutive spaces
-    statement.text = re.sub(' +', ' ', statement.text)
+    statement.text = clean_whitespace_text(statement.text)
 
     return statement
 
@@ -26,9 +24,7 @@ def unescape_html(statement):
     Convert escaped html characters into unescaped html characters.
     For example: "&lt;b&gt;" becomes "<b>".
     """
-    import html
-
-    statement.text = html.unescape(statement.text)
+    statement.text = unescape_html_text(statement.text)
 
     return statement
 
@@ -38,10 +34,102 @@ def convert_to_ascii(statement):
     Converts unicode characters to ASCII character equivalents.
     For example: "på fédéral" becomes "pa federal".
     """
-    import unicodedata
+    statement.text = convert_to_ascii_text(statement.text)
 
-    text = unicodedata.normalize('NFKD', statement.text)
-    text = text.encode('ascii', 'ignore').decode('utf-8')
-
-    statement.text = str(text)
     return statement
+
+
+def clean_whitespace_text(text):
+    """
+    Replace linebreaks, tabs and consecutive spaces with a single
+    space and remove any leading or trailing whitespace.
+    """
+    return WHITESPACE_PATTERN.sub(' ', text).strip()
+
+
+def unescape_html_text(text):
+    """
+    Convert escaped html characters in a string into unescaped html characters.
+    """
+    return html.unescape(text)
+
+
+def convert_to_ascii_text(text):
+    """
+    Convert the unicode characters in a string to ASCII character equivalents.
+    """
+    text = unicodedata.normalize('NFKD', text)
+    return text.encode('ascii', 'ignore').decode('utf-8')
+
+
+# The string transformation used by each of the built-in preprocessors
+TEXT_PREPROCESSORS = {
+    clean_whitespace: clean_whitespace_text,
+    unescape_html: unescape_html_text,
+    convert_to_ascii: convert_to_ascii_text,
+}
+
+
+class PreprocessorPipeline(object):
+    """
+    Applies a sequence of preprocessors to statements.
+
+    Consecutive built-in preprocessors are combined into a single step
+    that applies each of their string transformations in turn, so the
+    statement text is only read and assigned once for the whole group.
+    Any other preprocessor is called with the statement as usual.
+
+    :param preprocessors: A list of preprocessor functions.
+    """
+
+    def __init__(self, preprocessors):
+        self.preprocessors = tuple(preprocessors)
+        self.steps = []
+
+        text_functions = []
+
+        for preprocessor in self.preprocessors:
+            text_function = TEXT_PREPROCESSORS.get(preprocessor)
+
+            if text_function:
+                text_functions.append(text_function)
+            else:
+                if text_functions:
+                    self.steps.append(self._combine(text_functions))
+                    text_functions = []
+
+                self.steps.append(preprocessor)
+
+        if text_functions:
+            self.steps.append(self._combine(text_functions))
+
+    def _combine(self, text_functions):
+        """
+        Return a preprocessor that applies each of the text functions.
+        """
+        def preprocess_text(statement):
+            text = statement.text
+
+            for text_function in text_functions:
+                text = text_function(text)
+
+            statement.text = text
+
+            return statement
+
+        return preprocess_text
+
+    def __call__(self, statement):
+        """
+        Return the statement after it has been preprocessed.
+        """
+        for step in self.steps:
+            statement = step(statement)
+
+        return statement
+
+    def process_many(self, statements):
+        """
+        Return a list of the preprocessed statements.
+        """
+        return [self(statement) for statement in statements]
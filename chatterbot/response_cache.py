@@ -0,0 +1,177 @@
+"""
+A cache of the responses generated for inputs that are repeated.
+"""
+import threading
+from time import monotonic
+from collections import OrderedDict
+from contextlib import contextmanager
+from chatterbot import utils
+
+
+class ResponseCache(object):
+    """
+    Saves the text and confidence of the response that was selected for
+    each input. Responses are removed after ``ttl`` seconds, when more than
+    ``max_size`` responses have been saved, or when statements that could
+    change them are written to the chat bot's storage adapter.
+
+    Each response is saved with the tokens of the input's search text. When
+    statements are created, only the responses to inputs that share a token
+    with the search text or the search in_response_to value of a new statement
+    are removed, because search algorithms that look up statements by token
+    only select responses from those statements. This is only done when the
+    ``searches_by_token`` attribute of the chat bot's storage adapter is true, which is
+    the case for the MongoDB and in-memory storage adapters. Otherwise
+    creating a statement removes all of the saved responses. The statements that the chat
+    bot saves when it learns from a response do not remove the response to the
+    same input, since they record the response that was already selected.
+    Any other write removes all of the saved responses.
+
+    :param max_size: The number of responses to keep.
+    :param ttl: The number of seconds to keep each response for.
+    """
+
+    def __init__(self, max_size=1000, ttl=300, **kwargs):
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self.responses = OrderedDict()
+        self.lock = threading.Lock()
+
+        # Set to False when a logic adapter uses a search that does not look up statements by token
+        self.invalidate_by_token = True
+
+        # The key of the response that the chat bot is learning from in each thread
+        self._learning = threading.local()
+
+        # Increased each time the storage adapter is written to
+        self.write_count = 0
+
+        self.hits = 0
+        self.misses = 0
+
+    def get_key(self, text, adapter_names, additional_response_selection_parameters):
+        """
+        Return the key for the response to an input.
+        """
+        return (
+            tuple(adapter_names),
+            text,
+            utils.freeze(additional_response_selection_parameters or {}),
+        )
+
+    def get(self, key):
+        """
+        Return the text and confidence of a saved response, or None.
+        """
+        with self.lock:
+            entry = self.responses.get(key)
+
+            if entry is not None:
+                text, confidence, expires_at, tokens = entry
+
+                if expires_at > monotonic():
+                    self.responses.move_to_end(key)
+                    self.hits += 1
+                    return text, confidence
+
+                del self.responses[key]
+
+            self.misses += 1
+
+        return None
+
+    def set(self, key, response, write_count, search_text=None):
+        """
+        Save a response. The response is not saved if the storage adapter
+        has been written to since ``write_count`` was read.
+
+        :param search_text: The search text of the input the response was selected for.
+        """
+        tokens = _get_tokens(search_text)
+
+        with self.lock:
+            if write_count != self.write_count:
+                return
+
+            self.responses[key] = (
+                response.text, response.confidence, monotonic() + self.ttl, tokens,
+            )
+            self.responses.move_to_end(key)
+
+            while len(self.responses) > self.max_size:
+                self.responses.popitem(last=False)
+
+    @contextmanager
+    def learning(self, key):
+        """
+        Mark the statements written within this context as the ones that the
+        chat bot saves when it learns from the response saved for ``key``.
+        """
+        self._learning.key = key
+
+        try:
+            yield
+        finally:
+            self._learning.key = None
+
+    def record_write(self, statements=None):
+        """
+        Remove the saved responses that the written statements could change.
+        All saved responses, other than the one being learned from, are
+        removed if the statements are not known.
+        """
+        write_tokens = None
+
+        if statements is not None and self.invalidate_by_token:
+            write_tokens = set()
+
+            for statement in statements:
+                search_text_tokens = _get_tokens(getattr(statement, 'search_text', None))
+
+                # The search text is set by the storage adapter when it is missing
+                if not search_text_tokens:
+                    write_tokens = None
+                    break
+
+                write_tokens.update(search_text_tokens)
+                write_tokens.update(_get_tokens(getattr(statement, 'search_in_response_to', None)))
+
+        with self.lock:
+            self.write_count += 1
+
+            learning_key = getattr(self._learning, 'key', None)
+
+            for key, entry in list(self.responses.items()):
+                tokens = entry[3]
+
+                if key == learning_key:
+                    continue
+
+                if write_tokens is None or not tokens or tokens & write_tokens:
+                    del self.responses[key]
+
+    def cache_info(self):
+        """
+        Return the number of cache hits and misses and the number of saved responses.
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self.responses),
+        }
+
+
+def track_storage_writes(storage, response_cache):
+    """
+    Report each call made to the storage adapter's methods that write statements.
+    """
+    def record_write(method_name, statements, duration):
+        response_cache.record_write(statements)
+
+    storage.add_write_listener(record_write)
+
+
+def _get_tokens(search_text):
+    return frozenset(token for token in (search_text or '').split(' ') if token)
+
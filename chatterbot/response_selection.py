@@ -27,10 +27,14 @@ def get_most_frequent_response(input_statement, response_list, storage=None):
     logger.info('Selecting response with greatest number of occurrences.')
 
     for statement in response_list:
-        count = len(list(storage.filter(
-            text=statement.text,
-            in_response_to=input_statement.text)
-        ))
+        count = sum(
+            matching_statement.occurrences or 1
+            for matching_statement in storage.filter(
+                text=statement.text,
+                in_response_to=input_statement.text,
+                fields=['occurrences']
+            )
+        )
 
         # Keep the more common statement
         if count >= occurrence_count:
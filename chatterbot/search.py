@@ -1,3 +1,16 @@
+from collections.abc import Mapping
+
+
+# The statement fields that are needed to compare and score search candidates
+SEARCH_FIELDS = [
+    'id',
+    'text',
+    'search_text',
+    'conversation',
+    'in_response_to',
+]
+
+
 class IndexedTextSearch:
     """
     :param statement_comparison_function: A comparison class.
@@ -6,10 +19,29 @@ class IndexedTextSearch:
     :param search_page_size:
         The maximum number of records to load into memory at a time when searching.
         Defaults to 1000
+
+    :param search_fields:
+        The statement fields to load for each search candidate. Candidates are
+        only compared and scored, so the remaining fields do not need to be
+        read from storage. Set this to ``None`` to load full statements.
+        Defaults to ``SEARCH_FIELDS``
+
+    :param maximum_similarity_threshold:
+        The confidence a statement with the predicted tags must reach for
+        the remaining statements not to be searched.
+        Defaults to 0.95
+
+    If the chat bot has a ``tag_classifier``, the statements with the tags
+    that the input most likely belongs to are searched first. All statements
+    are searched if none of those statements reach the
+    ``maximum_similarity_threshold``.
     """
 
     name = 'indexed_text_search'
 
+    # Only statements that share a token with the input are candidates
+    searches_by_token = True
+
     def __init__(self, chatbot, **kwargs):
         from chatterbot.comparisons import LevenshteinDistance
 
@@ -28,6 +60,14 @@ class IndexedTextSearch:
             'search_page_size', 1000
         )
 
+        self.search_fields = kwargs.get(
+            'search_fields', SEARCH_FIELDS
+        )
+
+        self.maximum_similarity_threshold = kwargs.get(
+            'maximum_similarity_threshold', 0.95
+        )
+
     def search(self, input_statement, **additional_parameters):
         """
         Search for close matches to the input. Confidence scores for
@@ -46,7 +86,7 @@ class IndexedTextSearch:
         input_search_text = input_statement.search_text
 
         if not input_statement.search_text:
-            self.chatbot.logger.warn(
+            self.chatbot.logger.warning(
                 'No value for search_text was available on the provided input'
             )
 
@@ -57,16 +97,49 @@ class IndexedTextSearch:
         search_parameters = {
             'search_text_contains': input_search_text,
             'persona_not_startswith': 'bot:',
-            'page_size': self.search_page_size
+            'page_size': self.search_page_size,
+            'fields': self.search_fields
         }
 
         if additional_parameters:
             search_parameters.update(additional_parameters)
 
-        statement_list = self.chatbot.storage.filter(**search_parameters)
-
+        search_tags = []
         best_confidence_so_far = 0
 
+        if 'tags' not in search_parameters:
+            search_tags = self.get_search_tags(input_search_text)
+
+        if search_tags:
+            self.chatbot.logger.info('Searching statements tagged %s first', search_tags)
+
+            tagged_parameters = dict(search_parameters, tags=search_tags)
+
+            for statement in self._search(input_statement, tagged_parameters):
+                best_confidence_so_far = statement.confidence
+                yield statement
+
+            if best_confidence_so_far >= self.maximum_similarity_threshold:
+                return
+
+        yield from self._search(input_statement, search_parameters, best_confidence_so_far)
+
+    def get_search_tags(self, input_search_text):
+        """
+        Return the tags predicted for the input by the chat bot's tag classifier.
+        """
+        tag_classifier = getattr(self.chatbot, 'tag_classifier', None)
+
+        if tag_classifier is None:
+            return []
+
+        tag_classifier.ensure_trained(self.chatbot.storage.filter)
+
+        return tag_classifier.get_tags(input_search_text)
+
+    def _search(self, input_statement, search_parameters, best_confidence_so_far=0):
+        statement_list = self.chatbot.storage.filter(**search_parameters)
+
         self.chatbot.logger.info('Processing search results')
 
         # Find the closest matching known statement
@@ -77,9 +150,9 @@ class IndexedTextSearch:
                 best_confidence_so_far = confidence
                 statement.confidence = confidence
 
-                self.chatbot.logger.info('Similar text found: {} {}'.format(
-                    statement.text, confidence
-                ))
+                self.chatbot.logger.info(
+                    'Similar text found: %s %s', statement.text, confidence
+                )
 
                 yield statement
 
@@ -92,10 +165,18 @@ class TextSearch:
     :param search_page_size:
         The maximum number of records to load into memory at a time when searching.
         Defaults to 1000
+
+    :param search_fields:
+        The statement fields to load for each search candidate. Candidates are
+        only compared and scored, so the remaining fields do not need to be
+        read from storage. Set this to ``None`` to load full statements.
+        Defaults to ``SEARCH_FIELDS``
     """
 
     name = 'text_search'
 
+    searches_by_token = False
+
     def __init__(self, chatbot, **kwargs):
         from chatterbot.comparisons import LevenshteinDistance
 
@@ -114,6 +195,10 @@ class TextSearch:
             'search_page_size', 1000
         )
 
+        self.search_fields = kwargs.get(
+            'search_fields', SEARCH_FIELDS
+        )
+
     def search(self, input_statement, **additional_parameters):
         """
         Search for close matches to the input. Confidence scores for
@@ -131,7 +216,8 @@ class TextSearch:
 
         search_parameters = {
             'persona_not_startswith': 'bot:',
-            'page_size': self.search_page_size
+            'page_size': self.search_page_size,
+            'fields': self.search_fields
         }
 
         if additional_parameters:
@@ -151,8 +237,401 @@ class TextSearch:
                 best_confidence_so_far = confidence
                 statement.confidence = confidence
 
-                self.chatbot.logger.info('Similar text found: {} {}'.format(
-                    statement.text, confidence
-                ))
+                self.chatbot.logger.info(
+                    'Similar text found: %s %s', statement.text, confidence
+                )
 
                 yield statement
+
+
+class BM25Search:
+    """
+    Ranks statements with the BM25 scoring function over the tokens in their
+    search text. An inverted index of the tokens is built from the storage
+    adapter the first time a search is made, so candidates are scored from the
+    posting lists of the input's tokens instead of comparing the input with
+    each candidate.
+
+    :param bm25_k1:
+        How much repeated tokens in a statement add to its score.
+        Defaults to 1.2
+
+    :param bm25_b:
+        How much the score of long statements is reduced.
+        Defaults to 0.75
+
+    :param bm25_max_results:
+        The number of the highest scoring statements to return.
+        Defaults to 10
+
+    Statements created through the storage adapter are added to the index.
+    Other changes to the statements cause the index to be built again the
+    next time a search is made.
+
+    The ids of the statements that match each set of additional parameters
+    are kept until the statements change, for up to ``MAX_CACHED_PARAMETERS``
+    sets of parameters.
+    """
+
+    name = 'bm25_search'
+
+    searches_by_token = True
+
+    MAX_CACHED_PARAMETERS = 100
+
+    def __init__(self, chatbot, **kwargs):
+        import threading
+        from collections import OrderedDict
+
+        self.chatbot = chatbot
+
+        self.k1 = kwargs.get('bm25_k1', 1.2)
+        self.b = kwargs.get('bm25_b', 0.75)
+
+        self.max_results = kwargs.get('bm25_max_results', 10)
+
+        self.lock = threading.Lock()
+
+        self.index_is_current = False
+        self.is_tracking_writes = False
+
+        # The rows of the statements that match each set of additional parameters
+        self.allowed_rows = OrderedDict()
+
+    def get_tokens(self, search_text):
+        return [token for token in (search_text or '').split(' ') if token]
+
+    def build_index(self):
+        """
+        Index the search text of each statement in the storage adapter.
+        """
+        with self.lock:
+            self._build_index()
+
+    def _build_index(self):
+        from array import array
+
+        if not self.is_tracking_writes:
+            self._track_storage_writes()
+
+        # Writes wait for the lock before they mark the index as out of date
+        self.index_is_current = True
+        self.allowed_rows.clear()
+
+        # The search candidates, and their length and id, by row number
+        self.records = []
+        self.document_lengths = array('d')
+        self.statement_ids = {}
+
+        # The rows and term frequencies of each token
+        self.postings = {}
+
+        self.total_length = 0
+
+        for statement in self.chatbot.storage.filter(fields=SEARCH_FIELDS + ['persona']):
+            self._add_record(statement)
+
+        document_count = len(self.records)
+
+        self.average_length = (self.total_length / document_count) if document_count else 0
+
+        # The length normalization of each statement
+        self.length_norms = array('d', (
+            self.get_length_norm(length) for length in self.document_lengths
+        ))
+
+        self.idf = {
+            token: self.get_idf(token) for token in self.postings
+        }
+
+    def _add_record(self, statement):
+        from array import array
+
+        if (statement.persona or '').startswith('bot:'):
+            return
+
+        row = len(self.records)
+        tokens = self.get_tokens(statement.search_text)
+
+        term_frequencies = {}
+
+        for token in tokens:
+            term_frequencies[token] = term_frequencies.get(token, 0) + 1
+
+        for token, term_frequency in term_frequencies.items():
+            if token not in self.postings:
+                self.postings[token] = (array('q'), array('l'), )
+
+            rows, frequencies = self.postings[token]
+            rows.append(row)
+            frequencies.append(term_frequency)
+
+        self.records.append(statement)
+        self.document_lengths.append(len(tokens))
+        self.statement_ids[statement.id] = row
+        self.total_length += len(tokens)
+
+    def get_idf(self, token):
+        import math
+
+        document_count = len(self.records)
+        document_frequency = len(self.postings[token][0])
+
+        return math.log(1 + (document_count - document_frequency + 0.5) / (document_frequency + 0.5))
+
+    def get_length_norm(self, length):
+        if not self.average_length:
+            return self.k1 * (1 - self.b)
+
+        return self.k1 * (1 - self.b + self.b * length / self.average_length)
+
+    def add_statement(self, statement):
+        """
+        Add a statement that was created after the index was built.
+        The average statement length is not changed until the index is
+        built again, so only the new statement's length normalization is computed.
+        """
+        with self.lock:
+            if not self.index_is_current or statement.id in self.statement_ids:
+                return
+
+            row = len(self.records)
+
+            self._add_record(statement)
+
+            if len(self.records) > row:
+                self.length_norms.append(self.get_length_norm(self.document_lengths[row]))
+
+                # The IDF of every token depends on the number of statements
+                self.idf = {}
+
+                # The new statement can match any of the additional parameters
+                self.allowed_rows.clear()
+
+    def invalidate_index(self):
+        """
+        Build the index again the next time a search is made.
+        """
+        with self.lock:
+            self.index_is_current = False
+            self.allowed_rows.clear()
+
+    def _track_storage_writes(self):
+        """
+        Keep the index up to date with the statements written through the storage adapter.
+        """
+        self.chatbot.storage.add_write_listener(self._record_storage_write)
+
+        self.is_tracking_writes = True
+
+    def _record_storage_write(self, method_name, statements, duration):
+        if method_name == 'create' and statements:
+            self.add_statement(statements[0])
+        else:
+            self.invalidate_index()
+
+    def _get_allowed_rows(self, additional_parameters):
+        """
+        Return the rows of the statements that match the additional parameters.
+        """
+        from chatterbot import utils
+
+        key = utils.freeze(additional_parameters)
+
+        if key in self.allowed_rows:
+            self.allowed_rows.move_to_end(key)
+            return self.allowed_rows[key]
+
+        allowed_rows = frozenset(
+            self.statement_ids.get(statement.id) for statement in self.chatbot.storage.filter(
+                fields=['id'], **additional_parameters
+            )
+        )
+
+        self.allowed_rows[key] = allowed_rows
+
+        while len(self.allowed_rows) > self.MAX_CACHED_PARAMETERS:
+            self.allowed_rows.popitem(last=False)
+
+        return allowed_rows
+
+    def get_scores(self, tokens):
+        """
+        Return a dictionary of the BM25 score of each row that has any of the tokens.
+        """
+        scores = {}
+
+        for token in set(tokens):
+            if token not in self.postings:
+                continue
+
+            idf = self._get_cached_idf(token)
+            rows, frequencies = self.postings[token]
+
+            for row, frequency in zip(rows, frequencies):
+                scores[row] = scores.get(row, 0) + idf * frequency * (self.k1 + 1) / (
+                    frequency + self.length_norms[row]
+                )
+
+        return scores
+
+    def get_input_score(self, tokens):
+        """
+        Return the BM25 score that a statement with the input's tokens would have.
+        """
+        term_frequencies = {}
+
+        for token in tokens:
+            term_frequencies[token] = term_frequencies.get(token, 0) + 1
+
+        length_norm = self.get_length_norm(len(tokens))
+
+        return sum(
+            self._get_cached_idf(token) * frequency * (self.k1 + 1) / (frequency + length_norm)
+            for token, frequency in term_frequencies.items() if token in self.postings
+        )
+
+    def _get_cached_idf(self, token):
+        if token not in self.idf:
+            self.idf[token] = self.get_idf(token)
+
+        return self.idf[token]
+
+    def search(self, input_statement, **additional_parameters):
+        """
+        Search for the statements with the highest BM25 scores for the input.
+        Statements are returned in order of increasing confidence, which is
+        the score divided by the score of a statement with the same search text
+        as the input, so that an exact match has a confidence of 1.
+
+        :param input_statement: A statement.
+        :type input_statement: chatterbot.conversation.Statement
+
+        :param **additional_parameters: Additional parameters to be passed
+            to the ``filter`` method of the storage adapter to limit the
+            statements that are returned.
+
+        :rtype: Generator yielding one closest matching statement at a time.
+        """
+        import heapq
+        from chatterbot.conversation import StatementRecord
+
+        self.chatbot.logger.info('Beginning BM25 search')
+
+        input_search_text = input_statement.search_text
+
+        if not input_search_text:
+            input_search_text = self.chatbot.storage.tagger.get_text_index_string(
+                input_statement.text
+            )
+
+        tokens = self.get_tokens(input_search_text)
+
+        with self.lock:
+            if not self.index_is_current:
+                self._build_index()
+
+            scores = self.get_scores(tokens)
+
+            maximum_score = self.get_input_score(tokens)
+
+            records = self.records
+
+            if additional_parameters and scores:
+                allowed_rows = self._get_allowed_rows(additional_parameters)
+
+                scores = {
+                    row: score for row, score in scores.items() if row in allowed_rows
+                }
+
+        best_rows = heapq.nlargest(self.max_results, scores, key=scores.get)
+
+        self.chatbot.logger.info('Processing search results')
+
+        for row in reversed(best_rows):
+            record = records[row]
+
+            statement = StatementRecord(**{
+                field_name: getattr(record, field_name) for field_name in SEARCH_FIELDS
+            })
+            statement.confidence = min(scores[row] / maximum_score, 1)
+
+            self.chatbot.logger.info(
+                'Similar text found: %s %s', statement.text, statement.confidence
+            )
+
+            yield statement
+
+
+class SearchAlgorithmRegistry(Mapping):
+    """
+    The search algorithms that logic adapters can use, keyed by name.
+    Each search algorithm is only created the first time it is used.
+
+    :param chatbot: The chat bot that the search algorithms search for.
+
+    :param configurations: A list of the import paths of search algorithm
+        classes, or dictionaries with an ``import_path`` and the parameters for
+        each search algorithm. Each search algorithm also receives the parameters
+        passed to the chat bot.
+    """
+
+    def __init__(self, chatbot, configurations, **kwargs):
+        import threading
+
+        self.chatbot = chatbot
+        self.kwargs = kwargs
+
+        self.lock = threading.Lock()
+
+        self.configurations = {}
+        self.instances = {}
+
+        for configuration in configurations:
+            self.register(configuration)
+
+    def register(self, search_algorithm):
+        """
+        Add a search algorithm, replacing any search algorithm with the same name.
+        """
+        from chatterbot.adapters import Adapter
+        from chatterbot.utils import import_module
+
+        import_path = search_algorithm
+
+        if isinstance(search_algorithm, dict):
+            if 'import_path' not in search_algorithm:
+                raise Adapter.InvalidAdapterTypeException(
+                    'The dictionary {} must contain a value for "import_path"'.format(
+                        str(search_algorithm)
+                    )
+                )
+
+            import_path = search_algorithm['import_path']
+
+        SearchAlgorithm = import_module(import_path)
+
+        with self.lock:
+            self.configurations[SearchAlgorithm.name] = search_algorithm
+            self.instances.pop(SearchAlgorithm.name, None)
+
+    def __getitem__(self, name):
+        from chatterbot.utils import initialize_class
+
+        with self.lock:
+            if name not in self.instances:
+                configuration = self.configurations[name]
+
+                if isinstance(configuration, dict):
+                    self.instances[name] = initialize_class(dict(self.kwargs, **configuration), self.chatbot)
+                else:
+                    self.instances[name] = initialize_class(configuration, self.chatbot, **self.kwargs)
+
+            return self.instances[name]
+
+    def __iter__(self):
+        return iter(list(self.configurations))
+
+    def __len__(self):
+        return len(self.configurations)
+
@@ -2,6 +2,11 @@ from chatterbot.storage.storage_adapter import StorageAdapter
 from chatterbot.storage.django_storage import DjangoStorageAdapter
 from chatterbot.storage.mongodb import MongoDatabaseAdapter
 from chatterbot.storage.sql_storage import SQLStorageAdapter
+from chatterbot.storage.memory_storage import InMemoryStorageAdapter
+from chatterbot.storage.mmap_storage import MmapStorageAdapter
+from chatterbot.storage.cached_storage import CachedStorageAdapter
+from chatterbot.storage.sharded_storage import ShardedStorageAdapter
+from chatterbot.storage.migration import migrate
 
 
 __all__ = (
@@ -9,4 +14,9 @@ __all__ = (
     'DjangoStorageAdapter',
     'MongoDatabaseAdapter',
     'SQLStorageAdapter',
+    'InMemoryStorageAdapter',
+    'MmapStorageAdapter',
+    'CachedStorageAdapter',
+    'ShardedStorageAdapter',
+    'migrate',
 )
@@ -0,0 +1,408 @@
+import copy
+import pickle
+import hashlib
+import threading
+from collections import OrderedDict
+from chatterbot.storage import StorageAdapter
+from chatterbot.storage.storage_adapter import write_method
+from chatterbot import utils
+
+
+class LocalCacheClient(object):
+    """
+    A cache that is shared by the storage adapters in one process. It has
+    the ``get``, ``set`` and ``incr`` methods of a Redis client, so a Redis
+    client can be used in its place to share the cache between processes.
+    """
+
+    def __init__(self, **kwargs):
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def get(self, name):
+        return self.values.get(name)
+
+    def set(self, name, value):
+        with self.lock:
+            self.values[name] = value
+
+    def incr(self, name, amount=1):
+        with self.lock:
+            value = int(self.values.get(name) or 0) + amount
+            self.values[name] = str(value).encode('utf8')
+
+        return value
+
+
+class CachedStorageAdapter(StorageAdapter):
+    """
+    The CachedStorageAdapter wraps another storage adapter and saves the
+    results of its ``filter`` method. Repeated calls to ``filter`` with the
+    same parameters return the saved results instead of querying the database.
+
+    Saved results are removed when statements are written through this
+    adapter. Creating or removing statements only removes the results of
+    filters that the statements could match. Updating statements, dropping
+    the database or compacting it removes all saved results.
+
+    :keyword cached_storage_adapter: The import path of the storage adapter
+        to wrap. It is created with the same parameters as this adapter.
+        Defaults to ``'chatterbot.storage.SQLStorageAdapter'``
+    :type cached_storage_adapter: str or dict
+
+    :keyword cache_size: The number of filter results to keep in memory.
+        Defaults to 1000
+    :type cache_size: int
+
+    :keyword cache_max_results: Filters that return more statements than
+        this are not saved.
+        Defaults to 1000
+    :type cache_max_results: int
+
+    :keyword cache_client: A client with the ``get``, ``set`` and ``incr``
+        methods of a Redis client, or the import path of one. When provided,
+        results are also saved to the client so that they can be shared
+        with other processes. Any write made through an adapter sharing the
+        client removes all of the shared results.
+    :type cache_client: object or str or dict
+
+    :keyword cache_prefix: The prefix of the keys saved to the cache client.
+        Defaults to ``'chatterbot:filter'``
+    :type cache_prefix: str
+    """
+
+    # Fields that can be used to tell that a filter does not match a statement
+    EQUALITY_FIELDS = (
+        'text',
+        'conversation',
+        'persona',
+        'in_response_to',
+        'search_text',
+        'search_in_response_to',
+    )
+
+    def __init__(self, **kwargs):
+        # The tagger of the wrapped adapter is used, so the parent
+        # class is not initialized to avoid loading a second tagger
+        storage_adapter = kwargs.get('cached_storage_adapter', 'chatterbot.storage.SQLStorageAdapter')
+
+        utils.validate_adapter_class(storage_adapter, StorageAdapter)
+
+        self.storage = utils.initialize_class(storage_adapter, **kwargs)
+
+        self.logger = self.storage.logger
+        self.tagger = self.storage.tagger
+        self.deduplicate_statements = self.storage.deduplicate_statements
+        self.is_thread_safe = self.storage.is_thread_safe
+        self.searches_by_token = self.storage.searches_by_token
+
+        self.init_write_listeners()
+
+        self.cache_size = kwargs.get('cache_size', 1000)
+        self.cache_max_results = kwargs.get('cache_max_results', 1000)
+        self.cache_prefix = kwargs.get('cache_prefix', 'chatterbot:filter')
+
+        cache_client = kwargs.get('cache_client')
+
+        if isinstance(cache_client, (str, dict, )):
+            cache_client = utils.initialize_class(cache_client)
+
+        self.cache_client = cache_client
+
+        self.cache = OrderedDict()
+        self.lock = threading.RLock()
+
+        # Increased by each write so that results read during a write are not saved
+        self.generation = 0
+
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    def __getattr__(self, name):
+        # Methods that are specific to the wrapped adapter, such as get_session
+        storage = self.__dict__.get('storage')
+
+        if storage is None:
+            raise AttributeError(name)
+
+        return getattr(storage, name)
+
+    def get_model(self, model_name):
+        return self.storage.get_model(model_name)
+
+    def get_object(self, object_name):
+        return self.storage.get_object(object_name)
+
+    def unit_of_work(self):
+        return self.storage.unit_of_work()
+
+    def get_cache_key(self, kwargs):
+        """
+        Return a hashable key for the parameters of a filter. The page size
+        is not part of the key because it does not change the results.
+        """
+        key = []
+
+        for name, value in sorted(kwargs.items()):
+            if name == 'page_size':
+                continue
+
+            if name == 'tags' and isinstance(value, str):
+                value = [value]
+
+            if isinstance(value, (list, tuple, set, )):
+                value = tuple(value)
+
+            key.append((name, value, ))
+
+        return tuple(key)
+
+    def get_shared_generation(self):
+        return int(self.cache_client.get(self.cache_prefix + ':generation') or 0)
+
+    def get_shared_key(self, key, shared_generation):
+        key_hash = hashlib.sha1(repr(key).encode('utf8')).hexdigest()
+
+        return '{}:{}:{}'.format(self.cache_prefix, shared_generation, key_hash)
+
+    def copy_statement(self, statement):
+        """
+        Return a copy of a statement, so that changes made to the
+        statements returned by filter do not change the saved results.
+        """
+        statement_copy = copy.copy(statement)
+
+        if statement.tags is not None:
+            statement_copy.tags = list(statement.tags)
+
+        return statement_copy
+
+    def cache_info(self):
+        """
+        Return the number of cache hits and misses, the fraction of filters
+        that were read from the cache and the number of saved results.
+        """
+        total = self.hits + self.misses
+
+        return {
+            'hits': self.hits,
+            'shared_hits': self.shared_hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'size': len(self.cache),
+        }
+
+    def clear_cache(self):
+        """
+        Remove all saved filter results.
+        """
+        with self.lock:
+            self.generation += 1
+            self.cache.clear()
+
+        if self.cache_client is not None:
+            self.cache_client.incr(self.cache_prefix + ':generation')
+
+    def count(self):
+        return self.storage.count()
+
+    def get_random(self):
+        return self.storage.get_random()
+
+    def filter(self, **kwargs):
+        """
+        Returns a list of objects from the database.
+        Results are read from the cache when the same
+        filter has been used before.
+        """
+        key = self.get_cache_key(kwargs)
+
+        shared_generation = None
+
+        if self.cache_client is not None:
+            shared_generation = self.get_shared_generation()
+
+        with self.lock:
+            entry = self.cache.get(key)
+
+            if entry is not None and entry[2] == shared_generation:
+                self.cache.move_to_end(key)
+                self.hits += 1
+                results = entry[1]
+            else:
+                results = None
+
+            generation = self.generation
+
+        if results is None and shared_generation is not None:
+            shared_results = self.cache_client.get(self.get_shared_key(key, shared_generation))
+
+            if shared_results is not None:
+                results = pickle.loads(shared_results)
+
+                with self.lock:
+                    self.hits += 1
+                    self.shared_hits += 1
+
+                    if generation == self.generation:
+                        self._save(key, kwargs, results, shared_generation)
+
+        if results is not None:
+            for result in results:
+                yield self.copy_statement(result)
+            return
+
+        with self.lock:
+            self.misses += 1
+
+        # The wrapped adapter can change the values in the parameters
+        filter_kwargs = {
+            name: list(value) if isinstance(value, list) else value
+            for name, value in kwargs.items()
+        }
+
+        results = []
+
+        for result in self.storage.filter(**filter_kwargs):
+            if results is not None:
+                results.append(self.copy_statement(result))
+
+                if len(results) > self.cache_max_results:
+                    results = None
+
+            yield result
+
+        if results is None:
+            return
+
+        with self.lock:
+            # Results read while statements were written may be out of date
+            if generation != self.generation:
+                return
+
+            self._save(key, kwargs, results, shared_generation)
+
+        if shared_generation is not None:
+            self.cache_client.set(
+                self.get_shared_key(key, shared_generation), pickle.dumps(results)
+            )
+
+    def _save(self, key, kwargs, results, shared_generation):
+        self.cache[key] = (dict(kwargs), results, shared_generation, )
+        self.cache.move_to_end(key)
+
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    def _can_match(self, kwargs, statements):
+        """
+        Return False if none of the statements can be returned by a filter
+        with the given parameters. Statements are dictionaries of the field
+        values that are known.
+        """
+        for field_name in self.EQUALITY_FIELDS:
+            if field_name in kwargs:
+                if all(
+                    field_name in statement and statement[field_name] != kwargs[field_name]
+                    for statement in statements
+                ):
+                    return False
+
+        tags = kwargs.get('tags')
+
+        if tags:
+            if isinstance(tags, str):
+                tags = [tags]
+
+            if all(
+                'tags' in statement and not set(statement['tags']) & set(tags)
+                for statement in statements
+            ):
+                return False
+
+        return True
+
+    def invalidate(self, statements):
+        """
+        Remove the saved results of filters that could match any of the
+        statements. Statements are dictionaries of the field values that
+        are known, so filters on other fields are always removed.
+        """
+        with self.lock:
+            self.generation += 1
+
+            for key in [
+                key for key, entry in self.cache.items() if self._can_match(entry[0], statements)
+            ]:
+                del self.cache[key]
+
+        if self.cache_client is not None:
+            self.cache_client.incr(self.cache_prefix + ':generation')
+
+    def _get_known_values(self, statement):
+        values = {
+            'text': statement.text,
+            'conversation': statement.conversation,
+            'persona': statement.persona,
+            'in_response_to': statement.in_response_to,
+            'tags': statement.get_tags(),
+        }
+
+        # Search text that is missing is generated by the wrapped adapter
+        if statement.search_text:
+            values['search_text'] = statement.search_text
+
+        if statement.search_in_response_to or not statement.in_response_to:
+            values['search_in_response_to'] = statement.search_in_response_to
+
+        return values
+
+    @write_method
+    def create(self, **kwargs):
+        try:
+            statement = self.storage.create(**kwargs)
+        except Exception:
+            self.clear_cache()
+            raise
+
+        self.invalidate([self._get_known_values(statement)])
+
+        return statement
+
+    @write_method
+    def create_many(self, statements):
+        statements = list(statements)
+
+        try:
+            self.storage.create_many(statements)
+        finally:
+            self.invalidate([self._get_known_values(statement) for statement in statements])
+
+    @write_method
+    def update(self, statement):
+        try:
+            return self.storage.update(statement)
+        finally:
+            self.clear_cache()
+
+    @write_method
+    def remove(self, statement_text):
+        try:
+            self.storage.remove(statement_text)
+        finally:
+            self.invalidate([{'text': statement_text}])
+
+    @write_method
+    def compact(self):
+        try:
+            return self.storage.compact()
+        finally:
+            self.clear_cache()
+
+    @write_method
+    def drop(self):
+        try:
+            self.storage.drop()
+        finally:
+            self.clear_cache()
@@ -1,4 +1,5 @@
 from chatterbot.storage import StorageAdapter
+from chatterbot.storage.storage_adapter import write_method
 from chatterbot import constants
 
 
@@ -16,6 +17,10 @@ class DjangoStorageAdapter(StorageAdapter):
             constants.DEFAULT_DJANGO_APP_NAME
         )
 
+        # Whether the database only allows one statement for each pair of
+        # text and in_response_to values, which is checked when it is needed
+        self._has_unique_statements = None
+
     def get_statement_model(self):
         from django.apps import apps
         return apps.get_model(self.django_app_name, 'Statement')
@@ -34,16 +39,19 @@ class DjangoStorageAdapter(StorageAdapter):
         that match the parameters specified.
         """
         from django.db.models import Q
+        from chatterbot.conversation import StatementRecord
 
         Statement = self.get_model('statement')
 
-        kwargs.pop('page_size', 1000)
+        page_size = kwargs.pop('page_size', 1000)
         order_by = kwargs.pop('order_by', None)
         tags = kwargs.pop('tags', [])
         exclude_text = kwargs.pop('exclude_text', None)
         exclude_text_words = kwargs.pop('exclude_text_words', [])
         persona_not_startswith = kwargs.pop('persona_not_startswith', None)
         search_text_contains = kwargs.pop('search_text_contains', None)
+        fields = kwargs.pop('fields', None)
+        id_greater_than = kwargs.pop('id_greater_than', None)
 
         # Convert a single sting into a list if only one tag is provided
         if type(tags) == str:
@@ -52,6 +60,9 @@ class DjangoStorageAdapter(StorageAdapter):
         if tags:
             kwargs['tags__name__in'] = tags
 
+        if id_greater_than is not None:
+            kwargs['id__gt'] = id_greater_than
+
         statements = Statement.objects.filter(**kwargs)
 
         if exclude_text:
@@ -85,10 +96,35 @@ class DjangoStorageAdapter(StorageAdapter):
 
         if order_by:
             statements = statements.order_by(*order_by)
+        else:
+            # Keep the pages of results in a consistent order
+            statements = statements.order_by('pk')
+
+        if fields:
+            fields = [field for field in fields if field != 'tags']
+
+            for values in _iterate(statements.values_list(*fields), page_size):
+                yield StatementRecord(**dict(zip(fields, values)))
+        else:
+            from django.db.models import prefetch_related_objects
+
+            # Read the results with a single query and load the tags
+            # for each page of results with a single query
+            page = []
 
-        for statement in statements.iterator():
-            yield statement
+            for statement in _iterate(statements, page_size):
+                page.append(statement)
 
+                if len(page) >= page_size:
+                    prefetch_related_objects(page, 'tags')
+                    yield from page
+                    page = []
+
+            if page:
+                prefetch_related_objects(page, 'tags')
+                yield from page
+
+    @write_method
     def create(self, **kwargs):
         """
         Creates a new statement matching the keyword arguments specified.
@@ -106,6 +142,14 @@ class DjangoStorageAdapter(StorageAdapter):
             if kwargs.get('in_response_to'):
                 kwargs['search_in_response_to'] = self.tagger.get_text_index_string(kwargs['in_response_to'])
 
+        if self.deduplicate_statements:
+            from django.db import transaction
+
+            with transaction.atomic():
+                statement_id, = self._upsert_statements([Statement(**kwargs)], [set(tags)])
+
+            return Statement.objects.get(pk=statement_id)
+
         statement = Statement(**kwargs)
 
         statement.save()
@@ -120,19 +164,25 @@ class DjangoStorageAdapter(StorageAdapter):
 
         return statement
 
+    @write_method
     def create_many(self, statements):
         """
         Creates multiple statement entries.
         """
+        from django.db import transaction
+
         Statement = self.get_model('statement')
-        Tag = self.get_model('tag')
 
-        tag_cache = {}
+        if self.deduplicate_statements:
+            statements = self.get_unique_statements(statements)
+
+        statement_model_objects = []
+        statement_tag_names = []
 
         for statement in statements:
 
             statement_data = statement.serialize()
-            tag_data = statement_data.pop('tags', [])
+            tag_data = set(statement_data.pop('tags', []))
 
             statement_model_object = Statement(**statement_data)
 
@@ -142,20 +192,271 @@ class DjangoStorageAdapter(StorageAdapter):
             if not statement.search_in_response_to and statement.in_response_to:
                 statement_model_object.search_in_response_to = self.tagger.get_text_index_string(statement.in_response_to)
 
-            statement_model_object.save()
+            statement_model_objects.append(statement_model_object)
+            statement_tag_names.append(tag_data)
+
+        with transaction.atomic():
+            if self.deduplicate_statements:
+                self._upsert_statements(statement_model_objects, statement_tag_names)
+            else:
+                self._bulk_create_statements(statement_model_objects, statement_tag_names)
+
+    def _bulk_create_statements(self, statement_model_objects, statement_tag_names):
+        """
+        Insert statements and their tags using as few queries as possible.
+        """
+        from django.db import connection
+
+        Statement = self.get_model('statement')
+
+        tags = self._get_or_create_tags(set().union(*statement_tag_names))
 
-            tags_to_add = []
+        # Named can_return_ids_from_bulk_insert before Django 3.0
+        can_return_rows_from_bulk_insert = getattr(
+            connection.features, 'can_return_rows_from_bulk_insert',
+            getattr(connection.features, 'can_return_ids_from_bulk_insert', False)
+        )
 
-            for tag_name in tag_data:
-                if tag_name in tag_cache:
-                    tag = tag_cache[tag_name]
+        if can_return_rows_from_bulk_insert:
+            Statement.objects.bulk_create(statement_model_objects)
+        else:
+            # The primary keys of tagged statements are needed to add
+            # their tags, and this database does not return them from
+            # a bulk insert
+            untagged_statements = []
+
+            for statement_model_object, tag_names in zip(statement_model_objects, statement_tag_names):
+                if tag_names:
+                    statement_model_object.save()
                 else:
-                    tag, _ = Tag.objects.get_or_create(name=tag_name)
-                    tag_cache[tag_name] = tag
-                tags_to_add.append(tag)
+                    untagged_statements.append(statement_model_object)
+
+            Statement.objects.bulk_create(untagged_statements)
+
+        self._add_statement_tags({
+            statement_model_object.pk: tag_names
+            for statement_model_object, tag_names in zip(statement_model_objects, statement_tag_names)
+        }, tags)
+
+    def _add_statement_tags(self, statement_tags, tags=None):
+        """
+        Associate tags with statements.
+
+        :param statement_tags: A dictionary of tag names keyed by statement id.
+        """
+        Statement = self.get_model('statement')
+
+        if tags is None:
+            tags = self._get_or_create_tags(set().union(*statement_tags.values()))
+
+        StatementTag = Statement.tags.through
+        statement_field_name = Statement.tags.field.m2m_field_name() + '_id'
+        tag_field_name = Statement.tags.field.m2m_reverse_field_name() + '_id'
+
+        StatementTag.objects.bulk_create([
+            StatementTag(**{
+                statement_field_name: statement_id,
+                tag_field_name: tags[tag_name].pk
+            })
+            for statement_id, tag_names in statement_tags.items()
+            for tag_name in tag_names
+        ])
+
+    def _upsert_statements(self, statement_model_objects, statement_tag_names):
+        """
+        Add the occurrences of each statement to the existing statement with
+        the same text and in_response_to values, or insert the statement if
+        one does not exist. Each statement must have a unique pair of text
+        and in_response_to values.
+
+        When the database has a unique index for the statements, the missing
+        statements are inserted with a query that skips the ones that already
+        exist before the occurrences of every statement are added, so that
+        concurrent writes cannot create duplicate statements. Versions of
+        Django before 2.2 cannot skip conflicts in a bulk insert, so each
+        statement is inserted with ``get_or_create`` instead.
+
+        Returns a list of the primary key of each statement.
+        """
+        from django.db import connection
+        from django.db.models import F, Value
+        from django.db.models.functions import Coalesce, Greatest
+
+        Statement = self.get_model('statement')
+        StatementTag = Statement.tags.through
+        statement_field_name = Statement.tags.field.m2m_field_name() + '_id'
+
+        keys = [
+            (statement.text, statement.in_response_to, ) for statement in statement_model_objects
+        ]
+
+        occurrences = [statement.occurrences or 1 for statement in statement_model_objects]
+        last_seen_at = [statement.get_last_seen_at() for statement in statement_model_objects]
+
+        new_statements = []
+        new_statement_tag_names = []
+
+        if self.has_unique_statements():
+            for statement in statement_model_objects:
+                statement.occurrences = 0
+
+            if getattr(connection.features, 'supports_ignore_conflicts', False):
+                Statement.objects.bulk_create(statement_model_objects, ignore_conflicts=True)
+            else:
+                field_names = [
+                    field.attname for field in Statement._meta.concrete_fields
+                    if not field.primary_key and field.name not in ('text', 'in_response_to', )
+                ]
+
+                for statement in statement_model_objects:
+                    Statement.objects.get_or_create(
+                        text=statement.text,
+                        in_response_to=statement.in_response_to,
+                        defaults={
+                            field_name: getattr(statement, field_name) for field_name in field_names
+                        }
+                    )
+
+            existing_ids = self._get_statement_ids(keys)
+        else:
+            existing_ids = self._get_statement_ids(keys)
+
+            for key, statement, tag_names in zip(keys, statement_model_objects, statement_tag_names):
+                if key not in existing_ids:
+                    new_statements.append(statement)
+                    new_statement_tag_names.append(tag_names)
+
+        existing_statement_tags = {}
+
+        for key, tag_names, statement_occurrences, statement_last_seen_at in zip(
+            keys, statement_tag_names, occurrences, last_seen_at
+        ):
+            if key in existing_ids:
+                Statement.objects.filter(pk=existing_ids[key]).update(
+                    occurrences=F('occurrences') + statement_occurrences,
+                    last_seen_at=Greatest(
+                        Coalesce('last_seen_at', 'created_at'), Value(statement_last_seen_at)
+                    )
+                )
+                existing_statement_tags[existing_ids[key]] = set(tag_names)
+
+        # Only add the tags that the existing statements do not already have
+        if any(existing_statement_tags.values()):
+            existing_tags = StatementTag.objects.filter(**{
+                statement_field_name + '__in': list(existing_statement_tags.keys())
+            }).values_list(
+                statement_field_name,
+                Statement.tags.field.m2m_reverse_field_name() + '__name'
+            )
+
+            for statement_id, tag_name in existing_tags:
+                existing_statement_tags[statement_id].discard(tag_name)
+
+            self._add_statement_tags(existing_statement_tags)
+
+        if new_statements:
+            self._bulk_create_statements(new_statements, new_statement_tag_names)
+
+            # Some databases do not return the primary keys from a bulk insert
+            existing_ids = self._get_statement_ids(keys)
+
+        return [existing_ids[key] for key in keys]
+
+    def get_unique_statement_index_name(self):
+        Statement = self.get_model('statement')
+        return Statement._meta.db_table + '_text_in_response_to_uniq'
+
+    def has_unique_statements(self):
+        """
+        Return True if the database has a unique index on the text and
+        in_response_to values of the statements.
+        """
+        from django.db import connection
+
+        if self._has_unique_statements is None:
+            Statement = self.get_model('statement')
+
+            with connection.cursor() as cursor:
+                constraints = connection.introspection.get_constraints(
+                    cursor, Statement._meta.db_table
+                )
+
+            self._has_unique_statements = self.get_unique_statement_index_name() in constraints
+
+        return self._has_unique_statements
+
+    def create_unique_statement_index(self):
+        """
+        Create a unique index on the text and in_response_to values of the
+        statements, so that deduplicated statements can be inserted without
+        creating duplicates. The database must not have any duplicate
+        statements, which ``compact`` combines.
+        """
+        from django.db import connection
+
+        Statement = self.get_model('statement')
+
+        quote_name = connection.ops.quote_name
+
+        # Statements that are not in response to anything have a null
+        # in_response_to value, which would not be unique in the index
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "CREATE UNIQUE INDEX {} ON {} ({}, (COALESCE({}, '')))".format(
+                    quote_name(self.get_unique_statement_index_name()),
+                    quote_name(Statement._meta.db_table),
+                    quote_name(Statement._meta.get_field('text').column),
+                    quote_name(Statement._meta.get_field('in_response_to').column)
+                )
+            )
+
+        self._has_unique_statements = True
+
+    def _get_statement_ids(self, keys):
+        """
+        Return a dictionary of the primary keys of existing statements keyed
+        by their text and in_response_to values. The lowest primary key is
+        used when more than one statement has the same values.
+        """
+        Statement = self.get_model('statement')
+
+        texts = list(set(text for text, in_response_to in keys))
+        statement_ids = {}
+
+        # Query in chunks to stay below the database's limit on parameters
+        for start_index in range(0, len(texts), 500):
+            records = Statement.objects.filter(
+                text__in=texts[start_index:start_index + 500]
+            ).order_by('pk').values_list('pk', 'text', 'in_response_to')
+
+            for statement_id, text, in_response_to in records:
+                statement_ids.setdefault((text, in_response_to, ), statement_id)
 
-            statement_model_object.tags.add(*tags_to_add)
+        return statement_ids
 
+    def _get_or_create_tags(self, tag_names):
+        """
+        Return a dictionary of tag objects keyed by name,
+        creating any of the tags that do not exist yet.
+        """
+        Tag = self.get_model('tag')
+
+        if not tag_names:
+            return {}
+
+        tags = _get_tags_by_name(Tag, tag_names)
+
+        missing_tag_names = set(tag_names) - set(tags.keys())
+
+        if missing_tag_names:
+            Tag.objects.bulk_create([
+                Tag(name=tag_name) for tag_name in missing_tag_names
+            ])
+            tags = _get_tags_by_name(Tag, tag_names)
+
+        return tags
+
+    @write_method
     def update(self, statement):
         """
         Update the provided statement.
@@ -184,17 +485,88 @@ class DjangoStorageAdapter(StorageAdapter):
 
     def get_random(self):
         """
-        Returns a random statement from the database
+        Returns a random statement from the database.
+
+        A random value is picked from the range of primary keys and the
+        first statement with an id greater than or equal to it is returned,
+        which avoids the full table sort required by ``order_by('?')``.
+
+        Removed statements leave gaps in the ids, and the statement after
+        a gap is returned for every value that falls in it. The chance of
+        returning a statement is therefore proportional to the number of
+        missing ids before it plus one, rather than uniform.
         """
+        import random
+        from django.db.models import Min, Max
+
         Statement = self.get_model('statement')
 
-        statement = Statement.objects.order_by('?').first()
+        id_range = Statement.objects.aggregate(
+            min_id=Min('id'),
+            max_id=Max('id')
+        )
 
-        if statement is None:
+        if id_range['max_id'] is None:
             raise self.EmptyDatabaseException()
 
+        random_id = random.randint(id_range['min_id'], id_range['max_id'])
+
+        statement = Statement.objects.filter(
+            id__gte=random_id
+        ).order_by('id').first()
+
         return statement
 
+    @write_method
+    def compact(self):
+        """
+        Combine statements that have the same ``text`` and ``in_response_to``
+        values into the statement with the lowest primary key.
+
+        Returns the number of statements that were removed.
+        """
+        from django.db import transaction
+        from django.db.models import Count
+
+        Statement = self.get_model('statement')
+        Tag = self.get_model('tag')
+
+        removed_count = 0
+
+        with transaction.atomic():
+            duplicate_groups = Statement.objects.values(
+                'text', 'in_response_to'
+            ).annotate(
+                statement_count=Count('pk')
+            ).filter(
+                statement_count__gt=1
+            ).order_by()
+
+            for group in duplicate_groups:
+                statements = list(Statement.objects.filter(
+                    text=group['text'],
+                    in_response_to=group['in_response_to']
+                ).order_by('pk'))
+
+                statement = statements[0]
+                duplicate_ids = [duplicate.pk for duplicate in statements[1:]]
+
+                statement.occurrences = sum(duplicate.occurrences for duplicate in statements)
+                statement.last_seen_at = max(duplicate.get_last_seen_at() for duplicate in statements)
+                statement.save(update_fields=['occurrences', 'last_seen_at'])
+
+                statement.tags.add(*Tag.objects.filter(statements__pk__in=duplicate_ids))
+
+                Statement.objects.filter(pk__in=duplicate_ids).delete()
+
+                removed_count += len(duplicate_ids)
+
+            if self.deduplicate_statements and not self.has_unique_statements():
+                self.create_unique_statement_index()
+
+        return removed_count
+
+    @write_method
     def remove(self, statement_text):
         """
         Removes the statement that matches the input text.
@@ -207,6 +579,7 @@ class DjangoStorageAdapter(StorageAdapter):
 
         statements.delete()
 
+    @write_method
     def drop(self):
         """
         Remove all data from the database.
@@ -216,3 +589,26 @@ class DjangoStorageAdapter(StorageAdapter):
 
         Statement.objects.all().delete()
         Tag.objects.all().delete()
+
+
+def _iterate(queryset, chunk_size):
+    """
+    Iterate over the results of a query without caching them, fetching
+    ``chunk_size`` rows at a time where the version of Django supports it.
+    """
+    import django
+
+    if django.VERSION < (2, 0):
+        return queryset.iterator()
+
+    return queryset.iterator(chunk_size=chunk_size)
+
+
+def _get_tags_by_name(Tag, tag_names):
+    """
+    Return a dictionary of the tags with the given names keyed by name.
+    ``in_bulk`` only accepts a ``field_name`` in Django 2.0 and later.
+    """
+    return {
+        tag.name: tag for tag in Tag.objects.filter(name__in=list(tag_names))
+    }
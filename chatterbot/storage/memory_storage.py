@@ -0,0 +1,681 @@
+import sys
+import threading
+from array import array
+from datetime import datetime
+from pytz import UTC
+from chatterbot.storage import StorageAdapter
+from chatterbot.storage.storage_adapter import write_method
+
+
+# The timestamp stored for statements that do not have a last_seen_at time
+NOT_SEEN = -1.0
+
+
+class InMemoryStorageAdapter(StorageAdapter):
+    """
+    The InMemoryStorageAdapter stores statements in the memory of the
+    current process, without a database.
+
+    Each field of the statements is stored in its own column. Strings are
+    interned so that repeated values, such as the text of a statement that
+    is a common response, are only stored once. Hash indexes are kept for
+    the ``text``, ``conversation`` and ``search_in_response_to`` fields and
+    for tags, and an index of the tokens in each statement's search text is
+    used for ``search_text_contains`` queries.
+
+    Unlike the SQL storage adapter, ``search_text_contains`` only matches
+    whole tokens of the search text, in the same way as the MongoDB
+    storage adapter.
+
+    :keyword snapshot_path: The path of a snapshot file created by
+        ``save_snapshot``. The snapshot is loaded when the storage adapter
+        is created if the file exists.
+    :type snapshot_path: str
+    """
+
+    SNAPSHOT_VERSION = 1
+
+    # Every read and write holds the lock of the adapter
+    is_thread_safe = True
+
+    # search_text_contains matches whole tokens in the token index
+    searches_by_token = True
+
+    # Columns that store a string for each statement
+    STRING_FIELDS = (
+        'text',
+        'search_text',
+        'conversation',
+        'persona',
+        'in_response_to',
+        'search_in_response_to',
+    )
+
+    # Fields that have a hash index of the rows with each value
+    INDEXED_FIELDS = (
+        'text',
+        'conversation',
+        'search_in_response_to',
+    )
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+        self.snapshot_path = kwargs.get('snapshot_path')
+
+        self.lock = threading.RLock()
+
+        self._create_columns()
+
+        if self.snapshot_path:
+            import os
+
+            if os.path.exists(self.snapshot_path):
+                self.load_snapshot(self.snapshot_path)
+
+    def _create_columns(self):
+        """
+        Create the empty columns and indexes.
+        """
+        self.columns = {
+            field_name: [] for field_name in self.STRING_FIELDS
+        }
+        self.columns['tags'] = []
+
+        # Times are stored as UTC timestamps. A statement that has not
+        # been seen since it was created has no last_seen_at time.
+        self.columns['created_at'] = array('d')
+        self.columns['last_seen_at'] = array('d')
+        self.columns['occurrences'] = array('q')
+
+        # Removed rows are kept so that the row of each statement does not change
+        self.removed = bytearray()
+
+        self.indexes = {
+            field_name: {} for field_name in self.INDEXED_FIELDS
+        }
+        self.tag_index = {}
+        self.token_index = {}
+
+        self.statement_count = 0
+
+    def get_statement_model(self):
+        """
+        Return the class for the statement model.
+        """
+        from chatterbot.conversation import Statement
+
+        return Statement
+
+    def get_search_tokens(self, search_text):
+        """
+        Return the list of tokens in a statement's search text.
+        """
+        return [token for token in (search_text or '').split(' ') if token]
+
+    def _intern(self, value):
+        if value is None:
+            return None
+
+        return sys.intern(str(value))
+
+    def _to_timestamp(self, value):
+        if value is None:
+            return NOT_SEEN
+
+        if not isinstance(value, datetime):
+            from dateutil import parser as date_parser
+            value = date_parser.parse(value)
+
+        if not value.tzinfo:
+            value = value.replace(tzinfo=UTC)
+
+        return value.timestamp()
+
+    def _from_timestamp(self, value):
+        if value == NOT_SEEN:
+            return None
+
+        return datetime.fromtimestamp(value, UTC)
+
+    def _add_to_index(self, index, value, row):
+        rows = index.get(value)
+
+        if rows is None:
+            index[value] = {row}
+        else:
+            rows.add(row)
+
+    def _remove_from_index(self, index, value, row):
+        rows = index.get(value)
+
+        if rows is not None:
+            rows.discard(row)
+
+            if not rows:
+                del index[value]
+
+    def _index_row(self, row):
+        for field_name in self.INDEXED_FIELDS:
+            self._add_to_index(self.indexes[field_name], self.columns[field_name][row], row)
+
+        for tag in self.columns['tags'][row]:
+            self._add_to_index(self.tag_index, tag, row)
+
+        for token in self.get_search_tokens(self.columns['search_text'][row]):
+            self._add_to_index(self.token_index, token, row)
+
+    def _unindex_row(self, row):
+        for field_name in self.INDEXED_FIELDS:
+            self._remove_from_index(self.indexes[field_name], self.columns[field_name][row], row)
+
+        for tag in self.columns['tags'][row]:
+            self._remove_from_index(self.tag_index, tag, row)
+
+        for token in self.get_search_tokens(self.columns['search_text'][row]):
+            self._remove_from_index(self.token_index, token, row)
+
+    def _prepare_statement_data(self, data):
+        """
+        Add the search text to statement data that does not have it.
+        """
+        if not data.get('search_text'):
+            data['search_text'] = self.tagger.get_text_index_string(data['text'])
+
+        if not data.get('search_in_response_to') and data.get('in_response_to'):
+            data['search_in_response_to'] = self.tagger.get_text_index_string(data['in_response_to'])
+
+        return data
+
+    def _append_row(self, data):
+        """
+        Add a statement to the end of each column and return its row.
+        """
+        row = len(self.removed)
+
+        for field_name in self.STRING_FIELDS:
+            value = data.get(field_name)
+
+            if value is None and field_name != 'in_response_to':
+                value = ''
+
+            self.columns[field_name].append(self._intern(value))
+
+        self.columns['tags'].append(tuple(sorted(set(
+            self._intern(tag) for tag in data.get('tags') or []
+        ))))
+
+        self.columns['created_at'].append(
+            self._to_timestamp(data.get('created_at') or datetime.now(UTC))
+        )
+        self.columns['last_seen_at'].append(self._to_timestamp(data.get('last_seen_at')))
+        self.columns['occurrences'].append(data.get('occurrences') or 1)
+
+        self.removed.append(0)
+
+        self._index_row(row)
+
+        self.statement_count += 1
+
+        return row
+
+    def _find_row(self, text, in_response_to):
+        """
+        Return the row of the statement with the given text and
+        in_response_to values, or None if there is not one.
+        """
+        in_response_to_column = self.columns['in_response_to']
+
+        for row in sorted(self.indexes['text'].get(text, ())):
+            if in_response_to_column[row] == in_response_to:
+                return row
+
+        return None
+
+    def _add_occurrences(self, row, data):
+        """
+        Add the occurrences and tags of a duplicate statement to an existing row.
+        """
+        self.columns['occurrences'][row] += data.get('occurrences') or 1
+
+        last_seen_at = self._to_timestamp(
+            data.get('last_seen_at') or data.get('created_at') or datetime.now(UTC)
+        )
+
+        self.columns['last_seen_at'][row] = max(
+            self.columns['last_seen_at'][row], last_seen_at
+        )
+
+        self._set_tags(row, set(self.columns['tags'][row]) | set(data.get('tags') or []))
+
+    def _set_tags(self, row, tag_names):
+        for tag in self.columns['tags'][row]:
+            self._remove_from_index(self.tag_index, tag, row)
+
+        self.columns['tags'][row] = tuple(sorted(self._intern(tag) for tag in tag_names))
+
+        for tag in self.columns['tags'][row]:
+            self._add_to_index(self.tag_index, tag, row)
+
+    def _save(self, data):
+        """
+        Save the data for a statement and return the row it was saved to.
+        """
+        if self.deduplicate_statements:
+            row = self._find_row(data['text'], data.get('in_response_to'))
+
+            if row is not None:
+                self._add_occurrences(row, data)
+                return row
+
+        return self._append_row(data)
+
+    def _row_to_object(self, row):
+        Statement = self.get_model('statement')
+
+        return Statement(
+            id=row + 1,
+            text=self.columns['text'][row],
+            search_text=self.columns['search_text'][row],
+            conversation=self.columns['conversation'][row],
+            persona=self.columns['persona'][row],
+            tags=list(self.columns['tags'][row]),
+            in_response_to=self.columns['in_response_to'][row],
+            search_in_response_to=self.columns['search_in_response_to'][row],
+            created_at=self._from_timestamp(self.columns['created_at'][row]),
+            occurrences=self.columns['occurrences'][row],
+            last_seen_at=self._from_timestamp(self.columns['last_seen_at'][row])
+        )
+
+    def _row_to_record(self, row, fields):
+        from chatterbot.conversation import StatementRecord
+
+        return StatementRecord(**{
+            field: self._get_value(row, field) for field in fields
+        })
+
+    def _get_value(self, row, field_name):
+        if field_name == 'id':
+            return row + 1
+
+        if field_name in ('created_at', 'last_seen_at', ):
+            return self._from_timestamp(self.columns[field_name][row])
+
+        return self.columns[field_name][row]
+
+    def count(self):
+        """
+        Return the number of entries in the database.
+        """
+        return self.statement_count
+
+    def filter(self, **kwargs):
+        """
+        Returns a list of objects from the database.
+        The kwargs parameter can contain any number
+        of attributes. Only objects which contain all
+        listed attributes and in which all values match
+        for all listed attributes will be returned.
+        """
+        page_size = kwargs.pop('page_size', 1000)
+        order_by = kwargs.pop('order_by', None)
+        tags = kwargs.pop('tags', [])
+        exclude_text = kwargs.pop('exclude_text', None)
+        exclude_text_words = kwargs.pop('exclude_text_words', [])
+        persona_not_startswith = kwargs.pop('persona_not_startswith', None)
+        search_text_contains = kwargs.pop('search_text_contains', None)
+        fields = kwargs.pop('fields', None)
+        id_greater_than = kwargs.pop('id_greater_than', None)
+
+        # Convert a single sting into a list if only one tag is provided
+        if type(tags) == str:
+            tags = [tags]
+
+        if fields:
+            fields = [field for field in fields if field != 'tags']
+
+        with self.lock:
+            candidate_sets = []
+
+            for field_name in self.INDEXED_FIELDS:
+                if field_name in kwargs:
+                    candidate_sets.append(
+                        self.indexes[field_name].get(kwargs.pop(field_name), set())
+                    )
+
+            if tags:
+                candidate_sets.append(set().union(*[
+                    self.tag_index.get(tag, set()) for tag in tags
+                ]))
+
+            if search_text_contains:
+                candidate_sets.append(set().union(*[
+                    self.token_index.get(token, set())
+                    for token in self.get_search_tokens(search_text_contains)
+                ]))
+
+            if candidate_sets:
+                # Start with the smallest set so that each intersection is as small as possible
+                candidate_sets.sort(key=len)
+                rows = set(candidate_sets[0]).intersection(*candidate_sets[1:])
+            elif id_greater_than is not None:
+                rows = range(max(id_greater_than, 0), len(self.removed))
+            else:
+                rows = range(len(self.removed))
+
+            rows = [row for row in rows if not self.removed[row]]
+
+            if 'id' in kwargs:
+                statement_id = kwargs.pop('id')
+                rows = [row for row in rows if row + 1 == statement_id]
+
+            if id_greater_than is not None:
+                rows = [row for row in rows if row + 1 > id_greater_than]
+
+            for field_name, value in kwargs.items():
+                if field_name in ('created_at', 'last_seen_at', ):
+                    value = self._to_timestamp(value)
+
+                column = self.columns[field_name]
+                rows = [row for row in rows if column[row] == value]
+
+            if exclude_text:
+                exclude_text = set(exclude_text)
+                text_column = self.columns['text']
+                rows = [row for row in rows if text_column[row] not in exclude_text]
+
+            if exclude_text_words:
+                exclude_text_words = [word.lower() for word in exclude_text_words]
+                text_column = self.columns['text']
+                rows = [
+                    row for row in rows if not any(
+                        word in text_column[row].lower() for word in exclude_text_words
+                    )
+                ]
+
+            if persona_not_startswith:
+                persona_column = self.columns['persona']
+                rows = [
+                    row for row in rows if not persona_column[row].startswith('bot:')
+                ]
+
+            if order_by:
+                rows.sort(key=lambda row: tuple(
+                    self._get_sort_value(row, field_name) for field_name in order_by
+                ))
+            else:
+                rows.sort()
+
+        for start_index in range(0, len(rows), page_size):
+            with self.lock:
+                page = [
+                    self._row_to_record(row, fields) if fields else self._row_to_object(row)
+                    for row in rows[start_index:start_index + page_size]
+                    if row < len(self.removed) and not self.removed[row]
+                ]
+
+            yield from page
+
+    def _get_sort_value(self, row, field_name):
+        if field_name == 'id':
+            return row
+
+        value = self.columns[field_name][row]
+
+        # Statements without a value are sorted first
+        if field_name in ('in_response_to', ):
+            return (value is not None, value or '', )
+
+        return value
+
+    @write_method
+    def create(self, **kwargs):
+        """
+        Creates a new statement matching the keyword arguments specified.
+        Returns the created statement.
+        """
+        data = self._prepare_statement_data(dict(kwargs))
+
+        with self.lock:
+            row = self._save(data)
+
+            return self._row_to_object(row)
+
+    @write_method
+    def create_many(self, statements):
+        """
+        Creates multiple statement entries.
+        """
+        statement_data = []
+
+        for statement in statements:
+            data = statement.serialize()
+
+            if not statement.search_text:
+                data['search_text'] = self.tagger.get_text_index_string(statement.text)
+
+            if not statement.search_in_response_to and statement.in_response_to:
+                data['search_in_response_to'] = self.tagger.get_text_index_string(statement.in_response_to)
+
+            statement_data.append(data)
+
+        with self.lock:
+            for data in statement_data:
+                self._save(data)
+
+    @write_method
+    def update(self, statement):
+        """
+        Modifies an entry in the database.
+        Creates an entry if one does not exist.
+        """
+        if statement is None:
+            return
+
+        with self.lock:
+            row = None
+
+            if getattr(statement, 'id', None) is not None:
+                row = statement.id - 1
+
+                if not 0 <= row < len(self.removed) or self.removed[row]:
+                    row = None
+            else:
+                for candidate in sorted(self.indexes['text'].get(statement.text, ())):
+                    if self.columns['conversation'][candidate] == statement.conversation:
+                        row = candidate
+                        break
+
+            data = {
+                'text': statement.text,
+                'conversation': statement.conversation,
+                'persona': statement.persona,
+                'in_response_to': statement.in_response_to,
+                'created_at': statement.created_at,
+                'search_text': self.tagger.get_text_index_string(statement.text),
+                'search_in_response_to': '',
+                'tags': statement.get_tags(),
+            }
+
+            if statement.in_response_to:
+                data['search_in_response_to'] = self.tagger.get_text_index_string(statement.in_response_to)
+
+            # Create a new statement entry if one does not already exist
+            if row is None:
+                self._append_row(data)
+                return
+
+            self._unindex_row(row)
+
+            for field_name in ('in_response_to', 'search_text', 'search_in_response_to', ):
+                self.columns[field_name][row] = self._intern(data[field_name])
+
+            self.columns['created_at'][row] = self._to_timestamp(data['created_at'])
+
+            self.columns['tags'][row] = tuple(sorted(
+                set(self.columns['tags'][row]) | set(self._intern(tag) for tag in data['tags'])
+            ))
+
+            self._index_row(row)
+
+    def get_random(self):
+        """
+        Returns a random statement from the database.
+        """
+        import random
+
+        with self.lock:
+            if not self.statement_count:
+                raise self.EmptyDatabaseException()
+
+            # Removed rows are skipped, so try a few rows before
+            # choosing from the list of remaining rows
+            for _attempt in range(10):
+                row = random.randrange(len(self.removed))
+
+                if not self.removed[row]:
+                    return self._row_to_object(row)
+
+            row = random.choice([
+                row for row in range(len(self.removed)) if not self.removed[row]
+            ])
+
+            return self._row_to_object(row)
+
+    @write_method
+    def remove(self, statement_text):
+        """
+        Removes the statement that matches the input text.
+        """
+        with self.lock:
+            rows = self.indexes['text'].get(statement_text)
+
+            if rows:
+                self._remove_row(min(rows))
+
+    def _remove_row(self, row):
+        self._unindex_row(row)
+        self.removed[row] = 1
+        self.statement_count -= 1
+
+    @write_method
+    def compact(self):
+        """
+        Combine statements that have the same ``text`` and ``in_response_to``
+        values into the statement with the lowest id.
+
+        Returns the number of statements that were removed.
+        """
+        removed_count = 0
+
+        with self.lock:
+            first_rows = {}
+
+            for row in range(len(self.removed)):
+                if self.removed[row]:
+                    continue
+
+                key = (self.columns['text'][row], self.columns['in_response_to'][row], )
+
+                if key not in first_rows:
+                    first_rows[key] = row
+                    continue
+
+                first_row = first_rows[key]
+
+                self._add_occurrences(first_row, {
+                    'occurrences': self.columns['occurrences'][row],
+                    'last_seen_at': self._from_timestamp(self.columns['last_seen_at'][row]),
+                    'created_at': self._from_timestamp(self.columns['created_at'][row]),
+                    'tags': self.columns['tags'][row],
+                })
+
+                self._remove_row(row)
+                removed_count += 1
+
+        return removed_count
+
+    @write_method
+    def drop(self):
+        """
+        Remove all statements.
+        """
+        with self.lock:
+            self._create_columns()
+
+    def save_snapshot(self, file_path=None):
+        """
+        Save the statements to a compressed snapshot file.
+        Removed statements are not included in the snapshot.
+        """
+        import os
+        import gzip
+        import json
+
+        file_path = file_path or self.snapshot_path
+
+        with self.lock:
+            rows = [row for row in range(len(self.removed)) if not self.removed[row]]
+
+            snapshot = {
+                'version': self.SNAPSHOT_VERSION,
+                'columns': {
+                    field_name: [self.columns[field_name][row] for row in rows]
+                    for field_name in self.columns
+                }
+            }
+
+            snapshot['columns']['tags'] = [list(tags) for tags in snapshot['columns']['tags']]
+
+        temporary_path = file_path + '.tmp'
+
+        with gzip.open(temporary_path, 'wt', encoding='utf8') as snapshot_file:
+            json.dump(snapshot, snapshot_file, ensure_ascii=False)
+
+        os.replace(temporary_path, file_path)
+
+    def load_snapshot(self, file_path=None):
+        """
+        Replace the statements with the statements in a snapshot file.
+        """
+        import gzip
+        import json
+
+        file_path = file_path or self.snapshot_path
+
+        with gzip.open(file_path, 'rt', encoding='utf8') as snapshot_file:
+            snapshot = json.load(snapshot_file)
+
+        if snapshot.get('version') != self.SNAPSHOT_VERSION:
+            raise self.SnapshotException(
+                'The snapshot {} was created by a different version of the storage adapter.'.format(
+                    file_path
+                )
+            )
+
+        columns = snapshot['columns']
+
+        with self.lock:
+            self._create_columns()
+
+            for field_name in self.STRING_FIELDS:
+                self.columns[field_name].extend(
+                    self._intern(value) for value in columns[field_name]
+                )
+
+            self.columns['tags'].extend(
+                tuple(self._intern(tag) for tag in tags) for tags in columns['tags']
+            )
+
+            for field_name in ('created_at', 'last_seen_at', 'occurrences', ):
+                self.columns[field_name].extend(columns[field_name])
+
+            self.removed.extend(bytes(len(columns['text'])))
+
+            for row in range(len(self.removed)):
+                self._index_row(row)
+
+            self.statement_count = len(self.removed)
+
+    class SnapshotException(Exception):
+        pass
@@ -0,0 +1,151 @@
+"""
+Copy statements from one storage adapter to another.
+"""
+import os
+import json
+from chatterbot import utils
+
+
+def read_checkpoint(checkpoint_path):
+    """
+    Return the number of statements that a previous migration copied and
+    the id of the last statement it copied, or None if it is not known.
+    """
+    if not checkpoint_path or not os.path.exists(checkpoint_path):
+        return 0, None
+
+    with open(checkpoint_path, encoding='utf8') as checkpoint_file:
+        checkpoint = json.load(checkpoint_file)
+
+    return checkpoint.get('migrated', 0), checkpoint.get('last_id')
+
+
+def write_checkpoint(checkpoint_path, migrated, last_id=None):
+    """
+    Save the number of statements that have been copied and the id of the last one.
+    """
+    temporary_path = checkpoint_path + '.tmp'
+
+    # Ids that are not integers, such as MongoDB ids, are saved as strings
+    if last_id is not None and not isinstance(last_id, int):
+        last_id = str(last_id)
+
+    with open(temporary_path, 'w', encoding='utf8') as checkpoint_file:
+        json.dump({'migrated': migrated, 'last_id': last_id}, checkpoint_file)
+
+    os.replace(temporary_path, checkpoint_path)
+
+
+def migrate(source_adapter, dest_adapter, batch_size=1000, checkpoint_path=None, show_progress=False):
+    """
+    Copy every statement from one storage adapter to another.
+
+    Statements keep their search text, tags, timestamps and occurrences,
+    so they are not tagged again when they are saved. Statements are read
+    from the source in the order of their ids and saved in batches.
+
+    When the ``is_thread_safe`` attribute of the destination adapter is true,
+    each batch is written from a background thread while the next batch is
+    read. Otherwise, such as for an in-memory SQLite database, every batch
+    is written on the calling thread.
+
+    :param source_adapter: The storage adapter to copy statements from.
+    :param dest_adapter: The storage adapter to copy statements to.
+
+    :param batch_size: The number of statements to save at a time.
+    :type batch_size: int
+
+    :param checkpoint_path: A file used to record the id of the last statement
+        that was copied. If the migration is stopped, running it again with the
+        same file only reads the statements after the last batch that was saved.
+    :type checkpoint_path: str
+
+    :param show_progress: Print a progress bar while statements are copied.
+    :type show_progress: bool
+
+    :returns: The number of statements that were copied.
+    :rtype: int
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from chatterbot.conversation import Statement
+
+    completed, last_id = read_checkpoint(checkpoint_path)
+    migrated = completed
+
+    total_statements = source_adapter.count()
+
+    def write_batch(batch, migrated, last_id):
+        dest_adapter.create_many(batch)
+
+        if checkpoint_path:
+            write_checkpoint(checkpoint_path, migrated, last_id)
+
+    filter_parameters = {
+        'order_by': ['id'],
+        'page_size': batch_size,
+    }
+
+    # Checkpoints written by earlier versions only have the number of statements
+    skip_count = completed
+
+    if last_id is not None:
+        filter_parameters['id_greater_than'] = last_id
+        skip_count = 0
+
+    statements = source_adapter.filter(**filter_parameters)
+
+    # The destination can only be written to from another thread if it is thread safe
+    executor = None
+
+    if dest_adapter.is_thread_safe:
+        executor = ThreadPoolExecutor(max_workers=1)
+
+    pending_write = None
+    batch = []
+
+    try:
+        for index, statement in enumerate(statements):
+
+            if index < skip_count:
+                continue
+
+            last_id = statement.id
+
+            # Copy the statement rather than changing the source's object, which can
+            # be a database model, and let the destination database assign the id
+            statement_data = statement.serialize()
+            statement_data.pop('id', None)
+
+            batch.append(Statement(**statement_data))
+
+            if len(batch) >= batch_size:
+                migrated += len(batch)
+
+                # Wait for the previous batch so that errors are not lost
+                if pending_write:
+                    pending_write.result()
+
+                if executor is None:
+                    write_batch(batch, migrated, last_id)
+                else:
+                    pending_write = executor.submit(write_batch, batch, migrated, last_id)
+
+                batch = []
+
+                if show_progress:
+                    utils.print_progress_bar('Migrating statements', migrated, total_statements)
+
+        if pending_write:
+            pending_write.result()
+
+        if batch:
+            migrated += len(batch)
+            write_batch(batch, migrated, last_id)
+
+            if show_progress:
+                utils.print_progress_bar('Migrating statements', migrated, total_statements)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return migrated - completed
@@ -0,0 +1,410 @@
+import sys
+import json
+from array import array
+from chatterbot.storage.memory_storage import InMemoryStorageAdapter, NOT_SEEN
+
+
+# The first bytes of every statement file
+MAGIC = b'CBSTMTS\x00'
+
+STATEMENT_FILE_VERSION = 1
+
+# The string id stored for fields that do not have a value
+NO_STRING = 0xFFFFFFFF
+
+# The fields that have a posting list of the rows with each value
+INDEX_NAMES = (
+    'text',
+    'conversation',
+    'search_in_response_to',
+    'tags',
+    'tokens',
+)
+
+
+def write_mmap_file(file_path, statements):
+    """
+    Write statements to a file that can be opened by the ``MmapStorageAdapter``.
+
+    The statements should already have their search text, such as the
+    statements returned by the ``filter`` method of another storage adapter.
+
+    :param file_path: The path of the file to create.
+    :param statements: An iterable of statement objects.
+
+    :returns: The number of statements that were written.
+    :rtype: int
+    """
+    import os
+    from datetime import datetime
+    from pytz import UTC
+
+    string_ids = {}
+    strings = []
+
+    def get_string_id(value):
+        if value is None:
+            return NO_STRING
+
+        string_id = string_ids.get(value)
+
+        if string_id is None:
+            string_id = len(strings)
+            string_ids[value] = string_id
+            strings.append(value)
+
+        return string_id
+
+    columns = {
+        field_name: array('I') for field_name in InMemoryStorageAdapter.STRING_FIELDS
+    }
+    columns['created_at'] = array('d')
+    columns['last_seen_at'] = array('d')
+    columns['occurrences'] = array('q')
+
+    tag_offsets = array('I', [0])
+    tag_values = array('I')
+
+    postings = {
+        index_name: {} for index_name in INDEX_NAMES
+    }
+
+    def to_timestamp(value):
+        if value is None:
+            return NOT_SEEN
+
+        if not value.tzinfo:
+            value = value.replace(tzinfo=UTC)
+
+        return value.timestamp()
+
+    row = 0
+
+    for statement in statements:
+        for field_name in InMemoryStorageAdapter.STRING_FIELDS:
+            value = getattr(statement, field_name)
+
+            if value is None and field_name != 'in_response_to':
+                value = ''
+
+            columns[field_name].append(get_string_id(value))
+
+        columns['created_at'].append(to_timestamp(statement.created_at or datetime.now(UTC)))
+        columns['last_seen_at'].append(to_timestamp(statement.last_seen_at))
+        columns['occurrences'].append(statement.occurrences or 1)
+
+        tags = sorted(set(statement.get_tags()))
+        tag_values.extend(get_string_id(tag) for tag in tags)
+        tag_offsets.append(len(tag_values))
+
+        index_values = {
+            'text': [statement.text],
+            'conversation': [statement.conversation or ''],
+            'search_in_response_to': [statement.search_in_response_to or ''],
+            'tags': tags,
+            'tokens': set(token for token in (statement.search_text or '').split(' ') if token),
+        }
+
+        for index_name, values in index_values.items():
+            for value in values:
+                postings[index_name].setdefault(get_string_id(value), array('I')).append(row)
+
+        row += 1
+
+    encoded_strings = [value.encode('utf8') for value in strings]
+
+    string_offsets = array('Q', [0])
+    for encoded_string in encoded_strings:
+        string_offsets.append(string_offsets[-1] + len(encoded_string))
+
+    sections = [
+        ('strings.offsets', string_offsets),
+        ('strings.data', b''.join(encoded_strings)),
+        ('statement_tags.offsets', tag_offsets),
+        ('statement_tags.values', tag_values),
+    ]
+
+    sections.extend(columns.items())
+
+    for index_name in INDEX_NAMES:
+        # Keys are sorted by their encoded value so that they can be found with a binary search
+        keys = sorted(postings[index_name], key=lambda string_id: encoded_strings[string_id])
+
+        offsets = array('I', [0])
+        rows = array('I')
+
+        for string_id in keys:
+            rows.extend(postings[index_name][string_id])
+            offsets.append(len(rows))
+
+        sections.append((index_name + '.keys', array('I', keys)))
+        sections.append((index_name + '.offsets', offsets))
+        sections.append((index_name + '.rows', rows))
+
+    # Each section starts on an 8 byte boundary after the header
+    header = {
+        'version': STATEMENT_FILE_VERSION,
+        'byteorder': sys.byteorder,
+        'statement_count': row,
+        'sections': {},
+    }
+
+    offset = 0
+    for name, data in sections:
+        typecode = data.typecode if isinstance(data, array) else 'B'
+        size = len(data) * data.itemsize if isinstance(data, array) else len(data)
+        header['sections'][name] = [offset, size, typecode]
+        offset += size + (-size % 8)
+
+    header_data = json.dumps(header).encode('utf8')
+    header_data += b' ' * (-len(header_data) % 8)
+
+    temporary_path = file_path + '.tmp'
+
+    with open(temporary_path, 'wb') as statement_file:
+        statement_file.write(MAGIC)
+        statement_file.write(len(header_data).to_bytes(8, 'little'))
+        statement_file.write(header_data)
+
+        for name, data in sections:
+            data = data.tobytes() if isinstance(data, array) else data
+            statement_file.write(data)
+            statement_file.write(b'\x00' * (-len(data) % 8))
+
+    os.replace(temporary_path, file_path)
+
+    return row
+
+
+class MmapStorageAdapter(InMemoryStorageAdapter):
+    """
+    The MmapStorageAdapter serves statements from a read-only file created
+    by ``write_mmap_file``.
+
+    The file is memory-mapped, so opening it does not read the statements
+    into memory and processes that open the same file share its pages.
+    Values are only decoded when a statement is returned. The file contains
+    posting lists of the rows with each ``text``, ``conversation``,
+    ``search_in_response_to``, tag and search text token.
+
+    Statements cannot be created, updated or removed. Chat bots that use
+    this adapter should set ``read_only=True``.
+
+    :keyword mmap_path: The path of the statement file.
+    :type mmap_path: str
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+        self.mmap_path = kwargs.get('mmap_path')
+
+        if not self.mmap_path:
+            raise self.StatementFileException(
+                'The MmapStorageAdapter requires the path of a statement file as "mmap_path".'
+            )
+
+        self.open(self.mmap_path)
+
+    def open(self, file_path):
+        """
+        Memory-map a statement file and use it for the statements.
+        """
+        import mmap
+
+        with open(file_path, 'rb') as statement_file:
+            self.mmap = mmap.mmap(statement_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        buffer = memoryview(self.mmap)
+
+        if bytes(buffer[:len(MAGIC)]) != MAGIC:
+            raise self.StatementFileException(
+                '{} is not a statement file.'.format(file_path)
+            )
+
+        header_size = int.from_bytes(buffer[len(MAGIC):len(MAGIC) + 8], 'little')
+        data_start = len(MAGIC) + 8 + header_size
+
+        header = json.loads(bytes(buffer[len(MAGIC) + 8:data_start]).decode('utf8'))
+
+        if header['version'] != STATEMENT_FILE_VERSION or header['byteorder'] != sys.byteorder:
+            raise self.StatementFileException(
+                'The statement file {} was created by a different version of the storage adapter '
+                'or on a system with a different byte order.'.format(file_path)
+            )
+
+        self.sections = {}
+
+        for name, (offset, size, typecode) in header['sections'].items():
+            section = buffer[data_start + offset:data_start + offset + size]
+            self.sections[name] = section.cast(typecode) if typecode != 'B' else section
+
+        self.strings = _StringTable(self.sections['strings.offsets'], self.sections['strings.data'])
+
+        self.columns = {
+            field_name: _StringColumn(self.strings, self.sections[field_name])
+            for field_name in self.STRING_FIELDS
+        }
+        self.columns['tags'] = _TagColumn(
+            self.strings, self.sections['statement_tags.offsets'], self.sections['statement_tags.values']
+        )
+
+        for field_name in ('created_at', 'last_seen_at', 'occurrences', ):
+            self.columns[field_name] = self.sections[field_name]
+
+        self.indexes = {
+            field_name: _PostingIndex(self.strings, self.sections, field_name)
+            for field_name in self.INDEXED_FIELDS
+        }
+        self.tag_index = _PostingIndex(self.strings, self.sections, 'tags')
+        self.token_index = _PostingIndex(self.strings, self.sections, 'tokens')
+
+        self.statement_count = header['statement_count']
+
+        # Statements cannot be removed from a statement file
+        self.removed = _NoRemovedRows(self.statement_count)
+
+    def close(self):
+        """
+        Release the memory-mapped statement file.
+        """
+        for section in self.sections.values():
+            section.release()
+
+        self.sections = {}
+        self.mmap.close()
+
+    def _read_only(self, method_name):
+        raise self.AdapterMethodNotImplementedError(
+            'The `{}` method cannot be used because the MmapStorageAdapter is read only.'.format(
+                method_name
+            )
+        )
+
+    def create(self, **kwargs):
+        self._read_only('create')
+
+    def create_many(self, statements):
+        self._read_only('create_many')
+
+    def update(self, statement):
+        self._read_only('update')
+
+    def remove(self, statement_text):
+        self._read_only('remove')
+
+    def compact(self):
+        self._read_only('compact')
+
+    def drop(self):
+        self._read_only('drop')
+
+    def load_snapshot(self, file_path=None):
+        self._read_only('load_snapshot')
+
+    class StatementFileException(Exception):
+        pass
+
+
+class _StringTable(object):
+    """
+    The UTF-8 strings stored in a statement file.
+    """
+
+    def __init__(self, offsets, data):
+        self.offsets = offsets
+        self.data = data
+
+    def __getitem__(self, string_id):
+        if string_id == NO_STRING:
+            return None
+
+        return str(self.data[self.offsets[string_id]:self.offsets[string_id + 1]], 'utf8')
+
+    def get_bytes(self, string_id):
+        return self.data[self.offsets[string_id]:self.offsets[string_id + 1]].tobytes()
+
+
+class _StringColumn(object):
+    """
+    A column of string ids that are decoded when they are read.
+    """
+
+    def __init__(self, strings, string_ids):
+        self.strings = strings
+        self.string_ids = string_ids
+
+    def __len__(self):
+        return len(self.string_ids)
+
+    def __getitem__(self, row):
+        return self.strings[self.string_ids[row]]
+
+
+class _TagColumn(object):
+    """
+    The tags of each statement.
+    """
+
+    def __init__(self, strings, offsets, values):
+        self.strings = strings
+        self.offsets = offsets
+        self.values = values
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, row):
+        return tuple(
+            self.strings[string_id]
+            for string_id in self.values[self.offsets[row]:self.offsets[row + 1]]
+        )
+
+
+class _PostingIndex(object):
+    """
+    Finds the rows with a given value by searching the sorted keys of an index.
+    """
+
+    def __init__(self, strings, sections, index_name):
+        self.strings = strings
+        self.keys = sections[index_name + '.keys']
+        self.offsets = sections[index_name + '.offsets']
+        self.rows = sections[index_name + '.rows']
+
+    def get(self, value, default=None):
+        if not isinstance(value, str):
+            return default
+
+        encoded_value = value.encode('utf8')
+
+        low = 0
+        high = len(self.keys)
+
+        while low < high:
+            middle = (low + high) // 2
+            key = self.strings.get_bytes(self.keys[middle])
+
+            if key < encoded_value:
+                low = middle + 1
+            elif key > encoded_value:
+                high = middle
+            else:
+                return set(self.rows[self.offsets[middle]:self.offsets[middle + 1]])
+
+        return default
+
+
+class _NoRemovedRows(object):
+    """
+    Reports that none of the rows in a statement file have been removed.
+    """
+
+    def __init__(self, row_count):
+        self.row_count = row_count
+
+    def __len__(self):
+        return self.row_count
+
+    def __getitem__(self, row):
+        return 0
@@ -1,5 +1,6 @@
 import re
 from chatterbot.storage import StorageAdapter
+from chatterbot.storage.storage_adapter import write_method
 
 
 class MongoDatabaseAdapter(StorageAdapter):
@@ -15,12 +16,31 @@ class MongoDatabaseAdapter(StorageAdapter):
     .. code-block:: python
 
        database_uri='mongodb://example.com:8100/'
+
+    :keyword write_batch_size: The maximum number of statements to send
+                               to the database in a single bulk write.
+                               Defaults to 1000
+    :type write_batch_size: int
+
+    :keyword write_concern: Options for the write concern used when saving
+                            statements, for example ``{'w': 1}``.
+                            Defaults to the write concern of the database.
+    :type write_concern: dict
     """
 
+    # The MongoClient has a pool of connections that threads share
+    is_thread_safe = True
+
+    # search_text_contains matches whole tokens of the search_tokens field
+    searches_by_token = True
+
+    UNIQUE_STATEMENT_INDEX_NAME = 'text_in_response_to_unique'
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         from pymongo import MongoClient
         from pymongo.errors import OperationFailure
+        from pymongo.write_concern import WriteConcern
 
         self.database_uri = kwargs.get(
             'database_uri', 'mongodb://localhost:27017/chatterbot-database'
@@ -38,8 +58,20 @@ class MongoDatabaseAdapter(StorageAdapter):
         # Specify the name of the database
         self.database = self.client.get_database()
 
+        self.write_batch_size = kwargs.get('write_batch_size', 1000)
+
+        write_concern = kwargs.get('write_concern')
+
+        if write_concern is not None:
+            write_concern = WriteConcern(**write_concern)
+
         # The mongo collection of statement documents
-        self.statements = self.database['statements']
+        self.statements = self.database.get_collection(
+            'statements',
+            write_concern=write_concern
+        )
+
+        self.create_indexes()
 
     def get_statement_model(self):
         """
@@ -53,6 +85,85 @@ class MongoDatabaseAdapter(StorageAdapter):
 
         return statement
 
+    def create_indexes(self):
+        """
+        Create the indexes used when filtering statements.
+        Indexes that already exist are left unchanged.
+        """
+        import pymongo
+
+        self.statements.create_index([('conversation', pymongo.ASCENDING)])
+        self.statements.create_index([('search_in_response_to', pymongo.ASCENDING)])
+        self.statements.create_index([('persona', pymongo.ASCENDING)])
+        self.statements.create_index([('text', pymongo.ASCENDING)])
+
+        # A multikey index over each token in the search text
+        self.statements.create_index([('search_tokens', pymongo.ASCENDING)])
+
+        if self.deduplicate_statements:
+            self.create_unique_statement_index()
+
+        self.add_missing_search_tokens()
+
+        # Statements saved before occurrences were counted have been seen once
+        self.statements.update_many(
+            {'occurrences': {'$exists': False}},
+            {'$set': {'occurrences': 1}}
+        )
+
+    def create_unique_statement_index(self):
+        """
+        Create a unique index on the text and in_response_to values of the
+        statements, so that concurrent upserts of deduplicated statements
+        cannot create duplicates. The index cannot be created while the
+        collection has duplicate statements, which ``compact`` combines.
+
+        Returns True if the index exists.
+        """
+        import pymongo
+        from pymongo.errors import OperationFailure
+
+        try:
+            self.statements.create_index(
+                [('text', pymongo.ASCENDING), ('in_response_to', pymongo.ASCENDING)],
+                name=self.UNIQUE_STATEMENT_INDEX_NAME,
+                unique=True
+            )
+        except OperationFailure:
+            self.logger.warning(
+                'The database does not have a unique index for deduplicated statements. '
+                'Call compact() to combine the existing duplicates and create it.'
+            )
+            return False
+
+        return True
+
+    def add_missing_search_tokens(self):
+        """
+        Populate the search_tokens field for any statements
+        that were saved before the field existed.
+        """
+        missing = self.statements.find(
+            {'search_tokens': {'$exists': False}},
+            {'search_text': True}
+        )
+
+        for statement_data in missing:
+            self.statements.update_one(
+                {'_id': statement_data['_id']},
+                {'$set': {
+                    'search_tokens': self.get_search_tokens(
+                        statement_data.get('search_text', '')
+                    )
+                }}
+            )
+
+    def get_search_tokens(self, search_text):
+        """
+        Return the list of tokens in a statement's search text.
+        """
+        return [token for token in (search_text or '').split(' ') if token]
+
     def count(self):
         return self.statements.count()
 
@@ -67,6 +178,17 @@ class MongoDatabaseAdapter(StorageAdapter):
 
         return Statement(**statement_data)
 
+    def mongo_to_record(self, statement_data):
+        """
+        Return a StatementRecord when given a partial
+        document returned from Mongo DB.
+        """
+        from chatterbot.conversation import StatementRecord
+
+        statement_data['id'] = statement_data.pop('_id')
+
+        return StatementRecord(**statement_data)
+
     def filter(self, **kwargs):
         """
         Returns a list of statements in the database
@@ -81,12 +203,28 @@ class MongoDatabaseAdapter(StorageAdapter):
         exclude_text_words = kwargs.pop('exclude_text_words', [])
         persona_not_startswith = kwargs.pop('persona_not_startswith', None)
         search_text_contains = kwargs.pop('search_text_contains', None)
+        fields = kwargs.pop('fields', None)
+        id_greater_than = kwargs.pop('id_greater_than', None)
+
+        projection = None
+
+        if fields:
+            projection = {
+                field: True for field in fields if field not in ('id', 'tags', )
+            }
 
         if tags:
             kwargs['tags'] = {
                 '$in': tags
             }
 
+        if id_greater_than is not None:
+            from bson.objectid import ObjectId
+
+            kwargs['_id'] = {
+                '$gt': ObjectId(id_greater_than)
+            }
+
         if exclude_text:
             if 'text' not in kwargs:
                 kwargs['text'] = {}
@@ -121,12 +259,10 @@ class MongoDatabaseAdapter(StorageAdapter):
             kwargs['persona']['$not'] = re.compile('^bot:*')
 
         if search_text_contains:
-            or_regex = '|'.join([
-                '{}'.format(re.escape(word)) for word in search_text_contains.split(' ')
-            ])
-            # try matching whole words rather than part; for example 'hi' shouldn't match 'white'
-            or_regex = '\\b' + or_regex + '\\b'
-            kwargs['search_text'] = re.compile(or_regex)
+            # Match whole tokens rather than part; for example 'hi' shouldn't match 'white'
+            kwargs['search_tokens'] = {
+                '$in': self.get_search_tokens(search_text_contains)
+            }
 
         mongo_ordering = []
 
@@ -138,18 +274,24 @@ class MongoDatabaseAdapter(StorageAdapter):
                 mongo_ordering.append(('created_at', pymongo.DESCENDING, ))
 
             for order in order_by:
+                # The id of each statement is stored in the _id field
+                if order == 'id':
+                    order = '_id'
+
                 mongo_ordering.append((order, pymongo.ASCENDING))
 
-        total_statements = self.statements.find(kwargs).count()
+        matches = self.statements.find(kwargs, projection).batch_size(page_size)
+
+        if mongo_ordering:
+            matches = matches.sort(mongo_ordering)
 
-        for start_index in range(0, total_statements, page_size):
-            if mongo_ordering:
-                for match in self.statements.find(kwargs).sort(mongo_ordering).skip(start_index).limit(page_size):
-                    yield self.mongo_to_object(match)
+        for match in matches:
+            if fields:
+                yield self.mongo_to_record(match)
             else:
-                for match in self.statements.find(kwargs).skip(start_index).limit(page_size):
-                    yield self.mongo_to_object(match)
+                yield self.mongo_to_object(match)
 
+    @write_method
     def create(self, **kwargs):
         """
         Creates a new statement matching the keyword arguments specified.
@@ -167,39 +309,159 @@ class MongoDatabaseAdapter(StorageAdapter):
             if kwargs.get('in_response_to'):
                 kwargs['search_in_response_to'] = self.tagger.get_text_index_string(kwargs['in_response_to'])
 
+        kwargs['search_tokens'] = self.get_search_tokens(kwargs['search_text'])
+        kwargs.setdefault('occurrences', 1)
+
+        if self.deduplicate_statements:
+            from pymongo import ReturnDocument
+            from pymongo.errors import DuplicateKeyError
+
+            query, update = self.statement_to_upsert(kwargs)
+
+            try:
+                statement_data = self.statements.find_one_and_update(
+                    query, update, upsert=True, return_document=ReturnDocument.AFTER
+                )
+            except DuplicateKeyError:
+                # Another write inserted the statement after it was not found,
+                # so the update now matches the statement that was inserted
+                statement_data = self.statements.find_one_and_update(
+                    query, update, upsert=True, return_document=ReturnDocument.AFTER
+                )
+
+            return self.mongo_to_object(statement_data)
+
         inserted = self.statements.insert_one(kwargs)
 
         kwargs['id'] = inserted.inserted_id
 
         return Statement(**kwargs)
 
+    @write_method
     def create_many(self, statements):
         """
         Creates multiple statement entries.
+
+        Statements are written in unordered bulk writes of up to
+        ``write_batch_size`` documents. Each batch is sent from a background
+        thread while the search text for the next batch is generated.
         """
-        create_statements = []
+        from concurrent.futures import ThreadPoolExecutor
+        from pymongo import InsertOne, UpdateOne
+
+        statements = list(statements)
+
+        if self.deduplicate_statements:
+            statements = self.get_unique_statements(statements)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending_write = None
+
+            for start_index in range(0, len(statements), self.write_batch_size):
+                batch = statements[start_index:start_index + self.write_batch_size]
+
+                if self.deduplicate_statements:
+                    requests = [
+                        UpdateOne(
+                            *self.statement_to_upsert(self.statement_to_document(statement)),
+                            upsert=True
+                        ) for statement in batch
+                    ]
+                else:
+                    requests = [
+                        InsertOne(self.statement_to_document(statement)) for statement in batch
+                    ]
 
-        for statement in statements:
-            statement_data = statement.serialize()
-            tag_data = list(set(statement_data.pop('tags', [])))
-            statement_data['tags'] = tag_data
+                # Wait for the previous batch so that errors are not lost
+                if pending_write:
+                    pending_write.result()
+
+                pending_write = executor.submit(self.bulk_write, requests)
+
+            if pending_write:
+                pending_write.result()
+
+    def bulk_write(self, requests):
+        """
+        Send an unordered bulk write. Upserts that fail because another
+        write inserted the same statement first are sent again, so that
+        they update the statement that was inserted.
+        """
+        from pymongo.errors import BulkWriteError
+
+        try:
+            self.statements.bulk_write(requests, ordered=False)
+        except BulkWriteError as error:
+            write_errors = error.details.get('writeErrors', [])
+
+            # 11000 is the code of a duplicate key error
+            if not self.deduplicate_statements or any(
+                write_error.get('code') != 11000 for write_error in write_errors
+            ):
+                raise
+
+            self.statements.bulk_write([
+                requests[write_error['index']] for write_error in write_errors
+            ], ordered=False)
+
+    def statement_to_document(self, statement):
+        """
+        Return the document that should be saved for a statement object.
+        """
+        statement_data = statement.serialize()
+        tag_data = list(set(statement_data.pop('tags', [])))
+        statement_data['tags'] = tag_data
 
-            if not statement.search_text:
-                statement_data['search_text'] = self.tagger.get_text_index_string(statement.text)
+        if not statement.search_text:
+            statement_data['search_text'] = self.tagger.get_text_index_string(statement.text)
 
-            if not statement.search_in_response_to and statement.in_response_to:
-                statement_data['search_in_response_to'] = self.tagger.get_text_index_string(statement.in_response_to)
+        if not statement.search_in_response_to and statement.in_response_to:
+            statement_data['search_in_response_to'] = self.tagger.get_text_index_string(statement.in_response_to)
 
-            create_statements.append(statement_data)
+        statement_data['search_tokens'] = self.get_search_tokens(statement_data['search_text'])
 
-        self.statements.insert_many(create_statements)
+        return statement_data
 
+    def statement_to_upsert(self, statement_data):
+        """
+        Return the query and update that add the occurrences of a statement
+        to the existing document with the same text and in_response_to
+        values, or insert the statement if one does not exist.
+        """
+        from datetime import datetime
+        from pytz import UTC
+
+        statement_data = dict(statement_data)
+        statement_data.pop('id', None)
+
+        tags = list(set(statement_data.pop('tags', None) or []))
+        occurrences = statement_data.pop('occurrences', None) or 1
+        last_seen_at = statement_data.pop('last_seen_at', None) or statement_data.get(
+            'created_at', datetime.now(UTC)
+        )
+
+        query = {
+            'text': statement_data['text'],
+            'in_response_to': statement_data.get('in_response_to')
+        }
+
+        update = {
+            '$setOnInsert': statement_data,
+            '$inc': {'occurrences': occurrences},
+            '$max': {'last_seen_at': last_seen_at},
+            '$addToSet': {'tags': {'$each': tags}}
+        }
+
+        return query, update
+
+    @write_method
     def update(self, statement):
         data = statement.serialize()
         data.pop('id', None)
         data.pop('tags', None)
 
         data['search_text'] = self.tagger.get_text_index_string(data['text'])
+        data['search_tokens'] = self.get_search_tokens(data['search_text'])
 
         if data.get('in_response_to'):
             data['search_in_response_to'] = self.tagger.get_text_index_string(data['in_response_to'])
@@ -236,29 +498,81 @@ class MongoDatabaseAdapter(StorageAdapter):
 
     def get_random(self):
         """
-        Returns a random statement from the database
-        """
-        from random import randint
+        Returns a random statement from the database.
 
-        count = self.count()
+        Uses the ``$sample`` aggregation stage so that the server can pick
+        a document without scanning and skipping over the collection.
+        """
+        statements = list(self.statements.aggregate([
+            {'$sample': {'size': 1}}
+        ]))
 
-        if count < 1:
+        if not statements:
             raise self.EmptyDatabaseException()
 
-        random_integer = randint(0, count - 1)
+        return self.mongo_to_object(statements[0])
+
+    @write_method
+    def compact(self):
+        """
+        Combine statements that have the same ``text`` and ``in_response_to``
+        values into the statement that was created first. When statements
+        are deduplicated, the unique index on those values is created
+        once the duplicates have been combined.
+
+        Returns the number of statements that were removed.
+        """
+        duplicate_groups = self.statements.aggregate([
+            {'$sort': {'_id': 1}},
+            {'$group': {
+                '_id': {'text': '$text', 'in_response_to': '$in_response_to'},
+                'ids': {'$push': '$_id'},
+                'occurrences': {'$sum': {'$ifNull': ['$occurrences', 1]}},
+                'last_seen_at': {'$max': {'$ifNull': ['$last_seen_at', '$created_at']}},
+                'tags': {'$push': '$tags'}
+            }},
+            {'$match': {'ids.1': {'$exists': True}}}
+        ], allowDiskUse=True)
+
+        removed_count = 0
 
-        statements = self.statements.find().limit(1).skip(random_integer)
+        for group in duplicate_groups:
+            statement_id = group['ids'][0]
+            duplicate_ids = group['ids'][1:]
 
-        return self.mongo_to_object(list(statements)[0])
+            tags = set()
+            for statement_tags in group['tags']:
+                tags.update(statement_tags or [])
 
+            self.statements.update_one({'_id': statement_id}, {'$set': {
+                'occurrences': group['occurrences'],
+                'last_seen_at': group['last_seen_at'],
+                'tags': sorted(tags)
+            }})
+
+            self.statements.delete_many({'_id': {'$in': duplicate_ids}})
+
+            removed_count += len(duplicate_ids)
+
+        # The index can only be created once there are no duplicates
+        if self.deduplicate_statements:
+            self.create_unique_statement_index()
+
+        return removed_count
+
+    @write_method
     def remove(self, statement_text):
         """
         Removes the statement that matches the input text.
         """
         self.statements.delete_one({'text': statement_text})
 
+    @write_method
     def drop(self):
         """
-        Remove the database.
+        Remove the database. The indexes of the statements are created
+        again so that the adapter can still be used.
         """
         self.client.drop_database(self.database.name)
+
+        self.create_indexes()
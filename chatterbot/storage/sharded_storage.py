@@ -0,0 +1,423 @@
+import zlib
+import heapq
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, ExitStack
+from chatterbot.storage import StorageAdapter
+from chatterbot.storage.storage_adapter import write_method
+from chatterbot import utils
+
+
+class ShardedStorageAdapter(StorageAdapter):
+    """
+    The ShardedStorageAdapter spreads statements across several storage
+    adapters, called shards.
+
+    Each statement is saved to one shard, chosen by a hash of its text,
+    its conversation or its first tag. Filters that include the conversation
+    of the statements only query the shard for that conversation when
+    statements are sharded by conversation. Other filters query every shard.
+
+    When every shard can be used from more than one thread, filters that
+    search the search text of the statements read pages from the shards in
+    parallel, except within a unit of work, because those reads would not be
+    made in the session of the unit of work. Otherwise, such as with
+    in-memory SQLite shards, the shards are read one after the other on the
+    thread that called the filter.
+
+    The ids of the statements returned by this adapter include the number
+    of the shard the statement was saved to, so that statements can be
+    updated on the right shard. Unless statements are sharded by text,
+    statements with the same text and in_response_to values can be saved
+    to more than one shard, so each shard deduplicates and compacts its
+    own statements.
+
+    :keyword shards: A list of the import paths of the storage adapters to
+        use as shards, or dictionaries with an ``import_path`` and the
+        parameters for each shard. Each shard also receives the parameters
+        passed to this adapter.
+    :type shards: list
+
+    :keyword shard_key: One of ``'text'``, ``'conversation'`` or ``'tags'``.
+        All of the statements that a trainer creates are in the same
+        conversation, so they are saved to one shard when sharding by conversation.
+        Defaults to ``'text'``
+    :type shard_key: str
+
+    :keyword shard_workers: The number of threads used to query thread safe shards in parallel.
+        Defaults to the number of shards
+    :type shard_workers: int
+    """
+
+    SHARD_KEYS = ('text', 'conversation', 'tags', )
+
+    def __init__(self, **kwargs):
+        # The tagger of the first shard is used, so the parent class
+        # is not initialized to avoid loading another tagger
+        shard_configurations = kwargs.get('shards')
+
+        if not shard_configurations:
+            raise self.ShardConfigurationException(
+                'The ShardedStorageAdapter requires a list of storage adapters as "shards".'
+            )
+
+        self.shard_key = kwargs.get('shard_key', 'text')
+
+        if self.shard_key not in self.SHARD_KEYS:
+            raise self.ShardConfigurationException(
+                'The shard_key must be one of {}.'.format(', '.join(self.SHARD_KEYS))
+            )
+
+        shard_kwargs = {
+            name: value for name, value in kwargs.items() if name not in ('shards', 'storage_adapter', )
+        }
+
+        self.shards = []
+
+        for shard_configuration in shard_configurations:
+            utils.validate_adapter_class(shard_configuration, StorageAdapter)
+
+            if isinstance(shard_configuration, dict):
+                shard = utils.initialize_class(dict(shard_kwargs, **shard_configuration))
+            else:
+                shard = utils.initialize_class(shard_configuration, **shard_kwargs)
+
+            self.shards.append(shard)
+
+        self.shard_workers = kwargs.get('shard_workers', len(self.shards))
+
+        # Shards can only be read in parallel if they can be used from other threads
+        self.is_thread_safe = all(shard.is_thread_safe for shard in self.shards)
+
+        # Shared by every filter that reads from the shards in parallel
+        self.executor = None
+
+        if self.is_thread_safe:
+            self.executor = ThreadPoolExecutor(max_workers=self.shard_workers)
+
+        self._unit_of_work = threading.local()
+
+        self.searches_by_token = all(shard.searches_by_token for shard in self.shards)
+
+        self.logger = self.shards[0].logger
+        self.tagger = self.shards[0].tagger
+        self.deduplicate_statements = self.shards[0].deduplicate_statements
+
+        self.init_write_listeners()
+
+    def get_model(self, model_name):
+        return self.shards[0].get_model(model_name)
+
+    def get_object(self, object_name):
+        return self.shards[0].get_object(object_name)
+
+    def get_shard_index(self, conversation=None, tags=None, text=None):
+        """
+        Return the index of the shard that a statement is saved to.
+        """
+        value = conversation
+
+        if self.shard_key == 'text':
+            value = text
+        elif self.shard_key == 'tags' and tags:
+            value = sorted(tags)[0]
+
+        return zlib.crc32((value or '').encode('utf8')) % len(self.shards)
+
+    def get_statement_shard_index(self, statement):
+        return self.get_shard_index(statement.conversation, statement.get_tags(), statement.text)
+
+    def encode_id(self, statement_id, shard_index):
+        """
+        Return an id that includes the index of the shard a statement is saved to.
+        Ids that are not integers, such as MongoDB ids, are not changed.
+        """
+        if isinstance(statement_id, int):
+            return statement_id * len(self.shards) + shard_index
+
+        return statement_id
+
+    def decode_id(self, statement_id):
+        """
+        Return the id of a statement in its shard and the index of the shard,
+        or None for the index if the id does not include it.
+        """
+        if isinstance(statement_id, int):
+            return divmod(statement_id, len(self.shards))
+
+        return statement_id, None
+
+    def _encode_results(self, results, shard_index):
+        for result in results:
+            if result.id is not None:
+                result.id = self.encode_id(result.id, shard_index)
+
+            yield result
+
+    def count(self):
+        """
+        Return the number of statements in all of the shards.
+        """
+        return sum(shard.count() for shard in self.shards)
+
+    def filter(self, **kwargs):
+        """
+        Returns a list of objects from the database.
+        The kwargs parameter can contain any number
+        of attributes. Only objects which contain all
+        listed attributes and in which all values match
+        for all listed attributes will be returned.
+        """
+        shard_indexes = range(len(self.shards))
+
+        if self.shard_key == 'conversation' and isinstance(kwargs.get('conversation'), str):
+            shard_indexes = [self.get_shard_index(kwargs['conversation'])]
+
+        if kwargs.get('id') is not None:
+            statement_id, shard_index = self.decode_id(kwargs['id'])
+
+            if shard_index is not None:
+                kwargs['id'] = statement_id
+                shard_indexes = [shard_index]
+
+        order_by = kwargs.get('order_by')
+
+        def filter_shard(shard_index):
+            # Each shard can change the values in the parameters
+            shard_kwargs = dict(kwargs)
+
+            if order_by:
+                shard_kwargs['order_by'] = list(order_by)
+
+            if isinstance(kwargs.get('id_greater_than'), int):
+                # The shard's ids that encode to a greater id
+                shard_kwargs['id_greater_than'] = (kwargs['id_greater_than'] - shard_index) // len(self.shards)
+
+            return self._encode_results(
+                self.shards[shard_index].filter(**shard_kwargs), shard_index
+            )
+
+        # Ordered results are merged as they are read from each shard
+        if self._can_read_in_background(kwargs) and len(shard_indexes) > 1 and not order_by:
+            page_size = kwargs.get('page_size', 1000)
+            stop_events = []
+
+            try:
+                results = []
+
+                for shard_index in shard_indexes:
+                    stop_event = threading.Event()
+                    stop_events.append(stop_event)
+
+                    results.append(self._read_pages_in_background(
+                        lambda shard_index=shard_index: filter_shard(shard_index),
+                        page_size,
+                        stop_event
+                    ))
+
+                for shard_results in results:
+                    yield from shard_results
+            finally:
+                for stop_event in stop_events:
+                    stop_event.set()
+
+            return
+
+        results = [filter_shard(shard_index) for shard_index in shard_indexes]
+
+        if order_by:
+            yield from heapq.merge(*results, key=lambda statement: tuple(
+                _get_sort_value(statement, field_name) for field_name in order_by
+            ))
+        else:
+            for shard_results in results:
+                yield from shard_results
+
+    def _can_read_in_background(self, kwargs):
+        """
+        Return True if the shards can be read from the shared pool of threads
+        for a filter with the given parameters.
+        """
+        return bool(
+            kwargs.get('search_text_contains') and
+            self.is_thread_safe and
+            not getattr(self._unit_of_work, 'depth', 0)
+        )
+
+    def _read_pages_in_background(self, get_results, page_size, stop_event):
+        """
+        Read the results of a shard from the shared pool of threads, one page
+        ahead of the page that is being returned. The results of each shard
+        are read by a single thread, and the shard must be thread safe.
+        Setting the stop event ends the read.
+        """
+        pages = queue.Queue(maxsize=1)
+
+        def put(item):
+            while not stop_event.is_set():
+                try:
+                    pages.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+
+            return False
+
+        def read_pages():
+            try:
+                page = []
+
+                for result in get_results():
+                    page.append(result)
+
+                    if len(page) >= page_size:
+                        if not put(page):
+                            return
+
+                        page = []
+
+                if page and not put(page):
+                    return
+
+                put(None)
+            except Exception as exception:
+                put(exception)
+
+        self.executor.submit(read_pages)
+
+        def get_pages():
+            while True:
+                page = pages.get()
+
+                if page is None:
+                    return
+
+                if isinstance(page, Exception):
+                    raise page
+
+                yield from page
+
+        return get_pages()
+
+    @write_method
+    def create(self, **kwargs):
+        """
+        Creates a new statement matching the keyword arguments specified.
+        Returns the created statement.
+        """
+        shard_index = self.get_shard_index(
+            kwargs.get('conversation'), kwargs.get('tags'), kwargs.get('text')
+        )
+
+        statement = self.shards[shard_index].create(**kwargs)
+
+        statement.id = self.encode_id(statement.id, shard_index)
+
+        return statement
+
+    @write_method
+    def create_many(self, statements):
+        """
+        Creates multiple statement entries.
+        """
+        shard_statements = {}
+
+        for statement in statements:
+            shard_statements.setdefault(self.get_statement_shard_index(statement), []).append(statement)
+
+        for shard_index, statements in shard_statements.items():
+            self.shards[shard_index].create_many(statements)
+
+    @write_method
+    def update(self, statement):
+        """
+        Modifies an entry in the database.
+        Creates an entry if one does not exist.
+        """
+        if statement is None:
+            return
+
+        shard_index = None
+        statement_id = statement.id
+
+        if statement.id is not None:
+            statement_id, shard_index = self.decode_id(statement.id)
+
+        if shard_index is None:
+            shard_index = self.get_statement_shard_index(statement)
+
+        statement.id = statement_id
+
+        try:
+            self.shards[shard_index].update(statement)
+        finally:
+            statement.id = self.encode_id(statement_id, shard_index) if statement_id is not None else None
+
+    def get_random(self):
+        """
+        Returns a random statement from the database.
+        Each shard is chosen in proportion to its number of statements.
+        """
+        import random
+
+        counts = [shard.count() for shard in self.shards]
+
+        if not any(counts):
+            raise self.EmptyDatabaseException()
+
+        shard_index = random.choices(range(len(self.shards)), weights=counts)[0]
+
+        statement = self.shards[shard_index].get_random()
+        statement.id = self.encode_id(statement.id, shard_index)
+
+        return statement
+
+    @write_method
+    def remove(self, statement_text):
+        """
+        Removes the statement that matches the input text from every shard.
+        """
+        for shard in self.shards:
+            shard.remove(statement_text)
+
+    @write_method
+    def compact(self):
+        """
+        Compact each shard.
+
+        Returns the number of statements that were removed.
+        """
+        return sum(shard.compact() for shard in self.shards)
+
+    @write_method
+    def drop(self):
+        """
+        Drop the database of each shard.
+        """
+        for shard in self.shards:
+            shard.drop()
+
+    @contextmanager
+    def unit_of_work(self):
+        depth = getattr(self._unit_of_work, 'depth', 0)
+        self._unit_of_work.depth = depth + 1
+
+        try:
+            with ExitStack() as stack:
+                for shard in self.shards:
+                    stack.enter_context(shard.unit_of_work())
+
+                yield
+        finally:
+            self._unit_of_work.depth = depth
+
+    class ShardConfigurationException(Exception):
+        pass
+
+
+def _get_sort_value(statement, field_name):
+    value = getattr(statement, field_name)
+
+    # Statements without a value are sorted first
+    return (value is not None, value if value is not None else '', )
@@ -1,4 +1,6 @@
+from contextlib import contextmanager
 from chatterbot.storage import StorageAdapter
+from chatterbot.storage.storage_adapter import write_method
 
 
 class SQLStorageAdapter(StorageAdapter):
@@ -14,13 +16,48 @@ class SQLStorageAdapter(StorageAdapter):
     :keyword database_uri: eg: sqlite:///database_test.sqlite3',
         The database_uri can be specified to choose database driver.
     :type database_uri: str
+
+    :keyword pool_size: The number of connections to keep open in the
+        connection pool. Only used by databases that support pooling.
+    :type pool_size: int
+
+    :keyword max_overflow: The number of connections that can be opened
+        beyond ``pool_size`` when the pool is exhausted.
+    :type max_overflow: int
+
+    :keyword pool_recycle: The number of seconds after which a pooled
+        connection is replaced.
+    :type pool_recycle: int
+
+    :keyword pool_pre_ping: Test each pooled connection before it is used.
+    :type pool_pre_ping: bool
+
+    :keyword read_database_uris: The connection strings of read replicas of the
+        database. Calls to ``filter``, ``count`` and ``get_random`` are sent to
+        each replica in turn, and all writes are sent to ``database_uri``. Reads
+        made after a write in the same unit of work use ``database_uri`` so that
+        they include the changes.
+    :type read_database_uris: list
+
+    :keyword replica_check_interval: The number of seconds between checks that
+        a read replica can be connected to and has the statement table. Replicas
+        that fail the check are not used until they pass a later check.
+        Defaults to 30
+    :type replica_check_interval: int
     """
 
+    POOL_OPTIONS = (
+        'pool_size',
+        'max_overflow',
+        'pool_recycle',
+        'pool_pre_ping',
+    )
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
-        from sqlalchemy import create_engine
-        from sqlalchemy.orm import sessionmaker
+        import threading
+        from sqlalchemy.orm import sessionmaker, scoped_session
 
         self.database_uri = kwargs.get('database_uri', False)
 
@@ -32,21 +69,80 @@ class SQLStorageAdapter(StorageAdapter):
         if not self.database_uri:
             self.database_uri = 'sqlite:///db.sqlite3'
 
-        self.engine = create_engine(self.database_uri, convert_unicode=True)
+        # Each connection to an in-memory database has its own database
+        self.is_thread_safe = self.database_uri not in ('sqlite://', 'sqlite:///:memory:', )
+
+        pool_options = {
+            option: kwargs[option] for option in self.POOL_OPTIONS if option in kwargs
+        }
+
+        self.engine = self._create_engine(self.database_uri, pool_options)
+
+        from chatterbot.ext.sqlalchemy_app.models import SCHEMA_VERSION
+
+        if not self.engine.dialect.has_table(self.engine, 'Statement'):
+            self.create_database()
+        elif self.get_schema_version() < SCHEMA_VERSION:
+            self.upgrade_database()
+
+        # Whether the database only allows one statement for each pair
+        # of text and in_response_to values
+        self.has_unique_statements = False
+
+        if self.deduplicate_statements:
+            self.has_unique_statements = self.has_unique_statement_index()
+
+            if not self.has_unique_statements:
+                self.logger.warning(
+                    'The database does not have a unique index for deduplicated statements. '
+                    'Call compact() to combine the existing duplicates and create it.'
+                )
+
+        # Each thread reuses its own session
+        self.Session = scoped_session(
+            sessionmaker(bind=self.engine, expire_on_commit=True)
+        )
+
+        self._unit_of_work = threading.local()
+
+        # A cache of tag ids keyed by tag name
+        self.tag_ids = {}
+
+        self.read_database_uris = kwargs.get('read_database_uris') or []
+        self.replica_check_interval = kwargs.get('replica_check_interval', 30)
 
-        if self.database_uri.startswith('sqlite://'):
-            from sqlalchemy.engine import Engine
+        self.read_engines = [
+            self._create_engine(read_database_uri, pool_options)
+            for read_database_uri in self.read_database_uris
+        ]
+
+        self.ReadSessions = [
+            sessionmaker(bind=read_engine, expire_on_commit=True) for read_engine in self.read_engines
+        ]
+
+        self._replica_lock = threading.Lock()
+        self._next_replica = 0
+
+        # The time of the last check of each replica and whether it passed
+        self._replica_checks = [(None, False, ) for read_engine in self.read_engines]
+
+        # The replicas that a thread is checking
+        self._replicas_being_checked = set()
+
+    def _create_engine(self, database_uri, pool_options):
+        from sqlalchemy import create_engine
+
+        engine = create_engine(database_uri, convert_unicode=True, **pool_options)
+
+        if database_uri.startswith('sqlite://'):
             from sqlalchemy import event
 
-            @event.listens_for(Engine, 'connect')
+            @event.listens_for(engine, 'connect')
             def set_sqlite_pragma(dbapi_connection, connection_record):
                 dbapi_connection.execute('PRAGMA journal_mode=WAL')
                 dbapi_connection.execute('PRAGMA synchronous=NORMAL')
 
-        if not self.engine.dialect.has_table(self.engine, 'Statement'):
-            self.create_database()
-
-        self.Session = sessionmaker(bind=self.engine, expire_on_commit=True)
+        return engine
 
     def get_statement_model(self):
         """
@@ -63,9 +159,28 @@ class SQLStorageAdapter(StorageAdapter):
         return Tag
 
     def model_to_object(self, statement):
+        """
+        Convert a statement model into a statement object.
+
+        The columns are read directly from the model rather than going
+        through ``serialize()``, which looks up a formatting method for
+        each field name.
+        """
         from chatterbot.conversation import Statement as StatementObject
 
-        return StatementObject(**statement.serialize())
+        return StatementObject(
+            id=statement.id,
+            text=statement.text,
+            search_text=statement.search_text,
+            conversation=statement.conversation,
+            persona=statement.persona,
+            tags=[tag.name for tag in statement.tags],
+            in_response_to=statement.in_response_to,
+            search_in_response_to=statement.search_in_response_to,
+            created_at=statement.created_at,
+            occurrences=statement.occurrences,
+            last_seen_at=statement.last_seen_at
+        )
 
     def count(self):
         """
@@ -73,11 +188,12 @@ class SQLStorageAdapter(StorageAdapter):
         """
         Statement = self.get_model('statement')
 
-        session = self.Session()
+        session = self.get_read_session()
         statement_count = session.query(Statement).count()
-        session.close()
+        self._session_close(session)
         return statement_count
 
+    @write_method
     def remove(self, statement_text):
         """
         Removes the statement that matches the input text.
@@ -85,12 +201,13 @@ class SQLStorageAdapter(StorageAdapter):
         the input text.
         """
         Statement = self.get_model('statement')
-        session = self.Session()
+        session = self.get_session()
 
         query = session.query(Statement).filter_by(text=statement_text)
         record = query.first()
 
-        session.delete(record)
+        if record is not None:
+            session.delete(record)
 
         self._session_finish(session)
 
@@ -103,11 +220,14 @@ class SQLStorageAdapter(StorageAdapter):
         for all listed attributes will be returned.
         """
         from sqlalchemy import or_
+        from sqlalchemy.orm import selectinload
+        from chatterbot.conversation import StatementRecord
+        from chatterbot.ext.sqlalchemy_app.models import tag_association_table
 
         Statement = self.get_model('statement')
         Tag = self.get_model('tag')
 
-        session = self.Session()
+        session = self.get_read_session()
 
         page_size = kwargs.pop('page_size', 1000)
         order_by = kwargs.pop('order_by', None)
@@ -116,21 +236,50 @@ class SQLStorageAdapter(StorageAdapter):
         exclude_text_words = kwargs.pop('exclude_text_words', [])
         persona_not_startswith = kwargs.pop('persona_not_startswith', None)
         search_text_contains = kwargs.pop('search_text_contains', None)
+        fields = kwargs.pop('fields', None)
+        id_greater_than = kwargs.pop('id_greater_than', None)
 
         # Convert a single sting into a list if only one tag is provided
         if type(tags) == str:
             tags = [tags]
 
+        if fields:
+            fields = [field for field in fields if field != 'tags']
+            statements = session.query(*[
+                getattr(Statement, field) for field in fields
+            ])
+        else:
+            statements = session.query(Statement)
+
         if len(kwargs) == 0:
-            statements = session.query(Statement).filter()
+            statements = statements.filter()
         else:
-            statements = session.query(Statement).filter_by(**kwargs)
+            statements = statements.filter_by(**kwargs)
+
+        if not fields:
+            # Load the tags for each page of results with a single query
+            statements = statements.options(selectinload(Statement.tags))
 
         if tags:
-            statements = statements.join(Statement.tags).filter(
+            # Select the ids of the tagged statements from the tag association
+            # index rather than joining, so that each statement is only returned once
+            tagged_statement_ids = session.query(
+                tag_association_table.c.statement_id
+            ).join(
+                Tag, Tag.id == tag_association_table.c.tag_id
+            ).filter(
                 Tag.name.in_(tags)
             )
 
+            statements = statements.filter(
+                Statement.id.in_(tagged_statement_ids.subquery())
+            )
+
+        if id_greater_than is not None:
+            statements = statements.filter(
+                Statement.id > id_greater_than
+            )
+
         if exclude_text:
             statements = statements.filter(
                 ~Statement.text.in_(exclude_text)
@@ -168,20 +317,32 @@ class SQLStorageAdapter(StorageAdapter):
         total_statements = statements.count()
 
         for start_index in range(0, total_statements, page_size):
-            for statement in statements.slice(start_index, start_index + page_size):
-                yield self.model_to_object(statement)
+            # Convert each page before yielding any of it, so that other
+            # calls using the same session cannot expire the loaded rows
+            if fields:
+                page = [
+                    StatementRecord(**dict(zip(fields, statement)))
+                    for statement in statements.slice(start_index, start_index + page_size)
+                ]
+            else:
+                page = [
+                    self.model_to_object(statement)
+                    for statement in statements.slice(start_index, start_index + page_size)
+                ]
+
+            yield from page
 
-        session.close()
+        self._session_close(session)
 
+    @write_method
     def create(self, **kwargs):
         """
         Creates a new statement matching the keyword arguments specified.
         Returns the created statement.
         """
         Statement = self.get_model('statement')
-        Tag = self.get_model('tag')
 
-        session = self.Session()
+        session = self.get_session()
 
         tags = set(kwargs.pop('tags', []))
 
@@ -193,22 +354,21 @@ class SQLStorageAdapter(StorageAdapter):
             if in_response_to:
                 kwargs['search_in_response_to'] = self.tagger.get_text_index_string(in_response_to)
 
-        statement = Statement(**kwargs)
+        if self.deduplicate_statements:
+            kwargs['tags'] = tags
+            statement_id, = self._upsert_statements(session, [kwargs])
 
-        for tag_name in tags:
-            tag = session.query(Tag).filter_by(name=tag_name).first()
-
-            if not tag:
-                # Create the tag
-                tag = Tag(name=tag_name)
+            statement = session.query(Statement).populate_existing().get(statement_id)
+        else:
+            statement = Statement(**kwargs)
 
-            statement.tags.append(tag)
+            session.add(statement)
 
-        session.add(statement)
+            session.flush()
 
-        session.flush()
+            self._add_statement_tags(session, {statement.id: tags})
 
-        session.refresh(statement)
+            session.refresh(statement)
 
         statement_object = self.model_to_object(statement)
 
@@ -216,17 +376,20 @@ class SQLStorageAdapter(StorageAdapter):
 
         return statement_object
 
+    @write_method
     def create_many(self, statements):
         """
         Creates multiple statement entries.
         """
         Statement = self.get_model('statement')
-        Tag = self.get_model('tag')
 
-        session = self.Session()
+        session = self.get_session()
+
+        if self.deduplicate_statements:
+            statements = self.get_unique_statements(statements)
 
         create_statements = []
-        create_tags = {}
+        create_statement_tags = []
 
         for statement in statements:
 
@@ -241,41 +404,46 @@ class SQLStorageAdapter(StorageAdapter):
             if not statement.search_in_response_to and statement.in_response_to:
                 statement_model_object.search_in_response_to = self.tagger.get_text_index_string(statement.in_response_to)
 
-            new_tags = set(tag_data) - set(create_tags.keys())
+            create_statements.append(statement_model_object)
+            create_statement_tags.append(set(tag_data))
 
-            if new_tags:
-                existing_tags = session.query(Tag).filter(
-                    Tag.name.in_(new_tags)
-                )
+        if self.deduplicate_statements:
+            statement_data = []
 
-                for existing_tag in existing_tags:
-                    create_tags[existing_tag.name] = existing_tag
+            for statement_model_object, tag_names in zip(create_statements, create_statement_tags):
+                data = {
+                    column.name: getattr(statement_model_object, column.name)
+                    for column in Statement.__table__.columns
+                }
+                data['tags'] = tag_names
+                statement_data.append(data)
 
-            for tag_name in tag_data:
-                if tag_name in create_tags:
-                    tag = create_tags[tag_name]
-                else:
-                    # Create the tag if it does not exist
-                    tag = Tag(name=tag_name)
+            self._upsert_statements(session, statement_data)
+            self._session_finish(session)
+            return
 
-                    create_tags[tag_name] = tag
+        session.add_all(create_statements)
 
-                statement_model_object.tags.append(tag)
-            create_statements.append(statement_model_object)
+        # Flush to assign primary keys to the new statements
+        session.flush()
 
-        session.add_all(create_statements)
-        session.commit()
+        self._add_statement_tags(session, {
+            statement_model_object.id: tag_names
+            for statement_model_object, tag_names in zip(create_statements, create_statement_tags)
+        })
 
+        self._session_finish(session)
+
+    @write_method
     def update(self, statement):
         """
         Modifies an entry in the database.
         Creates an entry if one does not exist.
         """
         Statement = self.get_model('statement')
-        Tag = self.get_model('tag')
 
         if statement is not None:
-            session = self.Session()
+            session = self.get_session()
             record = None
 
             if hasattr(statement, 'id') and statement.id is not None:
@@ -304,54 +472,153 @@ class SQLStorageAdapter(StorageAdapter):
             if statement.in_response_to:
                 record.search_in_response_to = self.tagger.get_text_index_string(statement.in_response_to)
 
-            for tag_name in statement.get_tags():
-                tag = session.query(Tag).filter_by(name=tag_name).first()
+            session.add(record)
 
-                if not tag:
-                    # Create the record
-                    tag = Tag(name=tag_name)
+            session.flush()
 
-                record.tags.append(tag)
+            existing_tag_names = set(tag.name for tag in record.tags)
 
-            session.add(record)
+            self._add_statement_tags(session, {
+                record.id: set(statement.get_tags()) - existing_tag_names
+            })
 
             self._session_finish(session)
 
     def get_random(self):
         """
         Returns a random statement from the database.
+
+        A random value is picked from the range of primary keys and the
+        first statement with an id greater than or equal to it is returned.
+        Both lookups use the primary key index, so the cost of this method
+        does not grow with the number of rows in the table.
+
+        The selection is not uniform when there are gaps in the ids, such
+        as after statements are removed: a statement is returned with a
+        probability proportional to the size of the gap before its id plus
+        one. Statements that follow a gap are favoured, which is accepted
+        in exchange for not running an ``OFFSET`` scan of the table.
         """
         import random
+        from sqlalchemy import func
 
         Statement = self.get_model('statement')
 
-        session = self.Session()
-        count = self.count()
-        if count < 1:
+        session = self.get_read_session()
+
+        min_id, max_id = session.query(
+            func.min(Statement.id), func.max(Statement.id)
+        ).one()
+
+        if max_id is None:
+            self._session_close(session)
             raise self.EmptyDatabaseException()
 
-        random_index = random.randrange(0, count)
-        random_statement = session.query(Statement)[random_index]
+        random_id = random.randint(min_id, max_id)
+
+        random_statement = session.query(Statement).filter(
+            Statement.id >= random_id
+        ).order_by(Statement.id).first()
 
         statement = self.model_to_object(random_statement)
 
-        session.close()
+        self._session_close(session)
         return statement
 
+    @write_method
+    def compact(self):
+        """
+        Combine statements that have the same ``text`` and ``in_response_to``
+        values into the statement with the lowest id.
+
+        Returns the number of statements that were removed.
+        """
+        from sqlalchemy import func
+        from chatterbot.ext.sqlalchemy_app.models import tag_association_table
+
+        Statement = self.get_model('statement')
+
+        session = self.get_session()
+
+        duplicate_groups = session.query(
+            Statement.text, Statement.in_response_to
+        ).group_by(
+            Statement.text, Statement.in_response_to
+        ).having(
+            func.count(Statement.id) > 1
+        ).all()
+
+        removed_count = 0
+
+        for text, in_response_to in duplicate_groups:
+            records = session.query(
+                Statement.id, Statement.occurrences, Statement.created_at, Statement.last_seen_at
+            ).filter(
+                Statement.text == text,
+                Statement.in_response_to == in_response_to
+            ).order_by(Statement.id).all()
+
+            statement_id = records[0].id
+            duplicate_ids = [record.id for record in records[1:]]
+
+            # Move the tags of the duplicate statements to the statement that is kept
+            tag_ids = set(
+                tag_id for tag_id, in session.query(tag_association_table.c.tag_id).filter(
+                    tag_association_table.c.statement_id.in_([statement_id] + duplicate_ids)
+                )
+            )
+
+            session.execute(tag_association_table.delete().where(
+                tag_association_table.c.statement_id.in_([statement_id] + duplicate_ids)
+            ))
+
+            if tag_ids:
+                session.execute(tag_association_table.insert(), [
+                    {'statement_id': statement_id, 'tag_id': tag_id} for tag_id in tag_ids
+                ])
+
+            session.query(Statement).filter(
+                Statement.id.in_(duplicate_ids)
+            ).delete(synchronize_session=False)
+
+            session.query(Statement).filter(
+                Statement.id == statement_id
+            ).update({
+                'occurrences': sum(record.occurrences for record in records),
+                'last_seen_at': max(
+                    record.last_seen_at or record.created_at for record in records
+                )
+            }, synchronize_session=False)
+
+            removed_count += len(duplicate_ids)
+
+        self._session_finish(session)
+
+        # The index can only be created once the changes are committed
+        if self.deduplicate_statements and not self.has_unique_statements and not self._in_unit_of_work():
+            self.create_unique_statement_index()
+
+        return removed_count
+
+    @write_method
     def drop(self):
         """
         Drop the database.
         """
+        from chatterbot.ext.sqlalchemy_app.models import tag_association_table
+
         Statement = self.get_model('statement')
         Tag = self.get_model('tag')
 
-        session = self.Session()
+        session = self.get_session()
 
+        session.execute(tag_association_table.delete())
         session.query(Statement).delete()
         session.query(Tag).delete()
 
-        session.commit()
-        session.close()
+        self._session_finish(session)
+
+        self.tag_ids.clear()
 
     def create_database(self):
         """
@@ -360,12 +627,571 @@ class SQLStorageAdapter(StorageAdapter):
         from chatterbot.ext.sqlalchemy_app.models import Base
         Base.metadata.create_all(self.engine)
 
+        self.set_schema_version()
+
+        if self.deduplicate_statements:
+            self.create_unique_statement_index()
+
+    def get_schema_version(self):
+        """
+        Return the version of the tables in the database, or 0 if the
+        tables were created before the version was saved.
+        """
+        from sqlalchemy import select, func
+        from chatterbot.ext.sqlalchemy_app.models import schema_version_table
+
+        if not self.engine.dialect.has_table(self.engine, schema_version_table.name):
+            return 0
+
+        with self.engine.connect() as connection:
+            version = connection.execute(
+                select([func.max(schema_version_table.c.version)])
+            ).scalar()
+
+        return version or 0
+
+    def set_schema_version(self):
+        """
+        Save the version of the tables that this version of ChatterBot creates.
+        """
+        from chatterbot.ext.sqlalchemy_app.models import schema_version_table, SCHEMA_VERSION
+
+        schema_version_table.create(bind=self.engine, checkfirst=True)
+
+        with self.engine.begin() as connection:
+            connection.execute(schema_version_table.delete())
+            connection.execute(schema_version_table.insert(), {'version': SCHEMA_VERSION})
+
+    def has_unique_statement_index(self):
+        """
+        Return True if the database has a unique index on the text and
+        in_response_to values of the statements.
+        """
+        from sqlalchemy import inspect, text
+        from chatterbot.ext.sqlalchemy_app.models import UNIQUE_STATEMENT_INDEX_NAME
+
+        Statement = self.get_model('statement')
+
+        # Indexes on expressions are not returned by the inspector for these databases
+        index_queries = {
+            'sqlite': "SELECT name FROM sqlite_master WHERE type = 'index' AND name = :name",
+            'postgresql': 'SELECT indexname FROM pg_indexes WHERE indexname = :name',
+            'mysql': (
+                'SELECT index_name FROM information_schema.statistics '
+                'WHERE table_schema = DATABASE() AND index_name = :name'
+            ),
+        }
+
+        index_query = index_queries.get(self.engine.dialect.name)
+
+        if index_query is None:
+            return UNIQUE_STATEMENT_INDEX_NAME in set(
+                index['name'] for index in inspect(self.engine).get_indexes(Statement.__table__.name)
+            )
+
+        with self.engine.connect() as connection:
+            return connection.execute(
+                text(index_query), name=UNIQUE_STATEMENT_INDEX_NAME
+            ).first() is not None
+
+    def create_unique_statement_index(self):
+        """
+        Create a unique index on the text and in_response_to values of the
+        statements, so that deduplicated statements can be inserted or
+        counted in a single statement. The database must not have any
+        duplicate statements, which ``compact`` combines.
+        """
+        from chatterbot.ext.sqlalchemy_app.models import UNIQUE_STATEMENT_INDEX_NAME
+
+        Statement = self.get_model('statement')
+        statement_table = Statement.__table__
+
+        quote = self.engine.dialect.identifier_preparer.quote
+
+        # Statements that are not in response to anything have a null
+        # in_response_to value, which would not be unique in the index
+        with self.engine.begin() as connection:
+            connection.execute(
+                "CREATE UNIQUE INDEX {} ON {} ({}, (COALESCE({}, '')))".format(
+                    quote(UNIQUE_STATEMENT_INDEX_NAME),
+                    quote(statement_table.name),
+                    quote(statement_table.c.text.name),
+                    quote(statement_table.c.in_response_to.name)
+                )
+            )
+
+        self.has_unique_statements = True
+
+    def upgrade_database(self):
+        """
+        Add any columns and indexes that are missing from the statement
+        and tag association tables that were created by an earlier version
+        of ChatterBot. This is called when the storage adapter is created
+        if the saved version of the tables is older than ``SCHEMA_VERSION``.
+        """
+        from sqlalchemy import inspect
+        from chatterbot.ext.sqlalchemy_app.models import tag_association_table
+
+        Statement = self.get_model('statement')
+        statement_table = Statement.__table__
+
+        inspector = inspect(self.engine)
+
+        column_names = set(
+            column['name'] for column in inspector.get_columns(statement_table.name)
+        )
+
+        for column in statement_table.columns:
+            if column.name not in column_names:
+                column_definition = '{} {}'.format(
+                    column.name, column.type.compile(dialect=self.engine.dialect)
+                )
+
+                if column.server_default is not None:
+                    column_definition += " DEFAULT '{}'".format(column.server_default.arg)
+
+                if not column.nullable:
+                    column_definition += ' NOT NULL'
+
+                with self.engine.begin() as connection:
+                    connection.execute('ALTER TABLE {} ADD COLUMN {}'.format(
+                        statement_table.name, column_definition
+                    ))
+
+        for table in (statement_table, tag_association_table, ):
+            index_names = set(
+                index['name'] for index in inspector.get_indexes(table.name)
+            )
+
+            for index in table.indexes:
+                if index.name not in index_names:
+                    index.create(bind=self.engine)
+
+        self.set_schema_version()
+
+    def get_tag_ids(self, session, tag_names):
+        """
+        Return a dictionary of tag ids keyed by tag name.
+        Tags that do not exist yet are created.
+        """
+        Tag = self.get_model('tag')
+
+        missing_tag_names = set(tag_names) - set(self.tag_ids.keys())
+
+        if missing_tag_names:
+            self._insert_tags(session, missing_tag_names)
+
+            tags = session.query(Tag.id, Tag.name).filter(
+                Tag.name.in_(missing_tag_names)
+            )
+
+            for tag_id, tag_name in tags:
+                self.tag_ids[tag_name] = tag_id
+
+        return {
+            tag_name: self.tag_ids[tag_name] for tag_name in tag_names
+        }
+
+    def _insert_tags(self, session, tag_names):
+        """
+        Insert tags using a single statement that
+        skips any tags which already exist.
+        """
+        Tag = self.get_model('tag')
+        tag_table = Tag.__table__
+
+        dialect_name = self.engine.dialect.name
+
+        if dialect_name == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+            insert_statement = insert(tag_table).on_conflict_do_nothing(
+                index_elements=['name']
+            )
+        elif dialect_name == 'sqlite':
+            insert_statement = tag_table.insert().prefix_with('OR IGNORE')
+        elif dialect_name == 'mysql':
+            insert_statement = tag_table.insert().prefix_with('IGNORE')
+        else:
+            existing_tag_names = set(
+                tag_name for tag_name, in session.query(Tag.name).filter(
+                    Tag.name.in_(tag_names)
+                )
+            )
+            tag_names = set(tag_names) - existing_tag_names
+            insert_statement = tag_table.insert()
+
+        if tag_names:
+            session.execute(insert_statement, [
+                {'name': tag_name} for tag_name in tag_names
+            ])
+
+    def _get_statement_ids(self, session, keys):
+        """
+        Return a dictionary of the ids of existing statements keyed by
+        their text and in_response_to values. The lowest id is used when
+        more than one statement has the same values.
+        """
+        Statement = self.get_model('statement')
+
+        texts = list(set(text for text, in_response_to in keys))
+        statement_ids = {}
+
+        # Query in chunks to stay below the database's limit on parameters
+        for start_index in range(0, len(texts), 500):
+            records = session.query(
+                Statement.id, Statement.text, Statement.in_response_to
+            ).filter(
+                Statement.text.in_(texts[start_index:start_index + 500])
+            ).order_by(Statement.id)
+
+            for statement_id, text, in_response_to in records:
+                statement_ids.setdefault((text, in_response_to, ), statement_id)
+
+        return statement_ids
+
+    def _upsert_statements(self, session, statements):
+        """
+        Add the occurrences of each statement to the existing statement with
+        the same text and in_response_to values, or insert the statement if
+        one does not exist.
+
+        When the database has a unique index for the statements, the missing
+        statements are inserted with a statement that skips the ones that
+        already exist, and the occurrences of every statement are then added
+        with a single update, so that concurrent writes cannot create
+        duplicate statements or lose occurrences.
+
+        :param statements: A list of dictionaries of statement data. Each
+            dictionary must have a unique pair of text and in_response_to values.
+
+        :returns: A list of the id of each statement.
+        """
+        from datetime import datetime
+        from pytz import UTC
+        from sqlalchemy import bindparam, func
+        from chatterbot.ext.sqlalchemy_app.models import tag_association_table
+
+        Statement = self.get_model('statement')
+        Tag = self.get_model('tag')
+        statement_table = Statement.__table__
+
+        keys = [
+            (data['text'], data.get('in_response_to'), ) for data in statements
+        ]
+
+        statement_data = []
+        statement_tag_names = []
+
+        for data in statements:
+            data = dict(data)
+            data.pop('id', None)
+            statement_tag_names.append(set(data.pop('tags', [])))
+            statement_data.append(data)
+
+        insert_statement = None
+
+        if self.has_unique_statements:
+            insert_statement = self._get_insert_or_ignore_statement(statement_table)
+
+        new_statements = []
+
+        if insert_statement is not None:
+            session.execute(insert_statement, [
+                self._get_insert_values(statement_table, data) for data in statement_data
+            ])
+
+            existing_ids = self._get_statement_ids(session, keys)
+
+            # Every statement exists now, and was inserted without any occurrences
+            update_keys = keys
+        else:
+            existing_ids = self._get_statement_ids(session, keys)
+
+            update_keys = [key for key in keys if key in existing_ids]
+
+            new_statements = [
+                (key, Statement(**data), tag_names, )
+                for key, data, tag_names in zip(keys, statement_data, statement_tag_names)
+                if key not in existing_ids
+            ]
+
+        updates = [
+            {
+                '_id': existing_ids[key],
+                '_occurrences': data.get('occurrences') or 1,
+                '_last_seen_at': data.get('last_seen_at') or data.get('created_at') or datetime.now(UTC)
+            }
+            for key, data in zip(keys, statement_data) if key in update_keys
+        ]
+
+        if updates:
+            greatest = func.max if self.engine.dialect.name == 'sqlite' else func.greatest
+
+            session.execute(
+                statement_table.update().where(
+                    statement_table.c.id == bindparam('_id')
+                ).values(
+                    occurrences=statement_table.c.occurrences + bindparam('_occurrences'),
+                    last_seen_at=greatest(
+                        func.coalesce(statement_table.c.last_seen_at, statement_table.c.created_at),
+                        bindparam('_last_seen_at', type_=statement_table.c.last_seen_at.type)
+                    )
+                ),
+                updates
+            )
+
+        statement_tags = {}
+
+        for key, tag_names in zip(keys, statement_tag_names):
+            if key in existing_ids:
+                statement_tags[existing_ids[key]] = set(tag_names)
+
+        # Only add the tags that the existing statements do not already have
+        tagged_ids = [
+            statement_id for statement_id, tag_names in statement_tags.items() if tag_names
+        ]
+
+        if tagged_ids:
+            existing_tags = session.query(
+                tag_association_table.c.statement_id, Tag.name
+            ).join(
+                Tag, Tag.id == tag_association_table.c.tag_id
+            ).filter(
+                tag_association_table.c.statement_id.in_(tagged_ids)
+            )
+
+            for statement_id, tag_name in existing_tags:
+                statement_tags[statement_id].discard(tag_name)
+
+        if new_statements:
+            session.add_all([
+                statement_model_object for key, statement_model_object, tag_names in new_statements
+            ])
+
+            session.flush()
+
+            for key, statement_model_object, tag_names in new_statements:
+                existing_ids[key] = statement_model_object.id
+                statement_tags[statement_model_object.id] = tag_names
+
+        self._add_statement_tags(session, statement_tags)
+
+        return [existing_ids[key] for key in keys]
+
+    def _get_insert_or_ignore_statement(self, statement_table):
+        """
+        Return an insert statement that skips the statements that would
+        duplicate an existing statement, or None if the database does
+        not support one.
+        """
+        dialect_name = self.engine.dialect.name
+
+        if dialect_name == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+            return insert(statement_table).on_conflict_do_nothing()
+        elif dialect_name == 'sqlite':
+            return statement_table.insert().prefix_with('OR IGNORE')
+        elif dialect_name == 'mysql':
+            return statement_table.insert().prefix_with('IGNORE')
+
+        return None
+
+    def _get_insert_values(self, statement_table, data):
+        """
+        Return the values of every column of a statement that is inserted
+        without any occurrences, so that each row has the same columns.
+        """
+        from datetime import datetime
+        from pytz import UTC
+
+        values = {}
+
+        for column in statement_table.columns:
+            if column.name == 'id':
+                continue
+
+            value = data.get(column.name)
+
+            if value is None and not column.nullable:
+                value = column.server_default.arg
+
+            values[column.name] = value
+
+        values['occurrences'] = 0
+        values['created_at'] = values['created_at'] or datetime.now(UTC)
+
+        return values
+
+    def _add_statement_tags(self, session, statement_tags):
+        """
+        Associate tags with statements.
+
+        :param statement_tags: A dictionary of tag names keyed by statement id.
+        """
+        from chatterbot.ext.sqlalchemy_app.models import tag_association_table
+
+        all_tag_names = set()
+
+        for tag_names in statement_tags.values():
+            all_tag_names.update(tag_names)
+
+        if not all_tag_names:
+            return
+
+        tag_ids = self.get_tag_ids(session, all_tag_names)
+
+        session.execute(tag_association_table.insert(), [
+            {'statement_id': statement_id, 'tag_id': tag_ids[tag_name]}
+            for statement_id, tag_names in statement_tags.items()
+            for tag_name in tag_names
+        ])
+
+    @contextmanager
+    def unit_of_work(self):
+        """
+        Run every storage call made within this context using the same
+        session and database connection. Changes are committed once when
+        the outermost context exits, or rolled back if an error is raised.
+        """
+        depth = getattr(self._unit_of_work, 'depth', 0)
+        self._unit_of_work.depth = depth + 1
+
+        try:
+            yield
+            if depth == 0:
+                self.Session().commit()
+        except Exception:
+            if depth == 0:
+                self.Session().rollback()
+
+                # Tags created during the unit of work no longer exist
+                self.tag_ids.clear()
+            raise
+        finally:
+            self._unit_of_work.depth = depth
+            if depth == 0:
+                self._unit_of_work.has_writes = False
+                self.Session.remove()
+
+    def get_session(self):
+        """
+        Return the session for the current thread.
+        """
+        session = self.Session()
+
+        if not session.is_active and not self._in_unit_of_work():
+            # A previous call failed part way through its transaction
+            session.rollback()
+            self.tag_ids.clear()
+
+        return session
+
+    def get_read_session(self):
+        """
+        Return a session for a read replica, or the session for the current
+        thread if there are no healthy replicas or if the current unit of
+        work has written to the database.
+        """
+        if not self.read_engines or getattr(self._unit_of_work, 'has_writes', False):
+            return self.get_session()
+
+        replica_index = self._get_replica_index()
+
+        if replica_index is None:
+            return self.get_session()
+
+        session = self.ReadSessions[replica_index]()
+        session.info['read_replica'] = replica_index
+
+        return session
+
+    def _get_replica_index(self):
+        """
+        Return the index of the next healthy replica, or None.
+
+        A replica is checked again if its last check is older than the
+        check interval. The check connects to the replica, so it is run
+        without holding the lock, and only by one thread at a time for each
+        replica. Other threads use the result of the last check meanwhile.
+        """
+        from time import monotonic
+
+        for _ in range(len(self.read_engines)):
+            with self._replica_lock:
+                replica_index = self._next_replica
+                self._next_replica = (replica_index + 1) % len(self.read_engines)
+
+                checked_at, healthy = self._replica_checks[replica_index]
+
+                check = (
+                    checked_at is None or monotonic() - checked_at >= self.replica_check_interval
+                ) and replica_index not in self._replicas_being_checked
+
+                if check:
+                    self._replicas_being_checked.add(replica_index)
+
+            if check:
+                healthy = False
+
+                try:
+                    healthy = self.check_replica(replica_index)
+                finally:
+                    with self._replica_lock:
+                        self._replica_checks[replica_index] = (monotonic(), healthy, )
+                        self._replicas_being_checked.discard(replica_index)
+
+            if healthy:
+                return replica_index
+
+        return None
+
+    def check_replica(self, replica_index):
+        """
+        Return True if a read replica can be connected to and has the statement table.
+        """
+        from sqlalchemy.exc import SQLAlchemyError
+
+        Statement = self.get_model('statement')
+        read_engine = self.read_engines[replica_index]
+
+        try:
+            with read_engine.connect() as connection:
+                return read_engine.dialect.has_table(connection, Statement.__table__.name)
+        except SQLAlchemyError:
+            self.logger.warning(
+                'Read replica {} could not be connected to'.format(self.read_database_uris[replica_index])
+            )
+            return False
+
+    def _in_unit_of_work(self):
+        return getattr(self._unit_of_work, 'depth', 0) > 0
+
+    def _session_close(self, session):
+        """
+        Release the session unless it belongs to an active unit of work.
+        """
+        if 'read_replica' in session.info or not self._in_unit_of_work():
+            session.close()
+
     def _session_finish(self, session, statement_text=None):
         from sqlalchemy.exc import InvalidRequestError
+
+        if self._in_unit_of_work():
+            # Changes are committed when the unit of work ends
+            session.flush()
+
+            # Later reads in the unit of work must include the changes
+            self._unit_of_work.has_writes = True
+            return
+
         try:
             session.commit()
         except InvalidRequestError:
             # Log the statement text and the exception
             self.logger.exception(statement_text)
+            self.tag_ids.clear()
+        except Exception:
+            self.tag_ids.clear()
+            raise
         finally:
             session.close()
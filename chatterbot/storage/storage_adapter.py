@@ -1,4 +1,8 @@
 import logging
+import threading
+from time import perf_counter
+from functools import wraps
+from contextlib import contextmanager
 from chatterbot import languages
 from chatterbot.tagging import PosLemmaTagger
 
@@ -9,20 +13,67 @@ class StorageAdapter(object):
     that all storage adapters should implement.
     """
 
+    # Whether the methods of the adapter can be called from more than one
+    # thread, such as from a pool of threads that reads or writes statements
+    # in the background. Adapters that keep a connection for each thread,
+    # or that cannot see the data of another thread, should leave this False.
+    is_thread_safe = False
+
+    # Whether search_text_contains only matches statements that have a whole
+    # token of the search text, rather than any part of the search text
+    searches_by_token = False
+
     def __init__(self, *args, **kwargs):
         """
         Initialize common attributes shared by all storage adapters.
 
         :param str tagger_language: The language that the tagger uses to remove stopwords.
+
+        :param bool deduplicate_statements: Store one statement for each unique pair of
+            ``text`` and ``in_response_to`` values. Creating a statement that already
+            exists adds to the ``occurrences`` count of the existing statement and updates
+            its ``last_seen_at`` time instead of adding a new row. The conversation and
+            persona of the first occurrence are kept.
+            Defaults to False
         """
         self.logger = kwargs.get('logger', logging.getLogger(__name__))
 
+        self.deduplicate_statements = kwargs.get('deduplicate_statements', False)
+
         Tagger = kwargs.get('tagger', PosLemmaTagger)
 
         self.tagger = Tagger(language=kwargs.get(
             'tagger_language', languages.ENG
         ))
 
+        self.init_write_listeners()
+
+    def init_write_listeners(self):
+        """
+        Initialize the list of write listeners. Adapters that do not call
+        ``StorageAdapter.__init__`` should call this method instead.
+        """
+        self.write_listeners = []
+
+        # The number of write methods that each thread is in
+        self._write_depth = threading.local()
+
+    def add_write_listener(self, callback):
+        """
+        Call a function after each call to a method of this adapter that
+        writes statements: ``create``, ``create_many``, ``update``, ``remove``,
+        ``compact`` and ``drop``. The function is called with the name of
+        the method, a list of the statements that were created, and the
+        number of seconds the method took. The statements are None for
+        methods other than ``create`` and ``create_many``, and for a write
+        that raised an exception.
+        """
+        self.write_listeners.append(callback)
+
+    def notify_write_listeners(self, method_name, statements, duration):
+        for callback in list(self.write_listeners):
+            callback(method_name, statements, duration)
+
     def get_model(self, model_name):
         """
         Return the model class for a given model name.
@@ -116,6 +167,16 @@ class StorageAdapter(object):
             this parameter, then the statement will be included in the
             result set.
             Defaults to None
+
+        :param fields: A list of statement field names. When specified, only
+            these fields are loaded and the results are returned as
+            ``StatementRecord`` objects instead of full statements. Tags are
+            not loaded for these results.
+            Defaults to None
+
+        :param id_greater_than: Only return statements with an id greater
+            than this value.
+            Defaults to None
         """
         raise self.AdapterMethodNotImplementedError(
             'The `filter` method is not implemented by this adapter.'
@@ -155,6 +216,47 @@ class StorageAdapter(object):
             'The `get_random` method is not implemented by this adapter.'
         )
 
+    def compact(self):
+        """
+        Combine statements that have the same ``text`` and ``in_response_to``
+        values into a single statement. The remaining statement keeps the
+        total number of occurrences, the most recent ``last_seen_at`` time
+        and all of the tags of the statements that were combined.
+
+        Returns the number of statements that were removed.
+        """
+        raise self.AdapterMethodNotImplementedError(
+            'The `compact` method is not implemented by this adapter.'
+        )
+
+    def get_unique_statements(self, statements):
+        """
+        Return a list with one statement for each pair of ``text`` and
+        ``in_response_to`` values. The occurrences and tags of statements
+        with the same values are added to the first of those statements.
+        """
+        unique_statements = {}
+
+        for statement in statements:
+            key = (statement.text, statement.in_response_to, )
+            unique_statement = unique_statements.get(key)
+
+            if unique_statement is None:
+                unique_statements[key] = statement
+            else:
+                unique_statement.occurrences += statement.occurrences
+                unique_statement.last_seen_at = max(
+                    unique_statement.get_last_seen_at(),
+                    statement.get_last_seen_at()
+                )
+
+                existing_tags = set(unique_statement.get_tags())
+                unique_statement.add_tags(*[
+                    tag for tag in statement.get_tags() if tag not in existing_tags
+                ])
+
+        return list(unique_statements.values())
+
     def drop(self):
         """
         Drop the database attached to a given adapter.
@@ -163,6 +265,16 @@ class StorageAdapter(object):
             'The `drop` method is not implemented by this adapter.'
         )
 
+    @contextmanager
+    def unit_of_work(self):
+        """
+        A context manager that groups the storage calls made within it,
+        such as all of the calls made to generate a single response.
+        Adapters that can share a connection or transaction across calls
+        should override this method. By default it does nothing.
+        """
+        yield
+
     class EmptyDatabaseException(Exception):
 
         def __init__(self, message=None):
@@ -175,3 +287,48 @@ class StorageAdapter(object):
         Typically this indicates that the method should be implement in a subclass.
         """
         pass
+
+
+def write_method(method):
+    """
+    Decorate a method of a storage adapter that writes statements, so that
+    the adapter's write listeners are called after each call to it. Writes
+    made by other write methods of the same adapter are only reported once.
+    """
+    method_name = method.__name__
+
+    @wraps(method)
+    def notifying_method(self, *args, **kwargs):
+        depth = getattr(self._write_depth, 'depth', 0)
+
+        if depth or not self.write_listeners:
+            return method(self, *args, **kwargs)
+
+        statements = None
+
+        if method_name == 'create_many' and args:
+            # Read the statements once so that they can be reported after they are saved
+            statements = list(args[0])
+            args = (statements, ) + args[1:]
+
+        self._write_depth.depth = depth + 1
+        start_time = perf_counter()
+        result = None
+
+        try:
+            result = method(self, *args, **kwargs)
+        except Exception:
+            statements = None
+            raise
+        finally:
+            duration = perf_counter() - start_time
+            self._write_depth.depth = depth
+
+            if method_name == 'create':
+                statements = [result] if result is not None else None
+
+            self.notify_write_listeners(method_name, statements, duration)
+
+        return result
+
+    return notifying_method
@@ -0,0 +1,158 @@
+"""
+A classifier that predicts the tags of the statements that are likely
+to match an input, so that searches can start with those tags.
+"""
+import math
+import threading
+
+
+class TagClassifier(object):
+    """
+    A naive Bayes classifier over the tokens in the search text of statements.
+    Each tag of a statement is a category, and statements without tags are
+    counted as a category of their own. No tags are predicted when that
+    category is one of the most likely ones, so that inputs which are not
+    about a tagged topic search all statements.
+
+    The classifier is trained from the chat bot's storage adapter the
+    first time it is used, unless ``train`` has already been called with
+    the chat bot's statements, for example when the application starts.
+    Statements that the chat bot learns are added to it, and ``reset`` can
+    be called after training the chat bot so that the classifier is trained again.
+
+    :param max_tags: The largest number of tags to predict for an input.
+    :param min_probability: The smallest probability a tag must have to be predicted.
+    """
+
+    def __init__(self, max_tags=2, min_probability=0.2, **kwargs):
+        self.max_tags = max_tags
+        self.min_probability = min_probability
+
+        self.lock = threading.Lock()
+
+        # Held while training so that only one thread reads the statements
+        self.training_lock = threading.Lock()
+
+        self.reset()
+
+    def reset(self):
+        """
+        Remove everything the classifier has learned.
+        """
+        with self.lock:
+            self.trained = False
+
+            # The number of statements in each category
+            self.category_counts = {}
+
+            # The number of times each token occurs in each category
+            self.token_counts = {}
+
+            # The total number of tokens in each category
+            self.category_token_counts = {}
+
+    def get_tokens(self, search_text):
+        return [token for token in (search_text or '').split(' ') if token]
+
+    def train(self, statements):
+        """
+        Learn the categories of all of the statements in a storage adapter.
+        """
+        self.reset()
+
+        for statement in statements:
+            self.learn(statement)
+
+        self.trained = True
+
+    def ensure_trained(self, get_statements):
+        """
+        Train the classifier with the statements returned by ``get_statements``
+        if it has not been trained yet. Threads that call this while another
+        thread is training wait for that training to finish.
+        """
+        if self.trained:
+            return
+
+        with self.training_lock:
+            if not self.trained:
+                self.train(get_statements())
+
+    def learn(self, statement):
+        """
+        Add the tokens of a statement to each of its categories.
+        """
+        categories = statement.get_tags() or [None]
+        tokens = self.get_tokens(statement.search_text)
+
+        with self.lock:
+            for category in categories:
+                self.category_counts[category] = self.category_counts.get(category, 0) + 1
+                self.category_token_counts[category] = self.category_token_counts.get(category, 0) + len(tokens)
+
+                for token in tokens:
+                    category_counts = self.token_counts.setdefault(token, {})
+                    category_counts[category] = category_counts.get(category, 0) + 1
+
+    def classify(self, search_text):
+        """
+        Return a list of categories and their probability for an input,
+        ordered from the most to the least likely. Only the categories
+        that share at least one token with the input are scored.
+        """
+        tokens = [
+            token for token in self.get_tokens(search_text) if token in self.token_counts
+        ]
+
+        with self.lock:
+            categories = set()
+
+            for token in tokens:
+                categories.update(self.token_counts[token].keys())
+
+            if not categories:
+                return []
+
+            statement_count = sum(self.category_counts.values())
+            vocabulary_size = len(self.token_counts)
+
+            scores = {}
+
+            for category in categories:
+                score = math.log(self.category_counts[category] / statement_count)
+                denominator = self.category_token_counts[category] + vocabulary_size
+
+                for token in tokens:
+                    # Add one to each count so that unseen tokens do not rule out a category
+                    score += math.log(
+                        (self.token_counts[token].get(category, 0) + 1) / denominator
+                    )
+
+                scores[category] = score
+
+        highest_score = max(scores.values())
+        total = sum(math.exp(score - highest_score) for score in scores.values())
+
+        probabilities = [
+            (category, math.exp(score - highest_score) / total, ) for category, score in scores.items()
+        ]
+
+        return sorted(probabilities, key=lambda probability: probability[1], reverse=True)
+
+    def get_tags(self, search_text):
+        """
+        Return the tags that an input most likely belongs to, or an empty
+        list if the input should not be limited to any tags.
+        """
+        tags = []
+
+        for category, probability in self.classify(search_text)[:self.max_tags]:
+            if probability < self.min_probability:
+                break
+
+            if category is None:
+                return []
+
+            tags.append(category)
+
+        return tags
@@ -16,6 +16,15 @@ class Trainer(object):
            trainer. The environment variable ``CHATTERBOT_SHOW_TRAINING_PROGRESS``
            can also be set to control this. ``show_training_progress`` will override
            the environment variable if it is set.
+
+    :param boolean skip_existing_statements: Do not create statements that have the
+           same conversation, text and ``in_response_to`` value as a statement that
+           is already in the database, so that training with the same data again
+           does not add duplicate statements. Statements that are repeated in the
+           data being trained are still all created. Defaults to ``False``.
+           The fingerprints of the existing statements are read from the database
+           once and kept by the trainer. Call ``reset_existing_fingerprints`` if
+           training statements are removed from the database by other means than ``drop``.
     """
 
     def __init__(self, chatbot, **kwargs):
@@ -27,14 +36,122 @@ class Trainer(object):
             environment_default
         )
 
+        self.skip_existing_statements = kwargs.get('skip_existing_statements', False)
+
+        # The fingerprints of the statements in the database, by conversation
+        self.existing_fingerprints = {}
+
     def get_preprocessed_statement(self, input_statement):
         """
         Preprocess the input statement.
         """
-        for preprocessor in self.chatbot.preprocessors:
-            input_statement = preprocessor(input_statement)
+        return self.chatbot.preprocessor_pipeline(input_statement)
+
+    def get_preprocessed_statements(self, input_statements):
+        """
+        Preprocess a list of input statements.
+        """
+        return self.chatbot.preprocessor_pipeline.process_many(input_statements)
+
+    def get_statement_fingerprint(self, statement):
+        """
+        Return a value that identifies statements that are the same
+        response to the same input in the same conversation.
+        """
+        return (statement.conversation, statement.text, statement.in_response_to, )
+
+    def get_existing_fingerprints(self, conversation='training'):
+        """
+        Return a set of the fingerprints of the statements that are already
+        in the database for a conversation. The set is only read from the
+        database the first time, or again if the database has been emptied.
+        """
+        if not self.skip_existing_statements:
+            return set()
+
+        if conversation in self.existing_fingerprints and not self.chatbot.storage.count():
+            self.reset_existing_fingerprints()
+
+        if conversation not in self.existing_fingerprints:
+            self.existing_fingerprints[conversation] = set(
+                self.get_statement_fingerprint(statement)
+                for statement in self.chatbot.storage.filter(
+                    conversation=conversation,
+                    fields=['conversation', 'text', 'in_response_to']
+                )
+            )
+
+        return self.existing_fingerprints[conversation]
+
+    def add_existing_fingerprints(self, statements):
+        """
+        Add the fingerprints of statements that have been created to the
+        sets of existing fingerprints that have already been read.
+        """
+        for statement in statements:
+            fingerprints = self.existing_fingerprints.get(statement.conversation)
 
-        return input_statement
+            if fingerprints is not None:
+                fingerprints.add(self.get_statement_fingerprint(statement))
+
+    def reset_existing_fingerprints(self):
+        """
+        Read the fingerprints of the existing statements from the database
+        again the next time they are needed.
+        """
+        self.existing_fingerprints = {}
+
+    def has_training_statements(self, conversation='training'):
+        """
+        Return True if the database has any of the statements of a conversation.
+        """
+        if self.skip_existing_statements:
+            return bool(self.get_existing_fingerprints(conversation))
+
+        for statement in self.chatbot.storage.filter(
+            conversation=conversation, fields=['id'], page_size=1
+        ):
+            return True
+
+        return False
+
+    def exclude_existing_statements(self, statements, existing_fingerprints):
+        """
+        Return the statements with fingerprints that are not in the set of
+        existing fingerprints.
+        """
+        if not existing_fingerprints:
+            return statements
+
+        return [
+            statement for statement in statements
+            if self.get_statement_fingerprint(statement) not in existing_fingerprints
+        ]
+
+    def tag_statements(self, statements):
+        """
+        Set the search text of each statement and the statement it is in response to.
+        """
+        get_text_index_string = self.chatbot.storage.tagger.get_text_index_string
+        search_texts = {}
+
+        for statement in statements:
+            if statement.text not in search_texts:
+                search_texts[statement.text] = get_text_index_string(statement.text)
+
+            statement.search_text = search_texts[statement.text]
+
+            if statement.in_response_to is None:
+                statement.search_in_response_to = ''
+            else:
+                if statement.in_response_to not in search_texts:
+                    search_texts[statement.in_response_to] = get_text_index_string(
+                        statement.in_response_to
+                    )
+
+                statement.search_in_response_to = search_texts[statement.in_response_to]
+
+        return statements
 
     def train(self, *args, **kwargs):
         """
@@ -56,22 +173,47 @@ class Trainer(object):
             super().__init__(message or default)
 
     def _generate_export_data(self):
-        result = []
-        for statement in self.chatbot.storage.filter():
-            if statement.in_response_to:
-                result.append([statement.in_response_to, statement.text])
+        """
+        Yield each pair of statement and response in the database,
+        one page of statements at a time.
+        """
+        statements = self.chatbot.storage.filter(
+            fields=['text', 'in_response_to']
+        )
 
-        return result
+        for statement in statements:
+            if statement.in_response_to:
+                yield [statement.in_response_to, statement.text]
 
     def export_for_training(self, file_path='./export.json'):
         """
         Create a file from the database that can be used to
         train other chat bots.
+
+        Files ending in ``.jsonl`` are written with one pair of statements
+        per line. Other files are written as a single JSON document. Either
+        kind of file is compressed if the file name ends in ``.gz``.
+        Statements are written as they are read from the database, so the
+        whole export is never held in memory.
         """
         import json
-        export = {'conversations': self._generate_export_data()}
-        with open(file_path, 'w+', encoding='utf8') as jsonfile:
-            json.dump(export, jsonfile, ensure_ascii=False)
+
+        lines = _is_json_lines(file_path)
+
+        with _open_export_file(file_path, 'wt') as export_file:
+            if not lines:
+                export_file.write('{"conversations": [')
+
+            for index, pair in enumerate(self._generate_export_data()):
+                if lines:
+                    export_file.write(json.dumps(pair, ensure_ascii=False) + '\n')
+                else:
+                    if index:
+                        export_file.write(', ')
+                    export_file.write(json.dumps(pair, ensure_ascii=False))
+
+            if not lines:
+                export_file.write(']}')
 
 
 class ListTrainer(Trainer):
@@ -86,93 +228,351 @@ class ListTrainer(Trainer):
         statements that represents a single conversation.
         """
         previous_statement_text = None
-        previous_statement_search_text = ''
 
-        statements_to_create = []
+        statements = self.get_preprocessed_statements([
+            Statement(text=text, conversation='training') for text in conversation
+        ])
 
-        for conversation_count, text in enumerate(conversation):
+        for conversation_count, statement in enumerate(statements):
             if self.show_training_progress:
                 utils.print_progress_bar(
                     'List Trainer',
                     conversation_count + 1, len(conversation)
                 )
 
-            statement_search_text = self.chatbot.storage.tagger.get_text_index_string(text)
-
-            statement = self.get_preprocessed_statement(
-                Statement(
-                    text=text,
-                    search_text=statement_search_text,
-                    in_response_to=previous_statement_text,
-                    search_in_response_to=previous_statement_search_text,
-                    conversation='training'
-                )
-            )
+            statement.in_response_to = previous_statement_text
 
             previous_statement_text = statement.text
-            previous_statement_search_text = statement_search_text
 
-            statements_to_create.append(statement)
+        statements_to_create = self.tag_statements(
+            self.exclude_existing_statements(statements, self.get_existing_fingerprints())
+        )
+
+        if statements_to_create:
+            self.chatbot.storage.create_many(statements_to_create)
+            self.add_existing_fingerprints(statements_to_create)
+
+    def train_from_export(self, file_path, batch_size=1000):
+        """
+        Train the chat bot with each pair of statements in a file created
+        by ``export_for_training``. Each pair is trained as a conversation,
+        and the statements are saved in batches as the file is read.
+
+        Statements that were in the database before the file is read are
+        skipped, but pairs that are repeated in the file are all saved, so
+        that the storage adapter can count them when it deduplicates statements.
+
+        Files ending in ``.jsonl`` (or ``.jsonl.gz``) are read one line at a
+        time. Other files are read as a single JSON document.
+        """
+        existing_fingerprints = self.get_existing_fingerprints()
+
+        statements_to_create = []
+
+        try:
+            for conversation in _read_export_file(file_path):
+                previous_statement_text = None
+
+                statements = self.get_preprocessed_statements([
+                    Statement(text=text, conversation='training') for text in conversation
+                ])
+
+                for statement in statements:
+                    statement.in_response_to = previous_statement_text
 
-        self.chatbot.storage.create_many(statements_to_create)
+                    previous_statement_text = statement.text
+
+                statements_to_create.extend(
+                    self.exclude_existing_statements(statements, existing_fingerprints)
+                )
+
+                if len(statements_to_create) >= batch_size:
+                    self.chatbot.storage.create_many(self.tag_statements(statements_to_create))
+                    statements_to_create = []
+
+            if statements_to_create:
+                self.chatbot.storage.create_many(self.tag_statements(statements_to_create))
+        finally:
+            # The fingerprints of the imported statements are not kept,
+            # so they are read from the database the next time they are needed
+            self.reset_existing_fingerprints()
 
 
 class ChatterBotCorpusTrainer(Trainer):
     """
     Allows the chat bot to be trained using data from the
     ChatterBot dialog corpus.
+
+    :param str corpus_manifest_path: The path to a file where the hash of each
+           corpus file that the chat bot has been trained with is saved. Corpus
+           files that have not changed since they were last trained are skipped.
     """
 
-    def train(self, *corpus_paths):
-        from chatterbot.corpus import load_corpus, list_corpus_files
+    def __init__(self, chatbot, **kwargs):
+        super().__init__(chatbot, **kwargs)
+
+        self.corpus_manifest_path = kwargs.get('corpus_manifest_path')
+
+    def read_corpus_manifest(self):
+        """
+        Return a dictionary of the hashes of the corpus files that have been trained.
+        """
+        import json
+
+        if not self.corpus_manifest_path or not os.path.exists(self.corpus_manifest_path):
+            return {}
+
+        with open(self.corpus_manifest_path, encoding='utf8') as manifest_file:
+            return json.load(manifest_file)
+
+    def write_corpus_manifest(self, manifest):
+        """
+        Save the hashes of the corpus files that have been trained.
+        """
+        import json
+
+        temporary_path = self.corpus_manifest_path + '.tmp'
+
+        with open(temporary_path, 'w', encoding='utf8') as manifest_file:
+            json.dump(manifest, manifest_file, indent=2, sort_keys=True)
+
+        os.replace(temporary_path, self.corpus_manifest_path)
+
+    def get_corpus_statements(self, corpus, categories, file_path):
+        """
+        Return a list of the preprocessed statements for each conversation
+        in a corpus file. Each statement is linked to the statement before
+        it in the conversation, but the statements have not been tagged.
+        """
+        statements_to_create = []
+
+        # Train the chat bot with each statement and response pair
+        for conversation_count, conversation in enumerate(corpus):
+
+            if self.show_training_progress:
+                utils.print_progress_bar(
+                    'Training ' + str(os.path.basename(file_path)),
+                    conversation_count + 1,
+                    len(corpus)
+                )
+
+            previous_statement_text = None
+
+            statements = self.get_preprocessed_statements([
+                Statement(text=text, conversation='training', tags=list(categories))
+                for text in conversation
+            ])
+
+            for statement in statements:
+                statement.in_response_to = previous_statement_text
+
+                previous_statement_text = statement.text
+
+                statements_to_create.append(statement)
+
+        return statements_to_create
+
+    def get_compiled_corpus_settings(self):
+        """
+        Return the settings that a compiled corpus depends on. Statements in
+        a compiled corpus have already been preprocessed and tagged, so they
+        can only be used by a chat bot with the same settings.
+        """
+        tagger = self.chatbot.storage.tagger
+
+        return {
+            'tagger': '{}.{}'.format(type(tagger).__module__, type(tagger).__name__),
+            'language': tagger.language.ISO_639,
+            'preprocessors': [
+                '{}.{}'.format(preprocessor.__module__, preprocessor.__name__)
+                for preprocessor in self.chatbot.preprocessors
+            ]
+        }
+
+    def compile_corpus(self, output_path, *corpus_paths):
+        """
+        Preprocess and tag the statements in the specified corpora and
+        write them to a compiled corpus file. Training with the compiled
+        file does not need to read the corpus or tag its statements again.
+        """
+        from chatterbot.corpus import (
+            load_corpus, list_corpus_files, get_corpus_hash, write_compiled_corpus
+        )
 
         data_file_paths = []
 
-        # Get the paths to each file the bot will be trained with
         for corpus_path in corpus_paths:
             data_file_paths.extend(list_corpus_files(corpus_path))
 
-        for corpus, categories, file_path in load_corpus(*data_file_paths):
+        categories = []
+        category_indexes = {}
 
-            statements_to_create = []
+        columns = {
+            'text': [],
+            'search_text': [],
+            'in_response_to': [],
+            'categories': [],
+        }
 
-            # Train the chat bot with each statement and response pair
-            for conversation_count, conversation in enumerate(corpus):
+        for corpus, file_categories, file_path in load_corpus(*data_file_paths):
+            category_key = tuple(file_categories)
 
-                if self.show_training_progress:
-                    utils.print_progress_bar(
-                        'Training ' + str(os.path.basename(file_path)),
-                        conversation_count + 1,
-                        len(corpus)
-                    )
+            if category_key not in category_indexes:
+                category_indexes[category_key] = len(categories)
+                categories.append(list(file_categories))
 
-                previous_statement_text = None
-                previous_statement_search_text = ''
+            category_index = category_indexes[category_key]
+
+            statements = self.tag_statements(
+                self.get_corpus_statements(corpus, file_categories, file_path)
+            )
+
+            for statement in statements:
+                # Responses refer to the index of the statement before them
+                if statement.in_response_to is None:
+                    columns['in_response_to'].append(None)
+                else:
+                    columns['in_response_to'].append(len(columns['text']) - 1)
+
+                columns['text'].append(statement.text)
+                columns['search_text'].append(statement.search_text)
+                columns['categories'].append(category_index)
+
+        data = self.get_compiled_corpus_settings()
+        data['hash'] = get_corpus_hash(*data_file_paths)
+        data['categories'] = categories
+        data['statements'] = columns
+
+        write_compiled_corpus(output_path, data)
+
+    def train_compiled_corpus(self, file_path, existing_fingerprints=None):
+        """
+        Train the chat bot with the statements in a compiled corpus file.
+        Returns the statements that were created.
+        """
+        from chatterbot.corpus import read_compiled_corpus
+
+        add_fingerprints = existing_fingerprints is None
 
-                for text in conversation:
+        if existing_fingerprints is None:
+            existing_fingerprints = self.get_existing_fingerprints()
 
-                    statement_search_text = self.chatbot.storage.tagger.get_text_index_string(text)
+        data = read_compiled_corpus(file_path)
 
-                    statement = Statement(
-                        text=text,
-                        search_text=statement_search_text,
-                        in_response_to=previous_statement_text,
-                        search_in_response_to=previous_statement_search_text,
-                        conversation='training'
+        for setting, value in self.get_compiled_corpus_settings().items():
+            if data.get(setting) != value:
+                raise self.CompiledCorpusException(
+                    'The compiled corpus {} was created with a different {} '
+                    'than this chat bot uses and must be compiled again.'.format(
+                        file_path, setting
                     )
+                )
 
-                    statement.add_tags(*categories)
+        categories = data['categories']
+        columns = data['statements']
+        texts = columns['text']
+        search_texts = columns['search_text']
 
-                    statement = self.get_preprocessed_statement(statement)
+        statements_to_create = []
 
-                    previous_statement_text = statement.text
-                    previous_statement_search_text = statement_search_text
+        for index, text in enumerate(texts):
+            previous_index = columns['in_response_to'][index]
+
+            statement = Statement(
+                text=text,
+                search_text=search_texts[index],
+                conversation='training',
+                tags=list(categories[columns['categories'][index]])
+            )
+
+            if previous_index is None:
+                statement.search_in_response_to = ''
+            else:
+                statement.in_response_to = texts[previous_index]
+                statement.search_in_response_to = search_texts[previous_index]
+
+            statements_to_create.append(statement)
+
+        statements_to_create = self.exclude_existing_statements(
+            statements_to_create, existing_fingerprints
+        )
 
-                    statements_to_create.append(statement)
+        if statements_to_create:
+            self.chatbot.storage.create_many(statements_to_create)
+
+            if add_fingerprints:
+                self.add_existing_fingerprints(statements_to_create)
+
+        return statements_to_create
+
+    def train(self, *corpus_paths):
+        from chatterbot.corpus import (
+            load_corpus, list_corpus_files, is_compiled_corpus, get_corpus_hash
+        )
+
+        existing_fingerprints = self.get_existing_fingerprints()
+
+        # The manifest is ignored if none of the training data is in the database
+        manifest = {}
+
+        if self.corpus_manifest_path and self.has_training_statements():
+            manifest = self.read_corpus_manifest()
+
+        data_file_paths = []
+
+        # Statements that are repeated in the corpus files are all created,
+        # so the fingerprints are only added after every file is trained
+        created_fingerprints = []
+
+        # Get the paths to each file the bot will be trained with
+        for corpus_path in corpus_paths:
+            if is_compiled_corpus(corpus_path):
+                created_fingerprints.extend(
+                    self.get_statement_fingerprint(statement)
+                    for statement in self.train_compiled_corpus(corpus_path, existing_fingerprints)
+                )
+            else:
+                data_file_paths.extend(list_corpus_files(corpus_path))
+
+        file_hashes = {}
+
+        if self.corpus_manifest_path:
+            for file_path in list(data_file_paths):
+                file_hashes[file_path] = get_corpus_hash(file_path)
+
+                # Skip corpus files that have not changed since they were trained
+                if manifest.get(os.path.abspath(file_path)) == file_hashes[file_path]:
+                    data_file_paths.remove(file_path)
+
+        for corpus, categories, file_path in load_corpus(*data_file_paths):
+
+            statements_to_create = self.tag_statements(
+                self.exclude_existing_statements(
+                    self.get_corpus_statements(corpus, categories, file_path),
+                    existing_fingerprints
+                )
+            )
 
             if statements_to_create:
                 self.chatbot.storage.create_many(statements_to_create)
 
+                created_fingerprints.extend(
+                    self.get_statement_fingerprint(statement) for statement in statements_to_create
+                )
+
+            if self.corpus_manifest_path:
+                manifest[os.path.abspath(file_path)] = file_hashes[file_path]
+                self.write_corpus_manifest(manifest)
+
+        existing_fingerprints.update(created_fingerprints)
+
+    class CompiledCorpusException(Exception):
+        """
+        Exception raised when a compiled corpus was created with
+        settings that do not match the chat bot being trained.
+        """
+        pass
+
 
 class UbuntuCorpusTrainer(Trainer):
     """
@@ -334,8 +734,7 @@ class UbuntuCorpusTrainer(Trainer):
                                 persona=row[1]
                             )
 
-                            for preprocessor in self.chatbot.preprocessors:
-                                statement = preprocessor(statement)
+                            statement = self.get_preprocessed_statement(statement)
 
                             statement.search_text = tagger.get_text_index_string(statement.text)
                             statement.search_in_response_to = previous_statement_search_text
@@ -348,3 +747,40 @@ class UbuntuCorpusTrainer(Trainer):
             self.chatbot.storage.create_many(statements_from_file)
 
         print('Training took', time.time() - start_time, 'seconds.')
+
+
+def _is_json_lines(file_path):
+    """
+    Return True if the export file has one JSON document per line.
+    """
+    if file_path.endswith('.gz'):
+        file_path = file_path[:-len('.gz')]
+
+    return file_path.endswith('.jsonl')
+
+
+def _open_export_file(file_path, mode):
+    """
+    Open an export file, using gzip if the file name ends in ``.gz``.
+    """
+    import gzip
+
+    if file_path.endswith('.gz'):
+        return gzip.open(file_path, mode, encoding='utf8')
+
+    return open(file_path, mode, encoding='utf8')
+
+
+def _read_export_file(file_path):
+    """
+    Yield each pair of statements in an export file.
+    """
+    import json
+
+    with _open_export_file(file_path, 'rt') as export_file:
+        if _is_json_lines(file_path):
+            for line in export_file:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from json.load(export_file).get('conversations', [])
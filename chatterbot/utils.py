@@ -83,11 +83,24 @@ def get_response_time(chatbot, statement='Hello'):
     """
     import time
 
-    start_time = time.time()
+    start_time = time.perf_counter()
 
     chatbot.get_response(statement)
 
-    return time.time() - start_time
+    return time.perf_counter() - start_time
+
+
+def freeze(value):
+    """
+    Return a hashable version of a value, such as a dictionary of parameters.
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((key, freeze(item)) for key, item in value.items()))
+
+    if isinstance(value, (list, tuple, set, )):
+        return tuple(freeze(item) for item in value)
+
+    return value
 
 
 def print_progress_bar(description, iteration_counter, total_items, progress_bar_length=20):
@@ -0,0 +1,477 @@
+"""
+Benchmarks for the chat bot's response path.
+
+A synthetic corpus of conversations is loaded into the selected storage
+backend and a series of queries is then run through each stage of
+generating a response. The latency percentiles and throughput of each
+stage are reported and can be written to a JSON file so that runs can be
+compared over time.
+
+Example usage:
+
+.. sourcecode:: sh
+
+   python tests/benchmarks.py --statements 10000,100000 --output results.json
+   python tests/benchmarks.py --statements 10000 --compare results.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+from datetime import datetime
+
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
+
+
+WORDBANK = (
+    'the', 'mellifluous', 'sound', 'of', 'a', 'spring', 'evening',
+    'breaks', 'heart', 'string', 'by', 'calling', 'out', 'to',
+    'David', 'who', 'looks', 'on', 'at', 'world', 'blankly',
+    'could', 'tell', 'that', 'there', 'is', 'no', 'instrument',
+    'softly', 'strumming', 'toward', 'melody', 'called', 'silence',
+    'river', 'stone', 'quiet', 'morning', 'light', 'window', 'garden',
+    'city', 'train', 'station', 'coffee', 'book', 'letter', 'friend',
+)
+
+# The compare stage is the time the search algorithm spends comparing the
+# input with each candidate, which is not included in the search stage
+STAGES = (
+    'preprocess',
+    'tag',
+    'search',
+    'compare',
+    'select',
+    'learn',
+)
+
+# Keyword arguments used to create a chat bot for each storage backend
+STORAGE_BACKENDS = {
+    'sql': {
+        'storage_adapter': 'chatterbot.storage.SQLStorageAdapter',
+        'database_uri': None,
+    },
+    'sql-file': {
+        'storage_adapter': 'chatterbot.storage.SQLStorageAdapter',
+        'database_uri': 'sqlite:///benchmark.sqlite3',
+    },
+    'mongo': {
+        'storage_adapter': 'chatterbot.storage.MongoDatabaseAdapter',
+        'database_uri': 'mongodb://localhost:27017/chatterbot_benchmark_database',
+    },
+    'django': {
+        'storage_adapter': 'chatterbot.storage.DjangoStorageAdapter',
+    },
+}
+
+TAGGERS = {
+    'pos-lemma': 'chatterbot.tagging.PosLemmaTagger',
+    'lowercase': 'chatterbot.tagging.LowercaseTagger',
+}
+
+
+def generate_sentence(generator, minimum_length=3, maximum_length=12):
+    """
+    Return a random sentence made from words in the word bank.
+    """
+    length = generator.randint(minimum_length, maximum_length)
+    return ' '.join(generator.choice(WORDBANK) for _ in range(length)).capitalize() + '.'
+
+
+def generate_corpus(statement_count, conversation_length=8, seed=0):
+    """
+    Return a list of conversations that contain a total of
+    ``statement_count`` statements. The same seed always
+    produces the same corpus.
+    """
+    generator = random.Random(seed)
+    conversations = []
+    remaining = statement_count
+
+    while remaining > 0:
+        length = min(conversation_length, remaining)
+        conversations.append([
+            generate_sentence(generator) for _ in range(length)
+        ])
+        remaining -= length
+
+    return conversations
+
+
+def generate_queries(conversations, query_count, seed=0):
+    """
+    Return a list of query strings. Half of the queries are known
+    statements and the other half are new random sentences.
+    """
+    generator = random.Random(seed + 1)
+    queries = []
+
+    for index in range(query_count):
+        if index % 2 == 0:
+            conversation = generator.choice(conversations)
+            queries.append(generator.choice(conversation))
+        else:
+            queries.append(generate_sentence(generator))
+
+    return queries
+
+
+def percentile(sorted_values, percent):
+    """
+    Return the value at the given percentile of a sorted list of values.
+    """
+    if not sorted_values:
+        return 0
+
+    index = (len(sorted_values) - 1) * percent / 100.0
+    lower = int(index)
+    upper = min(lower + 1, len(sorted_values) - 1)
+
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (index - lower)
+
+
+def summarize(durations):
+    """
+    Return latency statistics, in milliseconds, for a list of durations in seconds.
+    """
+    sorted_values = sorted(durations)
+    total = sum(sorted_values)
+
+    return {
+        'count': len(sorted_values),
+        'mean_ms': (total / len(sorted_values) * 1000) if sorted_values else 0,
+        'p50_ms': percentile(sorted_values, 50) * 1000,
+        'p95_ms': percentile(sorted_values, 95) * 1000,
+        'p99_ms': percentile(sorted_values, 99) * 1000,
+        'max_ms': (sorted_values[-1] * 1000) if sorted_values else 0,
+        'throughput_per_second': (len(sorted_values) / total) if total else 0,
+    }
+
+
+def get_peak_memory():
+    """
+    Return the peak resident memory of this process in bytes,
+    or None if it cannot be determined on this platform.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # The value is reported in bytes on macOS and in kilobytes elsewhere
+    if sys.platform == 'darwin':
+        return peak
+
+    return peak * 1024
+
+
+def setup_django():
+    """
+    Configure an in-memory Django database for the Django storage backend.
+    """
+    import django
+    from django.core.management import call_command
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tests_django.test_settings')
+    django.setup()
+    call_command('migrate', verbosity=0)
+
+
+def create_chatbot(storage, tagger, **kwargs):
+    """
+    Return a chat bot that uses the given storage backend.
+    """
+    from chatterbot import ChatBot
+    from chatterbot import utils
+
+    if storage == 'django':
+        setup_django()
+
+    chatbot_kwargs = dict(STORAGE_BACKENDS[storage])
+    chatbot_kwargs['tagger'] = utils.import_module(TAGGERS[tagger])
+    chatbot_kwargs.update(kwargs)
+
+    return ChatBot('Benchmark Bot', **chatbot_kwargs)
+
+
+def load_corpus(chatbot, conversations, batch_size=10000):
+    """
+    Save each conversation to the chat bot's storage.
+    Returns the number of seconds that loading took.
+    """
+    from chatterbot.conversation import Statement
+
+    tagger = chatbot.storage.tagger
+    start_time = time.perf_counter()
+    batch = []
+
+    for conversation in conversations:
+        previous_text = None
+        previous_search_text = ''
+
+        for text in conversation:
+            search_text = tagger.get_text_index_string(text)
+
+            batch.append(Statement(
+                text=text,
+                search_text=search_text,
+                in_response_to=previous_text,
+                search_in_response_to=previous_search_text,
+                conversation='training'
+            ))
+
+            previous_text = text
+            previous_search_text = search_text
+
+        if len(batch) >= batch_size:
+            chatbot.storage.create_many(batch)
+            batch = []
+
+    if batch:
+        chatbot.storage.create_many(batch)
+
+    return time.perf_counter() - start_time
+
+
+def run_query(chatbot, text, timings, learn=True):
+    """
+    Generate a response to the text, recording the time
+    taken by each stage in the timings dictionary.
+
+    The stages mirror the work done by ``ChatBot.get_response``
+    when the ``BestMatch`` logic adapter is used, and the search stage
+    runs the logic adapter's search algorithm. Calls to the search
+    algorithm's ``compare_statements`` function are timed as the compare
+    stage, which is only recorded for search algorithms that have one.
+    """
+    from chatterbot.conversation import Statement
+
+    logic_adapter = chatbot.logic_adapters[0]
+    search_algorithm = logic_adapter.search_algorithm
+
+    start_time = time.perf_counter()
+    input_statement = chatbot.preprocessor_pipeline(
+        Statement(text=text, conversation='benchmark')
+    )
+    timings['preprocess'].append(time.perf_counter() - start_time)
+
+    start_time = time.perf_counter()
+    input_statement.search_text = chatbot.storage.tagger.get_text_index_string(input_statement.text)
+    timings['tag'].append(time.perf_counter() - start_time)
+
+    compare_statements = getattr(search_algorithm, 'compare_statements', None)
+    compare_durations = []
+
+    if compare_statements is not None:
+        def timed_compare_statements(*args, **kwargs):
+            compare_start_time = time.perf_counter()
+            try:
+                return compare_statements(*args, **kwargs)
+            finally:
+                compare_durations.append(time.perf_counter() - compare_start_time)
+
+        search_algorithm.compare_statements = timed_compare_statements
+
+    start_time = time.perf_counter()
+    closest_match = input_statement
+
+    try:
+        for result in search_algorithm.search(input_statement):
+            closest_match = result
+
+            if result.confidence >= logic_adapter.maximum_similarity_threshold:
+                break
+    finally:
+        if compare_statements is not None:
+            search_algorithm.compare_statements = compare_statements
+
+    compare_duration = sum(compare_durations)
+    timings['search'].append(time.perf_counter() - start_time - compare_duration)
+
+    if compare_statements is not None:
+        timings['compare'].append(compare_duration)
+
+    start_time = time.perf_counter()
+    response_list = list(chatbot.storage.filter(
+        search_in_response_to=closest_match.search_text
+    ))
+
+    if response_list:
+        response = logic_adapter.select_response(
+            input_statement, response_list, chatbot.storage
+        )
+    else:
+        response = logic_adapter.get_default_response(input_statement)
+    timings['select'].append(time.perf_counter() - start_time)
+
+    if learn:
+        start_time = time.perf_counter()
+        chatbot.learn_response(
+            Statement(text=response.text, conversation='benchmark', persona='bot:Benchmark Bot'),
+            input_statement
+        )
+        timings['learn'].append(time.perf_counter() - start_time)
+
+
+def run_benchmark(storage='sql', statement_count=10000, query_count=200,
+                  tagger='pos-lemma', learn=True, trace_memory=False, seed=0):
+    """
+    Run the benchmark for a single storage backend and corpus size.
+    Returns a dictionary of results.
+    """
+    import tracemalloc
+
+    chatbot = create_chatbot(storage, tagger)
+    chatbot.storage.drop()
+
+    conversations = generate_corpus(statement_count, seed=seed)
+    queries = generate_queries(conversations, query_count, seed=seed)
+
+    load_duration = load_corpus(chatbot, conversations)
+
+    timings = {stage: [] for stage in STAGES}
+    totals = []
+
+    if trace_memory:
+        tracemalloc.start()
+
+    for query in queries:
+        start_time = time.perf_counter()
+        run_query(chatbot, query, timings, learn=learn)
+        totals.append(time.perf_counter() - start_time)
+
+    traced_peak = None
+
+    if trace_memory:
+        _, traced_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    chatbot.storage.drop()
+
+    return {
+        'storage': storage,
+        'tagger': tagger,
+        'statements': statement_count,
+        'queries': query_count,
+        'load': {
+            'seconds': load_duration,
+            'statements_per_second': (statement_count / load_duration) if load_duration else 0,
+        },
+        'stages': {
+            stage: summarize(durations) for stage, durations in timings.items() if durations
+        },
+        'total': summarize(totals),
+        'peak_memory_bytes': get_peak_memory(),
+        'traced_peak_memory_bytes': traced_peak,
+    }
+
+
+def compare_results(previous, current, stages=STAGES + ('total', )):
+    """
+    Return a list of lines describing the change in p50 and p95 latency
+    between two sets of results for matching backends and corpus sizes.
+    """
+    lines = []
+
+    previous_runs = {
+        (result['storage'], result['statements']): result for result in previous['results']
+    }
+
+    for result in current['results']:
+        key = (result['storage'], result['statements'])
+        previous_result = previous_runs.get(key)
+
+        if not previous_result:
+            continue
+
+        for stage in stages:
+            if stage == 'total':
+                before, after = previous_result['total'], result['total']
+            elif stage in result['stages'] and stage in previous_result['stages']:
+                before, after = previous_result['stages'][stage], result['stages'][stage]
+            else:
+                continue
+
+            for metric in ('p50_ms', 'p95_ms', ):
+                change = ((after[metric] - before[metric]) / before[metric] * 100) if before[metric] else 0
+                lines.append('{} {} {} {}: {:.3f} -> {:.3f} ({:+.1f}%)'.format(
+                    key[0], key[1], stage, metric, before[metric], after[metric], change
+                ))
+
+    return lines
+
+
+def main(arguments=None):
+    from chatterbot.__main__ import get_chatterbot_version
+
+    parser = argparse.ArgumentParser(description='Benchmark the chat bot response path.')
+    parser.add_argument(
+        '--storage', default='sql',
+        help='Comma separated storage backends: {}'.format(', '.join(sorted(STORAGE_BACKENDS)))
+    )
+    parser.add_argument(
+        '--statements', default='10000',
+        help='Comma separated corpus sizes, for example 10000,100000,1000000'
+    )
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--tagger', default='pos-lemma', choices=sorted(TAGGERS))
+    parser.add_argument('--read-only', action='store_true', help='Skip the learn stage')
+    parser.add_argument('--trace-memory', action='store_true', help='Trace allocations while querying')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Write the results to this JSON file')
+    parser.add_argument('--compare', help='Compare the results to a previous JSON file')
+
+    options = parser.parse_args(arguments)
+
+    results = {
+        'chatterbot_version': get_chatterbot_version(),
+        'python_version': platform.python_version(),
+        'platform': platform.platform(),
+        'created_at': datetime.now().isoformat(),
+        'results': [],
+    }
+
+    for storage in options.storage.split(','):
+        for statement_count in options.statements.split(','):
+            result = run_benchmark(
+                storage=storage,
+                statement_count=int(statement_count),
+                query_count=options.queries,
+                tagger=options.tagger,
+                learn=not options.read_only,
+                trace_memory=options.trace_memory,
+                seed=options.seed
+            )
+            results['results'].append(result)
+
+            print('{storage} with {statements} statements: p50 {p50:.3f}ms p95 {p95:.3f}ms p99 {p99:.3f}ms'.format(
+                storage=storage,
+                statements=statement_count,
+                p50=result['total']['p50_ms'],
+                p95=result['total']['p95_ms'],
+                p99=result['total']['p99_ms']
+            ))
+
+    if options.output:
+        with open(options.output, 'w', encoding='utf8') as output_file:
+            json.dump(results, output_file, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+
+    if options.compare:
+        with open(options.compare, encoding='utf8') as previous_file:
+            previous = json.load(previous_file)
+
+        for line in compare_results(previous, results):
+            print(line)
+
+    return results
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,206 @@
+from unittest import TestCase
+from chatterbot.conversation import Statement
+from chatterbot.storage import CachedStorageAdapter, InMemoryStorageAdapter
+from chatterbot.storage.cached_storage import LocalCacheClient
+
+
+class CachedStorageAdapterTestCase(TestCase):
+
+    def setUp(self):
+        self.adapter = CachedStorageAdapter(
+            cached_storage_adapter='chatterbot.storage.InMemoryStorageAdapter'
+        )
+
+        self.adapter.create_many([
+            Statement(text='Hello', conversation='greeting', tags=['greeting']),
+            Statement(text='Hi', in_response_to='Hello', conversation='greeting'),
+            Statement(text='The sky is blue.', conversation='facts', tags=['fact']),
+        ])
+
+    def get_texts(self, **kwargs):
+        return [statement.text for statement in self.adapter.filter(**kwargs)]
+
+
+class CachedStorageAdapterTests(CachedStorageAdapterTestCase):
+
+    def test_wraps_adapter(self):
+        self.assertIsInstance(self.adapter.storage, InMemoryStorageAdapter)
+        self.assertIs(self.adapter.tagger, self.adapter.storage.tagger)
+
+    def test_count(self):
+        self.assertEqual(self.adapter.count(), 3)
+
+    def test_wrapped_adapter_methods(self):
+        self.assertEqual(self.adapter.get_search_tokens('a b'), ['a', 'b'])
+
+    def test_filter_miss_then_hit(self):
+        first = self.get_texts(conversation='greeting')
+        second = self.get_texts(conversation='greeting')
+
+        self.assertEqual(first, ['Hello', 'Hi'])
+        self.assertEqual(second, first)
+        self.assertEqual(self.adapter.cache_info()['hits'], 1)
+        self.assertEqual(self.adapter.cache_info()['misses'], 1)
+        self.assertEqual(self.adapter.cache_info()['hit_rate'], 0.5)
+
+    def test_page_size_is_not_part_of_key(self):
+        self.get_texts(conversation='greeting', page_size=1)
+        self.get_texts(conversation='greeting')
+
+        self.assertEqual(self.adapter.cache_info()['hits'], 1)
+
+    def test_tag_string_and_list_share_key(self):
+        self.get_texts(tags='fact')
+        self.get_texts(tags=['fact'])
+
+        self.assertEqual(self.adapter.cache_info()['hits'], 1)
+
+    def test_changes_to_results_are_not_cached(self):
+        for statement in self.adapter.filter(text='Hello'):
+            statement.confidence = 1
+            statement.add_tags('changed')
+
+        statement = list(self.adapter.filter(text='Hello'))[0]
+
+        self.assertEqual(statement.confidence, 0)
+        self.assertEqual(statement.get_tags(), ['greeting'])
+
+    def test_partially_read_results_are_not_cached(self):
+        next(self.adapter.filter(conversation='greeting'))
+
+        self.assertEqual(self.adapter.cache_info()['size'], 0)
+
+    def test_cache_max_results(self):
+        self.adapter.cache_max_results = 1
+
+        self.assertEqual(len(self.get_texts()), 3)
+        self.assertEqual(self.adapter.cache_info()['size'], 0)
+
+    def test_cache_size(self):
+        self.adapter.cache_size = 1
+
+        self.get_texts(text='Hello')
+        self.get_texts(text='Hi')
+
+        self.assertEqual(self.adapter.cache_info()['size'], 1)
+        self.assertEqual(self.get_texts(text='Hi'), ['Hi'])
+        self.assertEqual(self.adapter.cache_info()['hits'], 1)
+
+
+class CachedStorageAdapterInvalidationTests(CachedStorageAdapterTestCase):
+
+    def test_create_invalidates_matching_filter(self):
+        self.get_texts(conversation='greeting')
+
+        self.adapter.create(text='Hey', conversation='greeting')
+
+        self.assertEqual(self.get_texts(conversation='greeting'), ['Hello', 'Hi', 'Hey'])
+
+    def test_create_keeps_other_filters(self):
+        self.get_texts(conversation='facts')
+
+        self.adapter.create(text='Hey', conversation='greeting')
+
+        self.assertEqual(self.get_texts(conversation='facts'), ['The sky is blue.'])
+        self.assertEqual(self.adapter.cache_info()['hits'], 1)
+
+    def test_create_invalidates_unconstrained_filter(self):
+        self.get_texts(search_text_contains='hey')
+
+        self.adapter.create(text='Hey', conversation='greeting')
+
+        self.assertEqual(self.adapter.cache_info()['size'], 0)
+
+    def test_create_keeps_filter_on_other_tags(self):
+        self.get_texts(tags=['fact'])
+
+        self.adapter.create(text='Hey', tags=['greeting'])
+
+        self.assertEqual(self.adapter.cache_info()['size'], 1)
+
+    def test_create_many_invalidates_matching_filter(self):
+        self.get_texts(in_response_to='Hello')
+        self.get_texts(conversation='facts')
+
+        self.adapter.create_many([
+            Statement(text='Hey', in_response_to='Hello', conversation='greeting')
+        ])
+
+        self.assertEqual(self.get_texts(in_response_to='Hello'), ['Hi', 'Hey'])
+        self.assertEqual(self.adapter.cache_info()['size'], 2)
+
+    def test_remove_invalidates_matching_filter(self):
+        self.get_texts(text='Hello')
+        self.get_texts(text='Hi')
+
+        self.adapter.remove('Hello')
+
+        self.assertEqual(self.get_texts(text='Hello'), [])
+        self.assertEqual(self.get_texts(text='Hi'), ['Hi'])
+        self.assertEqual(self.adapter.cache_info()['hits'], 1)
+
+    def test_update_clears_cache(self):
+        self.get_texts(text='Hi')
+
+        statement = list(self.adapter.filter(text='Hi'))[0]
+        statement.in_response_to = 'Hey'
+        self.adapter.update(statement)
+
+        self.assertEqual(self.adapter.cache_info()['size'], 0)
+        self.assertEqual(self.get_texts(in_response_to='Hey'), ['Hi'])
+
+    def test_drop_clears_cache(self):
+        self.get_texts(text='Hi')
+
+        self.adapter.drop()
+
+        self.assertEqual(self.get_texts(text='Hi'), [])
+
+
+class CachedStorageAdapterSharedCacheTests(TestCase):
+
+    def setUp(self):
+        self.cache_client = LocalCacheClient()
+
+        self.first = CachedStorageAdapter(
+            cached_storage_adapter='chatterbot.storage.InMemoryStorageAdapter',
+            cache_client=self.cache_client
+        )
+        self.second = CachedStorageAdapter(
+            cached_storage_adapter='chatterbot.storage.InMemoryStorageAdapter',
+            cache_client=self.cache_client
+        )
+
+        self.first.storage.create(text='Hello')
+
+    def test_results_are_shared(self):
+        list(self.first.filter(text='Hello'))
+
+        # The second adapter's database is empty, so the result must be from the shared cache
+        results = list(self.second.filter(text='Hello'))
+
+        self.assertEqual([result.text for result in results], ['Hello'])
+        self.assertEqual(self.second.cache_info()['shared_hits'], 1)
+
+    def test_write_invalidates_shared_results(self):
+        list(self.first.filter(text='Hello'))
+
+        self.second.create(text='Hi')
+
+        self.assertEqual(list(self.second.filter(text='Hello')), [])
+
+    def test_write_invalidates_local_results_of_other_adapters(self):
+        list(self.first.filter(text='Hello'))
+
+        self.second.create(text='Hi')
+        list(self.first.filter(text='Hello'))
+
+        self.assertEqual(self.first.cache_info()['hits'], 0)
+
+    def test_cache_client_import_path(self):
+        adapter = CachedStorageAdapter(
+            cached_storage_adapter='chatterbot.storage.InMemoryStorageAdapter',
+            cache_client='chatterbot.storage.cached_storage.LocalCacheClient'
+        )
+
+        self.assertIsInstance(adapter.cache_client, LocalCacheClient)
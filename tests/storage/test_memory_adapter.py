@@ -0,0 +1,385 @@
+import os
+import tempfile
+from unittest import TestCase
+from datetime import datetime
+from pytz import UTC
+from chatterbot.conversation import Statement
+from chatterbot.storage import InMemoryStorageAdapter
+
+
+class InMemoryStorageAdapterTestCase(TestCase):
+
+    def setUp(self):
+        self.adapter = InMemoryStorageAdapter()
+
+
+class InMemoryStorageAdapterTests(InMemoryStorageAdapterTestCase):
+
+    def test_count_returns_zero(self):
+        self.assertEqual(self.adapter.count(), 0)
+
+    def test_count_returns_value(self):
+        self.adapter.create(text='Test statement one')
+        self.adapter.create(text='Test statement two')
+
+        self.assertEqual(self.adapter.count(), 2)
+
+    def test_create_returns_statement(self):
+        statement = self.adapter.create(text='Hello', in_response_to='Hi')
+
+        self.assertEqual(statement.id, 1)
+        self.assertEqual(statement.text, 'Hello')
+        self.assertEqual(statement.in_response_to, 'Hi')
+
+    def test_create_search_text(self):
+        statement = self.adapter.create(text='Hello', in_response_to='Hi')
+
+        self.assertEqual(statement.search_text, self.adapter.tagger.get_text_index_string('Hello'))
+        self.assertEqual(statement.search_in_response_to, self.adapter.tagger.get_text_index_string('Hi'))
+
+    def test_create_many_keeps_search_text(self):
+        self.adapter.create_many([
+            Statement(text='Hello', search_text='custom:hello', tags=['greeting', 'greeting'])
+        ])
+
+        statement = list(self.adapter.filter())[0]
+
+        self.assertEqual(statement.search_text, 'custom:hello')
+        self.assertEqual(statement.get_tags(), ['greeting'])
+
+    def test_create_many_keeps_created_at(self):
+        created_at = datetime(2020, 1, 2, 3, 4, 5, tzinfo=UTC)
+
+        self.adapter.create_many([
+            Statement(text='Hello', created_at=created_at)
+        ])
+
+        statement = list(self.adapter.filter())[0]
+
+        self.assertEqual(statement.created_at, created_at)
+
+    def test_strings_are_interned(self):
+        self.adapter.create_many([
+            Statement(text=''.join(['Hel', 'lo'])),
+            Statement(text=''.join(['He', 'llo'])),
+        ])
+
+        first, second = self.adapter.columns['text']
+
+        self.assertIs(first, second)
+
+    def test_update_adds_new_statement(self):
+        self.adapter.update(Statement(text='New statement'))
+
+        self.assertEqual(self.adapter.count(), 1)
+
+    def test_update_modifies_existing_statement(self):
+        statement = self.adapter.create(text='New statement')
+
+        statement.in_response_to = 'New response'
+        statement.add_tags('new')
+        self.adapter.update(statement)
+
+        results = list(self.adapter.filter(in_response_to='New response'))
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].get_tags(), ['new'])
+        self.assertEqual(self.adapter.count(), 1)
+
+    def test_remove(self):
+        self.adapter.create(text='Test statement one')
+        self.adapter.create(text='Test statement two')
+
+        self.adapter.remove('Test statement one')
+
+        self.assertEqual(self.adapter.count(), 1)
+        self.assertEqual(list(self.adapter.filter(text='Test statement one')), [])
+
+    def test_get_random_returns_statement(self):
+        self.adapter.create(text='New statement')
+
+        self.assertEqual(self.adapter.get_random().text, 'New statement')
+
+    def test_get_random_no_data(self):
+        with self.assertRaises(InMemoryStorageAdapter.EmptyDatabaseException):
+            self.adapter.get_random()
+
+    def test_get_random_after_remove(self):
+        self.adapter.create(text='Removed statement')
+        self.adapter.create(text='Kept statement')
+
+        self.adapter.remove('Removed statement')
+
+        for _ in range(10):
+            self.assertEqual(self.adapter.get_random().text, 'Kept statement')
+
+    def test_drop(self):
+        self.adapter.create(text='New statement', tags=['a'])
+
+        self.adapter.drop()
+
+        self.assertEqual(self.adapter.count(), 0)
+        self.assertEqual(list(self.adapter.filter(tags=['a'])), [])
+
+
+class InMemoryStorageAdapterFilterTests(InMemoryStorageAdapterTestCase):
+
+    def test_filter_text_no_matches(self):
+        self.adapter.create(text='Testing...')
+
+        self.assertEqual(list(self.adapter.filter(text='Howdy')), [])
+
+    def test_filter_text(self):
+        self.adapter.create(text='Testing...')
+        self.adapter.create(text='Howdy')
+
+        results = list(self.adapter.filter(text='Howdy'))
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].text, 'Howdy')
+
+    def test_filter_in_response_to_none(self):
+        self.adapter.create(text='A')
+        self.adapter.create(text='B', in_response_to='A')
+
+        results = list(self.adapter.filter(in_response_to=None))
+
+        self.assertEqual([result.text for result in results], ['A'])
+
+    def test_filter_multiple_indexed_fields(self):
+        self.adapter.create(text='A', conversation='first')
+        self.adapter.create(text='A', conversation='second')
+        self.adapter.create(text='B', conversation='second')
+
+        results = list(self.adapter.filter(text='A', conversation='second'))
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].id, 2)
+
+    def test_filter_id(self):
+        self.adapter.create(text='A')
+        self.adapter.create(text='B')
+
+        results = list(self.adapter.filter(id=2))
+
+        self.assertEqual([result.text for result in results], ['B'])
+
+    def test_filter_by_tags(self):
+        self.adapter.create(text='A', tags=['first'])
+        self.adapter.create(text='B', tags=['second'])
+        self.adapter.create(text='C', tags=['third'])
+
+        results = list(self.adapter.filter(tags=['first', 'second']))
+
+        self.assertEqual([result.text for result in results], ['A', 'B'])
+
+    def test_filter_by_tag_string(self):
+        self.adapter.create(text='A', tags=['first'])
+        self.adapter.create(text='B')
+
+        results = list(self.adapter.filter(tags='first'))
+
+        self.assertEqual([result.text for result in results], ['A'])
+
+    def test_filter_id_greater_than(self):
+        self.adapter.create(text='A')
+        statement = self.adapter.create(text='B')
+        self.adapter.create(text='C')
+
+        results = list(self.adapter.filter(id_greater_than=statement.id))
+
+        self.assertEqual([result.text for result in results], ['C'])
+
+    def test_filter_fields(self):
+        from chatterbot.conversation import StatementRecord
+
+        self.adapter.create(text='A', in_response_to='B', tags=['first'])
+
+        results = list(self.adapter.filter(fields=['id', 'text', 'in_response_to', 'tags']))
+
+        self.assertEqual(len(results), 1)
+        self.assertIsInstance(results[0], StatementRecord)
+        self.assertEqual(results[0].id, 1)
+        self.assertEqual(results[0].text, 'A')
+        self.assertEqual(results[0].in_response_to, 'B')
+        self.assertIsNone(results[0].tags)
+        self.assertIsNone(results[0].conversation)
+
+    def test_filter_page_size(self):
+        for index in range(5):
+            self.adapter.create(text='Statement {}'.format(index))
+
+        results = list(self.adapter.filter(page_size=2))
+
+        self.assertEqual(len(results), 5)
+
+    def test_exclude_text(self):
+        self.adapter.create(text='Hello!')
+        self.adapter.create(text='Hi everyone!')
+
+        results = list(self.adapter.filter(exclude_text=['Hello!']))
+
+        self.assertEqual([result.text for result in results], ['Hi everyone!'])
+
+    def test_exclude_text_words(self):
+        self.adapter.create(text='This is a good example.')
+        self.adapter.create(text='This is a bad example.')
+        self.adapter.create(text='This is a worse example.')
+
+        results = list(self.adapter.filter(exclude_text_words=['Bad', 'worse']))
+
+        self.assertEqual([result.text for result in results], ['This is a good example.'])
+
+    def test_persona_not_startswith(self):
+        self.adapter.create(text='Hello!', persona='bot:tester')
+        self.adapter.create(text='Hi everyone!', persona='user:person')
+
+        results = list(self.adapter.filter(persona_not_startswith='bot:'))
+
+        self.assertEqual([result.text for result in results], ['Hi everyone!'])
+
+    def test_search_text_contains(self):
+        self.adapter.create(text='Hello', search_text='hello')
+        self.adapter.create(text='Hi', search_text='hi')
+        self.adapter.create(text='White', search_text='white')
+
+        results = list(self.adapter.filter(search_text_contains='hi hello'))
+
+        self.assertEqual([result.text for result in results], ['Hello', 'Hi'])
+
+    def test_search_text_contains_and_search_in_response_to(self):
+        self.adapter.create(text='A', search_text='a', search_in_response_to='x')
+        self.adapter.create(text='B', search_text='a', search_in_response_to='y')
+
+        results = list(self.adapter.filter(search_text_contains='a', search_in_response_to='y'))
+
+        self.assertEqual([result.text for result in results], ['B'])
+
+    def test_order_by_text(self):
+        self.adapter.create(text='B')
+        self.adapter.create(text='A')
+
+        results = list(self.adapter.filter(order_by=['text']))
+
+        self.assertEqual([result.text for result in results], ['A', 'B'])
+
+    def test_order_by_created_at(self):
+        self.adapter.create(text='Newer', created_at=datetime(2020, 1, 2, tzinfo=UTC))
+        self.adapter.create(text='Older', created_at=datetime(2020, 1, 1, tzinfo=UTC))
+
+        results = list(self.adapter.filter(order_by=['created_at']))
+
+        self.assertEqual([result.text for result in results], ['Older', 'Newer'])
+
+
+class InMemoryStorageAdapterDeduplicationTests(TestCase):
+
+    def setUp(self):
+        self.adapter = InMemoryStorageAdapter(deduplicate_statements=True)
+
+    def test_create_duplicate(self):
+        self.adapter.create(text='Hello', in_response_to='Hi', tags=['a'])
+        statement = self.adapter.create(text='Hello', in_response_to='Hi', tags=['b'])
+
+        self.assertEqual(self.adapter.count(), 1)
+        self.assertEqual(statement.occurrences, 2)
+        self.assertEqual(statement.get_tags(), ['a', 'b'])
+        self.assertIsNotNone(statement.last_seen_at)
+
+    def test_create_many_duplicates(self):
+        self.adapter.create_many([
+            Statement(text='Hello', in_response_to='Hi'),
+            Statement(text='Hello', in_response_to='Hi'),
+            Statement(text='Hello', in_response_to='Hey'),
+        ])
+
+        self.assertEqual(self.adapter.count(), 2)
+        self.assertEqual(list(self.adapter.filter(in_response_to='Hi'))[0].occurrences, 2)
+
+    def test_concurrent_creates(self):
+        from threading import Thread
+
+        def create_statements():
+            for _ in range(50):
+                self.adapter.create(text='Hello', in_response_to='Hi')
+
+        threads = [Thread(target=create_statements) for _ in range(4)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.adapter.count(), 1)
+        self.assertEqual(list(self.adapter.filter())[0].occurrences, 200)
+
+    def test_create_keeps_latest_last_seen_at(self):
+        from datetime import datetime
+        from pytz import UTC
+
+        self.adapter.create(text='Hello', in_response_to='Hi', last_seen_at=datetime(2020, 2, 1, tzinfo=UTC))
+        statement = self.adapter.create(
+            text='Hello', in_response_to='Hi', last_seen_at=datetime(2020, 1, 1, tzinfo=UTC)
+        )
+
+        self.assertEqual(statement.last_seen_at, datetime(2020, 2, 1, tzinfo=UTC))
+
+    def test_compact(self):
+        self.adapter.deduplicate_statements = False
+
+        self.adapter.create(text='Hello', in_response_to='Hi', tags=['a'])
+        self.adapter.create(text='Hello', in_response_to='Hi', tags=['b'])
+        self.adapter.create(text='Hello', in_response_to='Hey')
+
+        removed_count = self.adapter.compact()
+
+        results = list(self.adapter.filter(in_response_to='Hi'))
+
+        self.assertEqual(removed_count, 1)
+        self.assertEqual(self.adapter.count(), 2)
+        self.assertEqual(results[0].occurrences, 2)
+        self.assertEqual(results[0].get_tags(), ['a', 'b'])
+
+
+class InMemoryStorageAdapterSnapshotTests(InMemoryStorageAdapterTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+        self.snapshot_path = os.path.join(self.directory.name, 'snapshot.json.gz')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_save_and_load_snapshot(self):
+        self.adapter.create(text='Hello', in_response_to='Hi', tags=['greeting'], occurrences=3)
+        self.adapter.create(text='Removed')
+        self.adapter.create(text='Goodbye', conversation='farewell')
+        self.adapter.remove('Removed')
+
+        self.adapter.save_snapshot(self.snapshot_path)
+
+        adapter = InMemoryStorageAdapter(snapshot_path=self.snapshot_path)
+
+        self.assertEqual(adapter.count(), 2)
+
+        statement = list(adapter.filter(tags=['greeting']))[0]
+
+        self.assertEqual(statement.text, 'Hello')
+        self.assertEqual(statement.in_response_to, 'Hi')
+        self.assertEqual(statement.occurrences, 3)
+        self.assertEqual(statement.search_text, self.adapter.tagger.get_text_index_string('Hello'))
+        self.assertEqual(len(list(adapter.filter(conversation='farewell'))), 1)
+
+    def test_snapshot_path_does_not_exist(self):
+        adapter = InMemoryStorageAdapter(snapshot_path=self.snapshot_path)
+
+        self.assertEqual(adapter.count(), 0)
+
+    def test_load_snapshot_version_mismatch(self):
+        self.adapter.SNAPSHOT_VERSION = 0
+        self.adapter.save_snapshot(self.snapshot_path)
+
+        with self.assertRaises(InMemoryStorageAdapter.SnapshotException):
+            InMemoryStorageAdapter(snapshot_path=self.snapshot_path)
@@ -0,0 +1,151 @@
+import os
+import json
+import tempfile
+from unittest import TestCase
+from datetime import datetime
+from pytz import UTC
+from chatterbot.conversation import Statement
+from chatterbot.storage import SQLStorageAdapter, migrate
+
+
+class MigrationTestCase(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+        self.source = SQLStorageAdapter(database_uri=None)
+        self.dest = SQLStorageAdapter(database_uri=None)
+
+    def tearDown(self):
+        self.source.drop()
+        self.dest.drop()
+        self.dest.engine.dispose()
+        self.directory.cleanup()
+
+    def get_path(self, file_name):
+        return os.path.join(self.directory.name, file_name)
+
+    def create_statements(self, count):
+        self.source.create_many([
+            Statement(
+                text='Statement {}'.format(index),
+                in_response_to='Statement {}'.format(index - 1) if index else None,
+                search_text='search {}'.format(index),
+                conversation='migration'
+            ) for index in range(count)
+        ])
+
+    def test_migrate(self):
+        self.create_statements(5)
+
+        migrated = migrate(self.source, self.dest, batch_size=2)
+
+        self.assertEqual(migrated, 5)
+        self.assertEqual(self.dest.count(), 5)
+
+    def test_migrate_keeps_existing_fields(self):
+        created_at = datetime(2020, 1, 2, 3, 4, 5, tzinfo=UTC)
+
+        self.source.create_many([
+            Statement(
+                text='Hello',
+                in_response_to='Hi',
+                search_text='custom:hello',
+                search_in_response_to='custom:hi',
+                tags=['greeting'],
+                created_at=created_at,
+                occurrences=3
+            )
+        ])
+
+        migrate(self.source, self.dest)
+
+        statement = list(self.dest.filter(text='Hello'))[0]
+
+        self.assertEqual(statement.search_text, 'custom:hello')
+        self.assertEqual(statement.search_in_response_to, 'custom:hi')
+        self.assertEqual(statement.get_tags(), ['greeting'])
+        self.assertEqual(statement.created_at.replace(tzinfo=UTC), created_at)
+        self.assertEqual(statement.occurrences, 3)
+
+    def test_migrate_preserves_order(self):
+        self.create_statements(5)
+
+        migrate(self.source, self.dest, batch_size=2)
+
+        texts = [statement.text for statement in self.dest.filter(order_by=['id'])]
+
+        self.assertEqual(texts, ['Statement {}'.format(index) for index in range(5)])
+
+    def test_migrate_writes_checkpoint(self):
+        self.create_statements(5)
+        checkpoint_path = self.get_path('checkpoint.json')
+
+        migrate(self.source, self.dest, batch_size=2, checkpoint_path=checkpoint_path)
+
+        with open(checkpoint_path, encoding='utf8') as checkpoint_file:
+            checkpoint = json.load(checkpoint_file)
+
+        last_id = list(self.source.filter(order_by=['id']))[-1].id
+
+        self.assertEqual(checkpoint, {'migrated': 5, 'last_id': last_id})
+
+    def test_migrate_resumes_after_last_id(self):
+        from unittest.mock import patch
+
+        self.create_statements(5)
+        checkpoint_path = self.get_path('checkpoint.json')
+
+        last_id = list(self.source.filter(order_by=['id']))[1].id
+
+        with open(checkpoint_path, 'w', encoding='utf8') as checkpoint_file:
+            json.dump({'migrated': 2, 'last_id': last_id}, checkpoint_file)
+
+        # The statements that were already copied are not read again
+        with patch.object(self.source, 'filter', wraps=self.source.filter) as source_filter:
+            migrated = migrate(self.source, self.dest, batch_size=2, checkpoint_path=checkpoint_path)
+
+        texts = [statement.text for statement in self.dest.filter(order_by=['id'])]
+
+        self.assertEqual(source_filter.call_args[1]['id_greater_than'], last_id)
+        self.assertEqual(migrated, 3)
+        self.assertEqual(texts, ['Statement 2', 'Statement 3', 'Statement 4'])
+
+    def test_migrate_resumes_from_checkpoint_without_last_id(self):
+        self.create_statements(5)
+        checkpoint_path = self.get_path('checkpoint.json')
+
+        with open(checkpoint_path, 'w', encoding='utf8') as checkpoint_file:
+            json.dump({'migrated': 2}, checkpoint_file)
+
+        migrated = migrate(self.source, self.dest, batch_size=2, checkpoint_path=checkpoint_path)
+
+        texts = [statement.text for statement in self.dest.filter(order_by=['id'])]
+
+        self.assertEqual(migrated, 3)
+        self.assertEqual(texts, ['Statement 2', 'Statement 3', 'Statement 4'])
+
+    def test_migrate_completed_checkpoint(self):
+        self.create_statements(3)
+        checkpoint_path = self.get_path('checkpoint.json')
+
+        migrate(self.source, self.dest, checkpoint_path=checkpoint_path)
+        migrated = migrate(self.source, self.dest, checkpoint_path=checkpoint_path)
+
+        self.assertEqual(migrated, 0)
+        self.assertEqual(self.dest.count(), 3)
+
+    def test_migrate_to_database_file(self):
+        self.create_statements(5)
+
+        dest = SQLStorageAdapter(database_uri='sqlite:///' + self.get_path('dest.sqlite3'))
+
+        try:
+            migrated = migrate(self.source, dest, batch_size=2)
+
+            self.assertTrue(dest.is_thread_safe)
+            self.assertEqual(migrated, 5)
+            self.assertEqual(dest.count(), 5)
+        finally:
+            dest.drop()
+            dest.engine.dispose()
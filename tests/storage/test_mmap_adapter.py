@@ -0,0 +1,167 @@
+import os
+import tempfile
+from unittest import TestCase
+from datetime import datetime
+from pytz import UTC
+from chatterbot.conversation import Statement
+from chatterbot.storage import InMemoryStorageAdapter, MmapStorageAdapter
+from chatterbot.storage.mmap_storage import write_mmap_file
+
+
+class MmapStorageAdapterTestCase(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.mmap_path = os.path.join(self.directory.name, 'statements.mmap')
+
+        source = InMemoryStorageAdapter()
+
+        source.create_many([
+            Statement(text='Hi there', conversation='greeting', search_text='hi there'),
+            Statement(
+                text='Hello, how are you?',
+                in_response_to='Hi there',
+                search_text='hello how',
+                search_in_response_to='hi there',
+                conversation='greeting',
+                tags=['greeting', 'question'],
+                occurrences=3
+            ),
+            Statement(
+                text='Ça va bien',
+                in_response_to='Hello, how are you?',
+                search_text='ça va',
+                search_in_response_to='hello how',
+                persona='bot:tester',
+                created_at=datetime(2020, 1, 2, tzinfo=UTC)
+            ),
+        ])
+
+        self.statement_count = write_mmap_file(self.mmap_path, source.filter())
+
+        self.adapter = MmapStorageAdapter(mmap_path=self.mmap_path)
+
+    def tearDown(self):
+        self.adapter.close()
+        self.directory.cleanup()
+
+
+class MmapStorageAdapterTests(MmapStorageAdapterTestCase):
+
+    def test_write_returns_count(self):
+        self.assertEqual(self.statement_count, 3)
+
+    def test_count(self):
+        self.assertEqual(self.adapter.count(), 3)
+
+    def test_mmap_path_required(self):
+        with self.assertRaises(MmapStorageAdapter.StatementFileException):
+            MmapStorageAdapter()
+
+    def test_not_a_statement_file(self):
+        file_path = os.path.join(self.directory.name, 'other.txt')
+
+        with open(file_path, 'wb') as other_file:
+            other_file.write(b'Not a statement file')
+
+        with self.assertRaises(MmapStorageAdapter.StatementFileException):
+            MmapStorageAdapter(mmap_path=file_path)
+
+    def test_statement_fields(self):
+        statement = list(self.adapter.filter(text='Hello, how are you?'))[0]
+
+        self.assertEqual(statement.id, 2)
+        self.assertEqual(statement.in_response_to, 'Hi there')
+        self.assertEqual(statement.search_text, 'hello how')
+        self.assertEqual(statement.search_in_response_to, 'hi there')
+        self.assertEqual(statement.conversation, 'greeting')
+        self.assertEqual(statement.get_tags(), ['greeting', 'question'])
+        self.assertEqual(statement.occurrences, 3)
+
+    def test_statement_created_at(self):
+        statement = list(self.adapter.filter(text='Ça va bien'))[0]
+
+        self.assertEqual(statement.created_at, datetime(2020, 1, 2, tzinfo=UTC))
+
+    def test_get_random(self):
+        statement = self.adapter.get_random()
+
+        self.assertIn(statement.text, ['Hi there', 'Hello, how are you?', 'Ça va bien'])
+
+    def test_get_random_no_data(self):
+        write_mmap_file(self.mmap_path, [])
+
+        adapter = MmapStorageAdapter(mmap_path=self.mmap_path)
+
+        with self.assertRaises(MmapStorageAdapter.EmptyDatabaseException):
+            adapter.get_random()
+
+        adapter.close()
+
+    def test_create_is_read_only(self):
+        with self.assertRaises(MmapStorageAdapter.AdapterMethodNotImplementedError):
+            self.adapter.create(text='New statement')
+
+    def test_create_many_is_read_only(self):
+        with self.assertRaises(MmapStorageAdapter.AdapterMethodNotImplementedError):
+            self.adapter.create_many([Statement(text='New statement')])
+
+    def test_remove_is_read_only(self):
+        with self.assertRaises(MmapStorageAdapter.AdapterMethodNotImplementedError):
+            self.adapter.remove('Hi there')
+
+
+class MmapStorageAdapterFilterTests(MmapStorageAdapterTestCase):
+
+    def test_filter_text_no_matches(self):
+        self.assertEqual(list(self.adapter.filter(text='Howdy')), [])
+
+    def test_filter_conversation(self):
+        results = list(self.adapter.filter(conversation='greeting'))
+
+        self.assertEqual([result.id for result in results], [1, 2])
+
+    def test_filter_search_in_response_to(self):
+        results = list(self.adapter.filter(search_in_response_to='hello how'))
+
+        self.assertEqual([result.text for result in results], ['Ça va bien'])
+
+    def test_filter_in_response_to(self):
+        results = list(self.adapter.filter(in_response_to='Hi there'))
+
+        self.assertEqual([result.text for result in results], ['Hello, how are you?'])
+
+    def test_filter_by_tags(self):
+        results = list(self.adapter.filter(tags=['question']))
+
+        self.assertEqual([result.text for result in results], ['Hello, how are you?'])
+
+    def test_search_text_contains(self):
+        results = list(self.adapter.filter(search_text_contains='hi va'))
+
+        self.assertEqual([result.text for result in results], ['Hi there', 'Ça va bien'])
+
+    def test_persona_not_startswith(self):
+        results = list(self.adapter.filter(persona_not_startswith='bot:'))
+
+        self.assertEqual(len(results), 2)
+
+    def test_exclude_text(self):
+        results = list(self.adapter.filter(exclude_text=['Hi there'], conversation='greeting'))
+
+        self.assertEqual([result.text for result in results], ['Hello, how are you?'])
+
+    def test_filter_fields(self):
+        results = list(self.adapter.filter(fields=['text', 'in_response_to'], text='Ça va bien'))
+
+        self.assertEqual(results[0].text, 'Ça va bien')
+        self.assertEqual(results[0].in_response_to, 'Hello, how are you?')
+        self.assertIsNone(results[0].search_text)
+
+    def test_order_by_text(self):
+        results = list(self.adapter.filter(order_by=['text']))
+
+        self.assertEqual(
+            [result.text for result in results],
+            ['Hello, how are you?', 'Hi there', 'Ça va bien']
+        )
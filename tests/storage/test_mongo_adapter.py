@@ -141,6 +141,16 @@ class MongoDatabaseAdapterTestCase(MongoAdapterTestCase):
 
         self.assertEqual(results, [])
 
+    def test_drop_recreates_indexes(self):
+        self.adapter.create(text='Hello')
+        self.adapter.drop()
+
+        indexes = self.adapter.statements.index_information()
+
+        self.assertEqual(self.adapter.count(), 0)
+        self.assertIn('search_tokens_1', indexes)
+        self.assertIn('text_1', indexes)
+
     def test_remove_response(self):
         text = "Sometimes you have to run before you can walk."
         self.adapter.create(text='', in_response_to=text)
@@ -319,6 +329,47 @@ class MongoAdapterFilterTestCase(MongoAdapterTestCase):
 
         self.assertEqual(len(results), 2)
 
+    def test_search_text_contains_whole_words(self):
+        self.adapter.create(text='White', search_text='white')
+        self.adapter.create(text='Hi everyone!', search_text='hi everyone')
+
+        results = list(self.adapter.filter(
+            search_text_contains='hi'
+        ))
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].text, 'Hi everyone!')
+
+    def test_create_sets_search_tokens(self):
+        self.adapter.create(text='Hi everyone!', search_text='hi everyone')
+
+        statement_data = self.adapter.statements.find_one({'text': 'Hi everyone!'})
+
+        self.assertEqual(statement_data['search_tokens'], ['hi', 'everyone'])
+
+    def test_add_missing_search_tokens(self):
+        self.adapter.statements.insert_one({
+            'text': 'Hi everyone!',
+            'search_text': 'hi everyone'
+        })
+
+        self.adapter.add_missing_search_tokens()
+
+        results = list(self.adapter.filter(
+            search_text_contains='everyone'
+        ))
+
+        self.assertEqual(len(results), 1)
+
+    def test_filter_id_greater_than(self):
+        self.adapter.create(text='A')
+        statement = self.adapter.create(text='B')
+        self.adapter.create(text='C')
+
+        results = list(self.adapter.filter(id_greater_than=str(statement.id)))
+
+        self.assertEqual([result.text for result in results], ['C'])
+
 
 class MongoOrderingTestCase(MongoAdapterTestCase):
     """
@@ -432,6 +483,21 @@ class StorageAdapterCreateTestCase(MongoAdapterTestCase):
         self.assertEqual(results[0].text, 'A')
         self.assertEqual(results[1].text, 'B')
 
+    def test_create_many_multiple_batches(self):
+        self.adapter.write_batch_size = 2
+
+        self.adapter.create_many([
+            Statement(text='A'),
+            Statement(text='B'),
+            Statement(text='C')
+        ])
+
+        self.adapter.write_batch_size = 1000
+
+        results = list(self.adapter.filter())
+
+        self.assertEqual(len(results), 3)
+
     def test_create_many_search_text(self):
         self.adapter.create_many([
             Statement(text='A', search_text='a'),
@@ -515,3 +581,162 @@ class StorageAdapterUpdateTestCase(MongoAdapterTestCase):
         self.assertEqual(len(statements), 1)
         self.assertEqual(len(statements[0].get_tags()), 1)
         self.assertEqual(statements[0].get_tags(), ['ab'])
+
+
+class MongoAdapterDeduplicationTestCase(MongoAdapterTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.adapter.deduplicate_statements = True
+
+    def tearDown(self):
+        self.adapter.deduplicate_statements = False
+        super().tearDown()
+
+    def test_create_duplicate(self):
+        self.adapter.create(text='Hi', in_response_to='Hello')
+        statement = self.adapter.create(text='Hi', in_response_to='Hello', tags=['greeting'])
+
+        self.assertEqual(self.adapter.count(), 1)
+        self.assertEqual(statement.occurrences, 2)
+        self.assertEqual(statement.get_tags(), ['greeting'])
+
+    def test_create_different_in_response_to(self):
+        self.adapter.create(text='Hi', in_response_to='Hello')
+        self.adapter.create(text='Hi')
+
+        self.assertEqual(self.adapter.count(), 2)
+
+    def test_create_many_duplicates(self):
+        self.adapter.create(text='Hi', in_response_to='Hello', tags=['a'])
+
+        self.adapter.create_many([
+            Statement(text='Hi', in_response_to='Hello', tags=['a', 'b']),
+            Statement(text='Hi', in_response_to='Hello'),
+            Statement(text='Hello')
+        ])
+
+        results = list(self.adapter.filter(text='Hi'))
+
+        self.assertEqual(self.adapter.count(), 2)
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].occurrences, 3)
+        self.assertEqual(sorted(results[0].get_tags()), ['a', 'b'])
+
+
+class MongoAdapterCompactTestCase(MongoAdapterTestCase):
+
+    def test_compact(self):
+        self.adapter.create(text='Hi', in_response_to='Hello', tags=['a'])
+        self.adapter.create(text='Hi', in_response_to='Hello', tags=['b'])
+        self.adapter.create(text='Hi', in_response_to='Hello')
+        self.adapter.create(text='Hi')
+
+        removed_count = self.adapter.compact()
+
+        results = list(self.adapter.filter(text='Hi', in_response_to='Hello'))
+
+        self.assertEqual(removed_count, 2)
+        self.assertEqual(self.adapter.count(), 2)
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].occurrences, 3)
+        self.assertEqual(sorted(results[0].get_tags()), ['a', 'b'])
+
+
+class MongoAdapterUniqueStatementTestCase(MongoAdapterTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.deduplicating_adapter = MongoDatabaseAdapter(
+            database_uri='mongodb://localhost:27017/chatterbot_test_database',
+            deduplicate_statements=True
+        )
+
+    def tearDown(self):
+        self.deduplicating_adapter.drop()
+        super().tearDown()
+
+    def has_unique_statement_index(self):
+        indexes = self.deduplicating_adapter.statements.index_information()
+        index = indexes.get(MongoDatabaseAdapter.UNIQUE_STATEMENT_INDEX_NAME, {})
+
+        return bool(index.get('unique'))
+
+    def test_unique_statement_index(self):
+        self.assertTrue(self.has_unique_statement_index())
+
+    def test_unique_statement_index_after_drop(self):
+        self.deduplicating_adapter.drop()
+
+        self.assertTrue(self.has_unique_statement_index())
+
+    def test_create_retries_duplicate_key_error(self):
+        from unittest.mock import patch
+        from pymongo.errors import DuplicateKeyError
+
+        find_one_and_update = self.deduplicating_adapter.statements.find_one_and_update
+        calls = []
+
+        def concurrent_insert(*args, **kwargs):
+            calls.append(args)
+
+            if len(calls) == 1:
+                # Another write inserts the statement first
+                self.deduplicating_adapter.statements.insert_one({
+                    'text': 'Hi', 'in_response_to': 'Hello', 'occurrences': 1, 'tags': []
+                })
+                raise DuplicateKeyError('E11000 duplicate key error')
+
+            return find_one_and_update(*args, **kwargs)
+
+        with patch.object(self.deduplicating_adapter.statements, 'find_one_and_update', concurrent_insert):
+            statement = self.deduplicating_adapter.create(text='Hi', in_response_to='Hello')
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(statement.occurrences, 2)
+        self.assertEqual(self.deduplicating_adapter.count(), 1)
+
+    def test_create_many_retries_duplicate_key_error(self):
+        from unittest.mock import patch
+        from pymongo.errors import BulkWriteError
+
+        bulk_write = self.deduplicating_adapter.statements.bulk_write
+        calls = []
+
+        def concurrent_insert(requests, **kwargs):
+            calls.append(requests)
+
+            if len(calls) == 1:
+                bulk_write(requests[1:], **kwargs)
+                self.deduplicating_adapter.statements.insert_one({
+                    'text': 'Hi', 'in_response_to': 'Hello', 'occurrences': 1, 'tags': []
+                })
+                raise BulkWriteError({'writeErrors': [{'index': 0, 'code': 11000}]})
+
+            return bulk_write(requests, **kwargs)
+
+        with patch.object(self.deduplicating_adapter.statements, 'bulk_write', concurrent_insert):
+            self.deduplicating_adapter.create_many([
+                Statement(text='Hi', in_response_to='Hello'),
+                Statement(text='Hello')
+            ])
+
+        results = list(self.deduplicating_adapter.filter(text='Hi'))
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(len(calls[1]), 1)
+        self.assertEqual(self.deduplicating_adapter.count(), 2)
+        self.assertEqual(results[0].occurrences, 2)
+
+    def test_compact_creates_unique_statement_index(self):
+        self.deduplicating_adapter.statements.drop_index(MongoDatabaseAdapter.UNIQUE_STATEMENT_INDEX_NAME)
+
+        self.deduplicating_adapter.statements.insert_many([
+            {'text': 'Hi', 'in_response_to': 'Hello', 'occurrences': 1, 'tags': []},
+            {'text': 'Hi', 'in_response_to': 'Hello', 'occurrences': 1, 'tags': []}
+        ])
+
+        removed_count = self.deduplicating_adapter.compact()
+
+        self.assertEqual(removed_count, 1)
+        self.assertTrue(self.has_unique_statement_index())
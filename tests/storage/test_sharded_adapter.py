@@ -0,0 +1,312 @@
+import os
+import tempfile
+from unittest import TestCase
+from datetime import datetime
+from pytz import UTC
+from chatterbot.conversation import Statement
+from chatterbot.storage import ShardedStorageAdapter, SQLStorageAdapter
+
+
+class ShardedStorageAdapterTestCase(TestCase):
+
+    shard_count = 3
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+        self.adapter = ShardedStorageAdapter(**self.get_kwargs())
+
+    def get_kwargs(self):
+        return {
+            'shards': [
+                {
+                    'import_path': 'chatterbot.storage.SQLStorageAdapter',
+                    'database_uri': 'sqlite:///' + os.path.join(
+                        self.directory.name, 'shard{}.sqlite3'.format(index)
+                    )
+                } for index in range(self.shard_count)
+            ]
+        }
+
+    def tearDown(self):
+        self.adapter.drop()
+
+        for shard in self.adapter.shards:
+            shard.engine.dispose()
+
+        self.directory.cleanup()
+
+    def create_conversations(self):
+        statements = []
+
+        for index in range(6):
+            conversation = 'conversation {}'.format(index)
+
+            statements.append(Statement(text='Hello', conversation=conversation))
+            statements.append(Statement(
+                text='Reply {}'.format(index),
+                in_response_to='Hello',
+                conversation=conversation
+            ))
+
+        self.adapter.create_many(statements)
+
+    def get_shard_counts(self):
+        return [shard.count() for shard in self.adapter.shards]
+
+
+class ShardedStorageAdapterTests(ShardedStorageAdapterTestCase):
+
+    def test_shards_are_created(self):
+        self.assertEqual(len(self.adapter.shards), 3)
+
+        for shard in self.adapter.shards:
+            self.assertIsInstance(shard, SQLStorageAdapter)
+
+    def test_shards_required(self):
+        with self.assertRaises(ShardedStorageAdapter.ShardConfigurationException):
+            ShardedStorageAdapter()
+
+    def test_invalid_shard_key(self):
+        with self.assertRaises(ShardedStorageAdapter.ShardConfigurationException):
+            ShardedStorageAdapter(shard_key='persona', **self.get_kwargs())
+
+    def test_shard_index_is_stable(self):
+        self.assertEqual(
+            self.adapter.get_shard_index(text='Hello'),
+            self.adapter.get_shard_index(text='Hello')
+        )
+
+    def test_create_many_routes_by_text(self):
+        self.create_conversations()
+
+        for index in range(6):
+            text = 'Reply {}'.format(index)
+            shard = self.adapter.shards[self.adapter.get_shard_index(text=text)]
+
+            self.assertEqual(len(list(shard.filter(text=text))), 1)
+
+    def test_trained_statements_are_spread(self):
+        self.adapter.create_many([
+            Statement(text='Statement {}'.format(index), conversation='training') for index in range(20)
+        ])
+
+        self.assertEqual(len([count for count in self.get_shard_counts() if count]), 3)
+
+    def test_count(self):
+        self.create_conversations()
+
+        self.assertEqual(self.adapter.count(), 12)
+
+    def test_create_returns_shard_id(self):
+        statement = self.adapter.create(text='Hello', conversation='conversation 1')
+
+        statement_id, shard_index = self.adapter.decode_id(statement.id)
+
+        self.assertEqual(shard_index, self.adapter.get_shard_index(text='Hello'))
+        self.assertEqual(list(self.adapter.filter(id=statement.id))[0].text, 'Hello')
+
+    def test_filter_ids_are_unique(self):
+        self.create_conversations()
+
+        ids = [statement.id for statement in self.adapter.filter()]
+
+        self.assertEqual(len(set(ids)), 12)
+
+    def test_filter_id_greater_than(self):
+        self.create_conversations()
+
+        ids = sorted(statement.id for statement in self.adapter.filter())
+
+        results = list(self.adapter.filter(id_greater_than=ids[5], order_by=['id']))
+
+        self.assertEqual([result.id for result in results], ids[6:])
+
+    def test_filter_all_shards(self):
+        self.create_conversations()
+
+        results = list(self.adapter.filter(in_response_to='Hello'))
+
+        self.assertEqual(len(results), 6)
+
+    def test_filter_search_text_contains(self):
+        self.create_conversations()
+
+        results = list(self.adapter.filter(
+            search_text_contains=self.adapter.tagger.get_text_index_string('Hello')
+        ))
+
+        self.assertEqual(len(results), 6)
+
+    def test_filter_search_text_contains_pages(self):
+        self.adapter.create_many([
+            Statement(text='Hello {}'.format(index), search_text='hello') for index in range(30)
+        ])
+
+        results = list(self.adapter.filter(search_text_contains='hello', page_size=4))
+
+        self.assertEqual(len(results), 30)
+
+    def test_filter_search_text_contains_stops_reading(self):
+        self.adapter.create_many([
+            Statement(text='Hello {}'.format(index), search_text='hello') for index in range(30)
+        ])
+
+        results = self.adapter.filter(search_text_contains='hello', page_size=2)
+        next(results)
+        results.close()
+
+        # The shared pool of threads is free for the next filter
+        self.adapter.executor.submit(lambda: None).result(timeout=5)
+
+        self.assertEqual(len(list(self.adapter.filter(search_text_contains='hello'))), 30)
+
+    def test_filter_search_text_contains_error(self):
+        def filter_error(**kwargs):
+            raise ValueError()
+
+        self.adapter.shards[1].filter = filter_error
+
+        with self.assertRaises(ValueError):
+            list(self.adapter.filter(search_text_contains='hello'))
+
+    def test_filter_search_text_contains_in_unit_of_work(self):
+        with self.adapter.unit_of_work():
+            self.adapter.create_many([
+                Statement(text='Hello {}'.format(index), search_text='hello') for index in range(6)
+            ])
+
+            results = list(self.adapter.filter(search_text_contains='hello'))
+
+        self.assertEqual(len(results), 6)
+
+    def test_filter_order_by(self):
+        for index in range(6):
+            self.adapter.create(
+                text='Statement {}'.format(index),
+                conversation='conversation {}'.format(index),
+                created_at=datetime(2020, 1, 6 - index, tzinfo=UTC)
+            )
+
+        results = list(self.adapter.filter(order_by=['created_at']))
+
+        self.assertEqual(
+            [result.text for result in results],
+            ['Statement {}'.format(index) for index in reversed(range(6))]
+        )
+
+    def test_update(self):
+        statement = self.adapter.create(text='Hello', conversation='conversation 1')
+
+        statement.in_response_to = 'Hi'
+        self.adapter.update(statement)
+
+        results = list(self.adapter.filter(in_response_to='Hi'))
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].id, statement.id)
+        self.assertEqual(self.adapter.count(), 1)
+
+    def test_get_random(self):
+        self.create_conversations()
+
+        statement = self.adapter.get_random()
+
+        self.assertEqual(list(self.adapter.filter(id=statement.id))[0].text, statement.text)
+
+    def test_get_random_no_data(self):
+        with self.assertRaises(ShardedStorageAdapter.EmptyDatabaseException):
+            self.adapter.get_random()
+
+    def test_remove(self):
+        self.create_conversations()
+
+        self.adapter.remove('Reply 1')
+
+        self.assertEqual(self.adapter.count(), 11)
+
+    def test_drop(self):
+        self.create_conversations()
+
+        self.adapter.drop()
+
+        self.assertEqual(self.adapter.count(), 0)
+
+
+class ConversationShardedStorageAdapterTests(ShardedStorageAdapterTestCase):
+
+    def get_kwargs(self):
+        kwargs = super().get_kwargs()
+        kwargs['shard_key'] = 'conversation'
+        return kwargs
+
+    def test_create_many_routes_by_conversation(self):
+        self.create_conversations()
+
+        for index in range(6):
+            conversation = 'conversation {}'.format(index)
+            shard = self.adapter.shards[self.adapter.get_shard_index(conversation)]
+
+            self.assertEqual(len(list(shard.filter(conversation=conversation))), 2)
+
+        self.assertGreater(len([count for count in self.get_shard_counts() if count]), 1)
+
+    def test_filter_conversation_uses_one_shard(self):
+        self.create_conversations()
+
+        shard_index = self.adapter.get_shard_index('conversation 2')
+
+        for index, shard in enumerate(self.adapter.shards):
+            if index != shard_index:
+                shard.filter = None
+
+        results = list(self.adapter.filter(conversation='conversation 2'))
+
+        self.assertEqual(len(results), 2)
+
+
+class TagShardedStorageAdapterTests(ShardedStorageAdapterTestCase):
+
+    def get_kwargs(self):
+        kwargs = super().get_kwargs()
+        kwargs['shard_key'] = 'tags'
+        return kwargs
+
+    def test_create_routes_by_tag(self):
+        for tag in ['greeting', 'fact', 'question', 'weather']:
+            self.adapter.create(text='Statement', tags=[tag], conversation='same')
+
+        for tag in ['greeting', 'fact', 'question', 'weather']:
+            shard = self.adapter.shards[self.adapter.get_shard_index(tags=[tag])]
+
+            self.assertEqual(len(list(shard.filter(tags=[tag]))), 1)
+
+    def test_filter_conversation_uses_all_shards(self):
+        for tag in ['greeting', 'fact', 'question', 'weather']:
+            self.adapter.create(text='Statement', tags=[tag], conversation='same')
+
+        self.assertEqual(len(list(self.adapter.filter(conversation='same'))), 4)
+
+
+class InMemoryShardedStorageAdapterTests(TestCase):
+
+    def setUp(self):
+        self.adapter = ShardedStorageAdapter(shards=[
+            {
+                'import_path': 'chatterbot.storage.SQLStorageAdapter',
+                'database_uri': None
+            } for index in range(3)
+        ])
+
+    def test_is_not_thread_safe(self):
+        self.assertFalse(self.adapter.is_thread_safe)
+        self.assertIsNone(self.adapter.executor)
+
+    def test_filter_search_text_contains(self):
+        self.adapter.create_many([
+            Statement(text='Hello {}'.format(index), search_text='hello') for index in range(30)
+        ])
+
+        results = list(self.adapter.filter(search_text_contains='hello', page_size=4))
+
+        self.assertEqual(len(results), 30)
@@ -104,6 +104,31 @@ class SQLStorageAdapterTests(SQLStorageAdapterTestCase):
         with self.assertRaises(StorageAdapter.EmptyDatabaseException):
             self.adapter.get_random()
 
+    def test_get_random_after_remove(self):
+        self.adapter.create(text="A")
+        self.adapter.create(text="B")
+        self.adapter.create(text="C")
+        self.adapter.remove("A")
+        self.adapter.remove("C")
+
+        random_statement = self.adapter.get_random()
+        self.assertEqual(random_statement.text, "B")
+
+    def test_get_random_returns_statement_after_gap(self):
+        from unittest.mock import patch
+
+        self.adapter.create(text="A")
+        self.adapter.create(text="B")
+        self.adapter.create(text="C")
+        removed_id = next(self.adapter.filter(text="B")).id
+        self.adapter.remove("B")
+
+        # A random id inside the gap selects the statement that follows it
+        with patch('random.randint', return_value=removed_id):
+            random_statement = self.adapter.get_random()
+
+        self.assertEqual(random_statement.text, "C")
+
     def test_remove(self):
         text = "Sometimes you have to run before you can walk."
         self.adapter.create(text=text)
@@ -112,6 +137,335 @@ class SQLStorageAdapterTests(SQLStorageAdapterTestCase):
 
         self.assertEqual(list(results), [])
 
+    def test_remove_missing_statement(self):
+        self.adapter.create(text='Hello')
+        self.adapter.remove('Goodbye')
+
+        self.assertEqual(self.adapter.count(), 1)
+
+
+class SQLStorageAdapterUnitOfWorkTests(SQLStorageAdapterTestCase):
+
+    def test_unit_of_work_uses_one_connection(self):
+        from sqlalchemy import event
+
+        checkouts = []
+
+        def on_checkout(*args):
+            checkouts.append(args)
+
+        event.listen(self.adapter.engine, 'checkout', on_checkout)
+
+        with self.adapter.unit_of_work():
+            self.adapter.create(text='A')
+            list(self.adapter.filter(text='A'))
+            self.adapter.count()
+            self.adapter.get_random()
+
+        event.remove(self.adapter.engine, 'checkout', on_checkout)
+
+        self.assertEqual(len(checkouts), 1)
+        self.assertEqual(self.adapter.count(), 1)
+
+    def test_unit_of_work_rolls_back_on_error(self):
+        with self.assertRaises(ValueError):
+            with self.adapter.unit_of_work():
+                self.adapter.create(text='A')
+                raise ValueError()
+
+        self.assertEqual(self.adapter.count(), 0)
+
+    def test_pool_options(self):
+        adapter = SQLStorageAdapter(database_uri=None, pool_pre_ping=True)
+        self.assertTrue(adapter.engine.pool._pre_ping)
+
+
+class SQLStorageAdapterTagCacheTests(SQLStorageAdapterTestCase):
+
+    def test_create_caches_tag_ids(self):
+        self.adapter.create(text='A', tags=['first', 'letter'])
+
+        self.assertEqual(
+            sorted(self.adapter.tag_ids.keys()), ['first', 'letter']
+        )
+
+    def test_drop_clears_tag_ids(self):
+        self.adapter.create(text='A', tags=['letter'])
+        self.adapter.drop()
+
+        self.assertEqual(self.adapter.tag_ids, {})
+
+    def test_tags_after_drop(self):
+        self.adapter.create(text='A', tags=['letter'])
+        self.adapter.drop()
+        self.adapter.create(text='B', tags=['letter'])
+
+        results = list(self.adapter.filter(tags=['letter']))
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].text, 'B')
+        self.assertEqual(results[0].get_tags(), ['letter'])
+
+    def test_existing_tag_is_reused(self):
+        self.adapter.create(text='A', tags=['letter'])
+        self.adapter.tag_ids.clear()
+        self.adapter.create(text='B', tags=['letter'])
+
+        results = list(self.adapter.filter(tags=['letter']))
+
+        self.assertEqual(len(results), 2)
+
+
+class SQLStorageAdapterDeduplicationTests(SQLStorageAdapterTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.adapter = SQLStorageAdapter(database_uri=None, deduplicate_statements=True)
+
+    def test_create_duplicate(self):
+        self.adapter.create(text='Hi', in_response_to='Hello')
+        statement = self.adapter.create(text='Hi', in_response_to='Hello', tags=['greeting'])
+
+        self.assertEqual(self.adapter.count(), 1)
+        self.assertEqual(statement.occurrences, 2)
+        self.assertEqual(statement.get_tags(), ['greeting'])
+        self.assertIsNotNone(statement.last_seen_at)
+
+    def test_create_different_in_response_to(self):
+        self.adapter.create(text='Hi', in_response_to='Hello')
+        self.adapter.create(text='Hi')
+        self.adapter.create(text='Hi')
+
+        results = list(self.adapter.filter(text='Hi', in_response_to=None))
+
+        self.assertEqual(self.adapter.count(), 2)
+        self.assertEqual(results[0].occurrences, 2)
+
+    def test_create_many_duplicates(self):
+        self.adapter.create(text='Hi', in_response_to='Hello', tags=['a'])
+
+        self.adapter.create_many([
+            Statement(text='Hi', in_response_to='Hello', tags=['a', 'b']),
+            Statement(text='Hi', in_response_to='Hello'),
+            Statement(text='Hello')
+        ])
+
+        results = list(self.adapter.filter(text='Hi'))
+
+        self.assertEqual(self.adapter.count(), 2)
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].occurrences, 3)
+        self.assertEqual(sorted(results[0].get_tags()), ['a', 'b'])
+
+    def test_most_frequent_response(self):
+        from chatterbot.response_selection import get_most_frequent_response
+
+        self.adapter.create(text='Hi', in_response_to='Hello')
+        self.adapter.create(text='Hi there', in_response_to='Hello')
+        self.adapter.create(text='Hi there', in_response_to='Hello')
+
+        response = get_most_frequent_response(
+            Statement(text='Hello'),
+            list(self.adapter.filter(in_response_to='Hello', order_by=['id'])),
+            self.adapter
+        )
+
+        self.assertEqual(response.text, 'Hi there')
+
+
+    def test_unique_statement_index(self):
+        self.assertTrue(self.adapter.has_unique_statements)
+        self.assertTrue(self.adapter.has_unique_statement_index())
+
+    def test_create_keeps_latest_last_seen_at(self):
+        from datetime import datetime
+        from pytz import UTC
+
+        self.adapter.create(text='Hi', in_response_to='Hello', last_seen_at=datetime(2020, 2, 1, tzinfo=UTC))
+        statement = self.adapter.create(
+            text='Hi', in_response_to='Hello', last_seen_at=datetime(2020, 1, 1, tzinfo=UTC)
+        )
+
+        self.assertEqual(statement.last_seen_at.replace(tzinfo=None), datetime(2020, 2, 1))
+
+    def test_create_many_new_statements_with_tags(self):
+        self.adapter.create_many([
+            Statement(text='Hi', in_response_to='Hello', tags=['greeting']),
+            Statement(text='Hello', conversation='test')
+        ])
+
+        results = list(self.adapter.filter(order_by=['id']))
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0].occurrences, 1)
+        self.assertEqual(results[0].get_tags(), ['greeting'])
+        self.assertEqual(results[1].conversation, 'test')
+        self.assertIsNotNone(results[1].created_at)
+
+
+class SQLStorageAdapterConcurrentDeduplicationTests(TestCase):
+
+    def setUp(self):
+        import os
+        import tempfile
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.database_uri = 'sqlite:///' + os.path.join(self.directory.name, 'database.sqlite3')
+
+        self.adapters = [
+            SQLStorageAdapter(database_uri=self.database_uri, deduplicate_statements=True)
+            for _ in range(4)
+        ]
+
+    def tearDown(self):
+        for adapter in self.adapters:
+            adapter.engine.dispose()
+
+        self.directory.cleanup()
+
+    def test_unique_statement_index_is_found_again(self):
+        self.assertTrue(all(adapter.has_unique_statements for adapter in self.adapters))
+
+    def test_concurrent_creates(self):
+        from threading import Thread
+
+        def create_statements(adapter):
+            for _ in range(5):
+                adapter.create(text='Hi', in_response_to='Hello')
+
+        threads = [Thread(target=create_statements, args=(adapter, )) for adapter in self.adapters]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        results = list(self.adapters[0].filter())
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].occurrences, 20)
+
+    def test_duplicate_is_rejected(self):
+        from sqlalchemy.exc import IntegrityError
+
+        adapter = SQLStorageAdapter(database_uri=self.database_uri)
+        adapter.create(text='Hi')
+
+        with self.assertRaises(IntegrityError):
+            adapter.create(text='Hi')
+
+        adapter.engine.dispose()
+
+
+class SQLStorageAdapterCompactTests(SQLStorageAdapterTestCase):
+
+    def test_compact(self):
+        self.adapter.create(text='Hi', in_response_to='Hello', tags=['a'])
+        self.adapter.create(text='Hi', in_response_to='Hello', tags=['b'])
+        self.adapter.create(text='Hi', in_response_to='Hello', tags=['a'])
+        self.adapter.create(text='Hi')
+
+        removed_count = self.adapter.compact()
+
+        results = list(self.adapter.filter(text='Hi', in_response_to='Hello'))
+
+        self.assertEqual(removed_count, 2)
+        self.assertEqual(self.adapter.count(), 2)
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].occurrences, 3)
+        self.assertEqual(sorted(results[0].get_tags()), ['a', 'b'])
+
+    def test_compact_without_duplicates(self):
+        self.adapter.create(text='Hi')
+
+        self.assertEqual(self.adapter.compact(), 0)
+        self.assertEqual(self.adapter.count(), 1)
+
+    def test_compact_creates_unique_statement_index(self):
+        adapter = SQLStorageAdapter(database_uri='sqlite://')
+        adapter.create(text='Hi', in_response_to='Hello')
+        adapter.create(text='Hi', in_response_to='Hello')
+
+        adapter.deduplicate_statements = True
+
+        self.assertFalse(adapter.has_unique_statement_index())
+
+        adapter.compact()
+
+        self.assertTrue(adapter.has_unique_statements)
+        self.assertTrue(adapter.has_unique_statement_index())
+
+        adapter.create(text='Hi', in_response_to='Hello')
+
+        self.assertEqual(adapter.count(), 1)
+        self.assertEqual(list(adapter.filter())[0].occurrences, 3)
+
+    def test_schema_version(self):
+        from chatterbot.ext.sqlalchemy_app.models import SCHEMA_VERSION
+
+        self.assertEqual(self.adapter.get_schema_version(), SCHEMA_VERSION)
+
+    def test_current_database_is_not_upgraded(self):
+        import os
+        import tempfile
+        from unittest.mock import patch
+
+        with tempfile.TemporaryDirectory() as directory:
+            database_uri = 'sqlite:///' + os.path.join(directory, 'database.sqlite3')
+
+            SQLStorageAdapter(database_uri=database_uri).engine.dispose()
+
+            with patch.object(SQLStorageAdapter, 'upgrade_database') as upgrade_database:
+                SQLStorageAdapter(database_uri=database_uri).engine.dispose()
+
+        upgrade_database.assert_not_called()
+
+    def test_upgrade_database(self):
+        import os
+        import sqlite3
+        import tempfile
+        from sqlalchemy import inspect
+        from chatterbot.ext.sqlalchemy_app.models import SCHEMA_VERSION
+
+        with tempfile.TemporaryDirectory() as directory:
+            database_path = os.path.join(directory, 'database.sqlite3')
+
+            connection = sqlite3.connect(database_path)
+            connection.executescript(
+                "CREATE TABLE tag (id INTEGER PRIMARY KEY, name VARCHAR(50) UNIQUE);"
+                "CREATE TABLE tag_association (tag_id INTEGER, statement_id INTEGER);"
+                "CREATE TABLE statement ("
+                "id INTEGER PRIMARY KEY, text VARCHAR(255), "
+                "search_text VARCHAR(255) NOT NULL DEFAULT '', "
+                "conversation VARCHAR(32) NOT NULL DEFAULT '', "
+                "created_at DATETIME DEFAULT CURRENT_TIMESTAMP, "
+                "in_response_to VARCHAR(255), "
+                "search_in_response_to VARCHAR(255) NOT NULL DEFAULT '', "
+                "persona VARCHAR(50) NOT NULL DEFAULT '');"
+                "INSERT INTO statement (text) VALUES ('Hi');"
+            )
+            connection.close()
+
+            adapter = SQLStorageAdapter(database_uri='sqlite:///' + database_path)
+            adapter.create(text='Hello', in_response_to='Hi')
+
+            results = list(adapter.filter(order_by=['id']))
+
+            tag_association_index_names = [
+                index['name'] for index in inspect(adapter.engine).get_indexes('tag_association')
+            ]
+
+            schema_version = adapter.get_schema_version()
+
+            adapter.engine.dispose()
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0].occurrences, 1)
+        self.assertEqual(results[1].occurrences, 1)
+        self.assertIn('ix_tag_association_tag_id_statement_id', tag_association_index_names)
+        self.assertEqual(schema_version, SCHEMA_VERSION)
+
 
 class SQLStorageAdapterFilterTests(SQLStorageAdapterTestCase):
 
@@ -196,6 +550,66 @@ class SQLStorageAdapterFilterTests(SQLStorageAdapterTestCase):
         self.assertIn("Hi everyone!", results_text_list)
         self.assertIn("The air contains Oxygen.", results_text_list)
 
+    def test_filter_returns_all_tags(self):
+        self.adapter.create(text="Hello!", tags=["greeting", "salutation"])
+        self.adapter.create(text="Hi everyone!", tags=["greeting", "exclamation"])
+
+        results = list(self.adapter.filter(tags=["exclamation"], page_size=1))
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(
+            sorted(results[0].get_tags()), ["exclamation", "greeting"]
+        )
+
+    def test_filter_statement_with_several_matching_tags(self):
+        self.adapter.create(text="Hello!", tags=["greeting", "salutation"])
+
+        results = list(self.adapter.filter(
+            tags=["greeting", "salutation"], fields=['text']
+        ))
+
+        self.assertEqual([result.text for result in results], ["Hello!"])
+
+    def test_filter_tags_and_search_text(self):
+        self.adapter.create(text="Hello!", search_text="hello", tags=["greeting"])
+        self.adapter.create(text="Hello there", search_text="hello there", tags=["fact"])
+
+        results = list(self.adapter.filter(tags=["greeting"], search_text_contains="hello"))
+
+        self.assertEqual([result.text for result in results], ["Hello!"])
+
+    def test_filter_id_greater_than(self):
+        self.adapter.create(text='A')
+        statement = self.adapter.create(text='B')
+        self.adapter.create(text='C')
+
+        results = list(self.adapter.filter(id_greater_than=statement.id))
+
+        self.assertEqual([result.text for result in results], ['C'])
+
+    def test_filter_fields(self):
+        from chatterbot.conversation import StatementRecord
+
+        self.adapter.create(text='Hello', in_response_to='Hi')
+
+        results = list(self.adapter.filter(fields=['id', 'text', 'in_response_to']))
+
+        self.assertEqual(len(results), 1)
+        self.assertIsInstance(results[0], StatementRecord)
+        self.assertIsNotNone(results[0].id)
+        self.assertEqual(results[0].text, 'Hello')
+        self.assertEqual(results[0].in_response_to, 'Hi')
+        self.assertIsNone(results[0].conversation)
+
+    def test_filter_fields_by_tag(self):
+        self.adapter.create(text='Hello', tags=['greeting'])
+        self.adapter.create(text='The air contains Oxygen.', tags=['fact'])
+
+        results = list(self.adapter.filter(tags=['greeting'], fields=['text']))
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].text, 'Hello')
+
     def test_filter_page_size(self):
         self.adapter.create(text='A')
         self.adapter.create(text='B')
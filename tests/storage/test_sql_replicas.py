@@ -0,0 +1,133 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from chatterbot.storage.sql_storage import SQLStorageAdapter
+
+
+class SQLReadReplicaTests(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+        primary_path = self.get_path('primary.sqlite3')
+
+        primary = SQLStorageAdapter(database_uri='sqlite:///' + primary_path)
+        primary.create(text='Hello')
+        primary.engine.dispose()
+
+        # Each replica is a copy of the primary database file
+        replica_paths = []
+
+        for index in range(2):
+            replica_path = self.get_path('replica{}.sqlite3'.format(index))
+            shutil.copy(primary_path, replica_path)
+            replica_paths.append(replica_path)
+
+        self.adapter = SQLStorageAdapter(
+            database_uri='sqlite:///' + primary_path,
+            read_database_uris=['sqlite:///' + replica_path for replica_path in replica_paths]
+        )
+
+    def tearDown(self):
+        self.adapter.engine.dispose()
+
+        for read_engine in self.adapter.read_engines:
+            read_engine.dispose()
+
+        self.directory.cleanup()
+
+    def get_path(self, file_name):
+        return os.path.join(self.directory.name, file_name)
+
+    def get_replica_texts(self, replica_index):
+        session = self.adapter.ReadSessions[replica_index]()
+        Statement = self.adapter.get_model('statement')
+        texts = [statement.text for statement in session.query(Statement)]
+        session.close()
+        return texts
+
+    def test_writes_use_primary(self):
+        self.adapter.create(text='Hi')
+
+        self.assertEqual(self.get_replica_texts(0), ['Hello'])
+        self.assertEqual(self.get_replica_texts(1), ['Hello'])
+
+        session = self.adapter.get_session()
+        self.assertEqual(session.query(self.adapter.get_model('statement')).count(), 2)
+        self.adapter._session_close(session)
+
+    def test_reads_use_replicas(self):
+        self.adapter.create(text='Hi')
+
+        # The replicas are copies made before the statement was created
+        self.assertEqual(self.adapter.count(), 1)
+        self.assertEqual([statement.text for statement in self.adapter.filter()], ['Hello'])
+        self.assertEqual(self.adapter.get_random().text, 'Hello')
+
+    def test_reads_round_robin(self):
+        replica_indexes = [self.adapter.get_read_session().info['read_replica'] for _ in range(4)]
+
+        self.assertEqual(replica_indexes, [0, 1, 0, 1])
+
+    def test_unhealthy_replica_is_skipped(self):
+        os.remove(self.get_path('replica0.sqlite3'))
+
+        replica_indexes = [self.adapter.get_read_session().info['read_replica'] for _ in range(3)]
+
+        self.assertEqual(replica_indexes, [1, 1, 1])
+
+    def test_replica_is_checked_again_after_interval(self):
+        self.adapter.replica_check_interval = 0
+        self.adapter._replica_checks[0] = (0, False, )
+
+        self.assertEqual(self.adapter.get_read_session().info['read_replica'], 0)
+
+    def test_no_healthy_replicas_use_primary(self):
+        for index in range(2):
+            self.adapter._replica_checks[index] = (float('inf'), False, )
+
+        self.adapter.create(text='Hi')
+
+        self.assertNotIn('read_replica', self.adapter.get_read_session().info)
+        self.assertEqual(self.adapter.count(), 2)
+
+    def test_reads_after_write_in_unit_of_work_use_primary(self):
+        with self.adapter.unit_of_work():
+            self.assertEqual(self.adapter.count(), 1)
+
+            self.adapter.create(text='Hi')
+
+            self.assertEqual(self.adapter.count(), 2)
+
+        self.assertEqual(self.adapter.count(), 1)
+
+    def test_slow_check_does_not_block_other_reads(self):
+        from threading import Event, Thread
+
+        check_started = Event()
+        finish_check = Event()
+        check_replica = self.adapter.check_replica
+
+        def slow_check_replica(replica_index):
+            if replica_index == 0:
+                check_started.set()
+                finish_check.wait(5)
+
+            return check_replica(replica_index)
+
+        self.adapter.check_replica = slow_check_replica
+
+        thread = Thread(target=self.adapter.get_read_session)
+        thread.start()
+
+        check_started.wait(5)
+
+        # Replica 0 is being checked, so reads use replica 1 until the check finishes
+        replica_indexes = [self.adapter.get_read_session().info['read_replica'] for _ in range(2)]
+
+        finish_check.set()
+        thread.join()
+
+        self.assertEqual(replica_indexes, [1, 1])
+        self.assertEqual(self.adapter._replica_checks[0][1], True)
@@ -1,5 +1,7 @@
 from unittest import TestCase
-from chatterbot.storage import StorageAdapter
+from chatterbot.conversation import Statement
+from chatterbot.storage import StorageAdapter, InMemoryStorageAdapter
+from chatterbot.storage.storage_adapter import write_method
 
 
 class StorageAdapterTestCase(TestCase):
@@ -53,3 +55,63 @@ class StorageAdapterTestCase(TestCase):
     def test_get_object_invalid(self):
         with self.assertRaises(AttributeError):
             self.adapter.get_object('invalid')
+
+
+class WriteListenerTestCase(TestCase):
+
+    def setUp(self):
+        self.adapter = InMemoryStorageAdapter()
+        self.writes = []
+
+        self.adapter.add_write_listener(self.record_write)
+
+    def record_write(self, method_name, statements, duration):
+        self.writes.append((method_name, statements, duration, ))
+
+    def test_create(self):
+        statement = self.adapter.create(text='Hello')
+
+        method_name, statements, duration = self.writes[0]
+
+        self.assertEqual(method_name, 'create')
+        self.assertEqual(statements, [statement])
+        self.assertGreaterEqual(duration, 0)
+
+    def test_create_many_generator(self):
+        self.adapter.create_many(Statement(text=text) for text in ['A', 'B'])
+
+        self.assertEqual(self.writes[0][0], 'create_many')
+        self.assertEqual([statement.text for statement in self.writes[0][1]], ['A', 'B'])
+        self.assertEqual(self.adapter.count(), 2)
+
+    def test_other_writes(self):
+        self.adapter.create(text='Hello')
+        self.adapter.remove('Hello')
+        self.adapter.drop()
+
+        self.assertEqual([write[0] for write in self.writes], ['create', 'remove', 'drop'])
+        self.assertIsNone(self.writes[1][1])
+
+    def test_failed_write(self):
+        with self.assertRaises(KeyError):
+            self.adapter.create()
+
+        self.assertEqual(self.writes[0][0], 'create')
+        self.assertIsNone(self.writes[0][1])
+
+    def test_nested_writes_are_reported_once(self):
+
+        class OneAtATimeStorageAdapter(InMemoryStorageAdapter):
+
+            @write_method
+            def create_many(self, statements):
+                for statement in statements:
+                    self.create(text=statement.text)
+
+        adapter = OneAtATimeStorageAdapter()
+        adapter.add_write_listener(self.record_write)
+
+        adapter.create_many([Statement(text='A'), Statement(text='B')])
+
+        self.assertEqual([write[0] for write in self.writes], ['create_many'])
+        self.assertEqual(adapter.count(), 2)
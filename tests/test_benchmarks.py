@@ -4,7 +4,7 @@ various chat bot configurations to help prevent
 performance based regressions when changes are made.
 """
 
-from unittest import skip
+from unittest import skip, TestCase
 from warnings import warn
 from random import choice
 from tests.base_case import ChatBotSQLTestCase, ChatBotMongoTestCase
@@ -197,3 +197,76 @@ class MongoBenchmarkingTests(BenchmarkingMixin, ChatBotMongoTestCase):
         trainer.train()
 
         self.assert_response_duration_is_less_than(6)
+
+
+class BenchmarkSuiteTests(TestCase):
+    """
+    Tests for the benchmark suite in ``tests/benchmarks.py``.
+    """
+
+    def test_generate_corpus_size(self):
+        from tests import benchmarks
+
+        conversations = benchmarks.generate_corpus(20, conversation_length=8)
+
+        self.assertEqual(sum(len(conversation) for conversation in conversations), 20)
+
+    def test_generate_corpus_is_repeatable(self):
+        from tests import benchmarks
+
+        self.assertEqual(
+            benchmarks.generate_corpus(10, seed=1),
+            benchmarks.generate_corpus(10, seed=1)
+        )
+
+    def test_summarize(self):
+        from tests import benchmarks
+
+        summary = benchmarks.summarize([0.001 * value for value in range(1, 101)])
+
+        self.assertEqual(summary['count'], 100)
+        self.assertAlmostEqual(summary['p50_ms'], 50.5)
+        self.assertAlmostEqual(summary['p99_ms'], 99.01)
+
+    def test_run_benchmark(self):
+        from tests import benchmarks
+
+        result = benchmarks.run_benchmark(
+            storage='sql',
+            statement_count=40,
+            query_count=4,
+            tagger='lowercase'
+        )
+
+        self.assertEqual(result['statements'], 40)
+        self.assertEqual(result['total']['count'], 4)
+        self.assertEqual(set(result['stages'].keys()), set(benchmarks.STAGES))
+
+    def test_run_query_uses_search_algorithm(self):
+        from unittest.mock import patch
+        from tests import benchmarks
+
+        chatbot = benchmarks.create_chatbot('sql', 'lowercase')
+        search_algorithm = chatbot.logic_adapters[0].search_algorithm
+        timings = {stage: [] for stage in benchmarks.STAGES}
+
+        with patch.object(search_algorithm, 'search', wraps=search_algorithm.search) as search:
+            benchmarks.run_query(chatbot, 'Hello there.', timings, learn=False)
+
+        search.assert_called_once()
+        self.assertEqual(len(timings['search']), 1)
+
+    def test_run_query_times_comparisons(self):
+        from tests import benchmarks
+
+        chatbot = benchmarks.create_chatbot('sql', 'lowercase')
+        chatbot.storage.create(text='Hello there.', in_response_to='Hi.')
+        search_algorithm = chatbot.logic_adapters[0].search_algorithm
+        compare_statements = search_algorithm.compare_statements
+        timings = {stage: [] for stage in benchmarks.STAGES}
+
+        benchmarks.run_query(chatbot, 'Hello there.', timings, learn=False)
+
+        self.assertEqual(len(timings['compare']), 1)
+        self.assertGreater(timings['compare'][0], 0)
+        self.assertIs(search_algorithm.compare_statements, compare_statements)
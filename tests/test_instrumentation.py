@@ -0,0 +1,86 @@
+from unittest import TestCase
+from chatterbot.instrumentation import Instrumentation, HistogramInstrumentation
+from tests.base_case import ChatBotTestCase
+
+
+class HistogramInstrumentationTests(TestCase):
+
+    def setUp(self):
+        self.instrumentation = HistogramInstrumentation(buckets=[0.1, 1.0])
+
+    def test_record(self):
+        self.instrumentation.record('learn', 0.05)
+        self.instrumentation.record('learn', 0.5)
+        self.instrumentation.record('learn', 5)
+
+        histogram = self.instrumentation.get_histogram('learn')
+
+        self.assertEqual(histogram['buckets'], [1, 2])
+        self.assertEqual(histogram['count'], 3)
+        self.assertAlmostEqual(histogram['sum'], 5.55)
+
+    def test_record_labels(self):
+        self.instrumentation.record('process', 0.05, adapter='BestMatch')
+
+        self.assertIsNone(self.instrumentation.get_histogram('process'))
+        self.assertEqual(
+            self.instrumentation.get_histogram('process', adapter='BestMatch')['count'], 1
+        )
+
+    def test_timer(self):
+        with self.instrumentation.timer('tag'):
+            pass
+
+        self.assertEqual(self.instrumentation.get_histogram('tag')['count'], 1)
+
+    def test_export(self):
+        self.instrumentation.record('process', 0.5, adapter='BestMatch')
+
+        lines = self.instrumentation.export().splitlines()
+
+        self.assertIn('chatterbot_process_seconds_bucket{adapter="BestMatch",le="0.1"} 0', lines)
+        self.assertIn('chatterbot_process_seconds_bucket{adapter="BestMatch",le="1.0"} 1', lines)
+        self.assertIn('chatterbot_process_seconds_bucket{adapter="BestMatch",le="+Inf"} 1', lines)
+        self.assertIn('chatterbot_process_seconds_count{adapter="BestMatch"} 1', lines)
+
+    def test_default_instrumentation_ignores_events(self):
+        instrumentation = Instrumentation()
+
+        with instrumentation.timer('tag'):
+            pass
+
+        self.assertFalse(instrumentation.enabled)
+
+
+class ChatBotInstrumentationTests(ChatBotTestCase):
+
+    def get_kwargs(self):
+        kwargs = super().get_kwargs()
+        kwargs['instrumentation'] = 'chatterbot.instrumentation.HistogramInstrumentation'
+        return kwargs
+
+    def test_get_response_events(self):
+        self.chatbot.storage.create(text='Hello', in_response_to='Hi')
+
+        self.chatbot.get_response('Hi')
+
+        instrumentation = self.chatbot.instrumentation
+
+        for event in ['get_response', 'preprocess', 'tag', 'learn']:
+            self.assertEqual(instrumentation.get_histogram(event)['count'], 1, event)
+
+        self.assertEqual(instrumentation.get_histogram('can_process', adapter='BestMatch')['count'], 1)
+        self.assertEqual(instrumentation.get_histogram('process', adapter='BestMatch')['count'], 1)
+        self.assertIsNotNone(instrumentation.get_histogram('storage', method='filter'))
+        self.assertIsNotNone(instrumentation.get_histogram('storage', method='create'))
+
+    def test_instrumentation_instance(self):
+        from chatterbot import ChatBot
+
+        instrumentation = HistogramInstrumentation()
+        chatbot = ChatBot('Test Bot', instrumentation=instrumentation, **super().get_kwargs())
+
+        chatbot.get_response('Hi')
+
+        self.assertIs(chatbot.instrumentation, instrumentation)
+        self.assertEqual(instrumentation.get_histogram('get_response')['count'], 1)
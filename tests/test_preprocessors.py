@@ -78,3 +78,59 @@ class ConvertToASCIIPreprocessorTestCase(ChatBotTestCase):
         normal_text = 'Kluft skrams infor pa federal electoral groe'
 
         self.assertEqual(cleaned.text, normal_text)
+
+
+class PreprocessorPipelineTestCase(ChatBotTestCase):
+    """
+    Make sure that the preprocessor pipeline applies each preprocessor in order.
+    """
+
+    def test_builtin_preprocessors(self):
+        pipeline = preprocessors.PreprocessorPipeline([
+            preprocessors.clean_whitespace,
+            preprocessors.unescape_html,
+            preprocessors.convert_to_ascii
+        ])
+
+        statement = Statement(text='  Klüft   &lt;b&gt;skräms&lt;/b&gt;\n')
+        cleaned = pipeline(statement)
+
+        self.assertEqual(cleaned.text, 'Kluft <b>skrams</b>')
+        self.assertEqual(len(pipeline.steps), 1)
+
+    def test_custom_preprocessor_order(self):
+
+        def add_spaces(statement):
+            statement.text = '  ' + statement.text + '  '
+            return statement
+
+        pipeline = preprocessors.PreprocessorPipeline([
+            preprocessors.clean_whitespace,
+            add_spaces,
+            preprocessors.unescape_html
+        ])
+
+        cleaned = pipeline(Statement(text=' &amp; '))
+
+        self.assertEqual(cleaned.text, '  &  ')
+        self.assertEqual(len(pipeline.steps), 3)
+
+    def test_process_many(self):
+        pipeline = preprocessors.PreprocessorPipeline([
+            preprocessors.clean_whitespace
+        ])
+
+        cleaned = pipeline.process_many([
+            Statement(text=' A  b '),
+            Statement(text='c\td')
+        ])
+
+        self.assertEqual([statement.text for statement in cleaned], ['A b', 'c d'])
+
+    def test_chatbot_pipeline_updated(self):
+        self.chatbot.preprocessors = [preprocessors.unescape_html]
+
+        self.assertEqual(
+            self.chatbot.preprocessor_pipeline.preprocessors,
+            (preprocessors.unescape_html, )
+        )
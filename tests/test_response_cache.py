@@ -0,0 +1,250 @@
+from unittest import TestCase
+from unittest.mock import patch
+from tests.base_case import ChatBotTestCase
+from chatterbot.conversation import Statement
+from chatterbot.response_cache import ResponseCache
+
+
+class ResponseCacheTests(TestCase):
+
+    def setUp(self):
+        self.cache = ResponseCache(max_size=2, ttl=10)
+        self.response = Statement(text='Hello')
+        self.response.confidence = 0.5
+
+    def test_get_missing(self):
+        self.assertIsNone(self.cache.get('key'))
+        self.assertEqual(self.cache.cache_info()['misses'], 1)
+
+    def test_set_and_get(self):
+        self.cache.set('key', self.response, self.cache.write_count)
+
+        self.assertEqual(self.cache.get('key'), ('Hello', 0.5))
+        self.assertEqual(self.cache.cache_info()['hits'], 1)
+
+    def test_key_parameters_are_hashable(self):
+        key = self.cache.get_key('Hi', ['BestMatch'], {'tags': ['greeting'], 'conversation': {'a': 1}})
+
+        self.assertEqual(hash(key), hash(
+            self.cache.get_key('Hi', ['BestMatch'], {'conversation': {'a': 1}, 'tags': ['greeting']})
+        ))
+
+    def test_ttl(self):
+        with patch('chatterbot.response_cache.monotonic', return_value=100):
+            self.cache.set('key', self.response, self.cache.write_count)
+
+        with patch('chatterbot.response_cache.monotonic', return_value=111):
+            self.assertIsNone(self.cache.get('key'))
+
+    def test_max_size(self):
+        self.cache.set('first', self.response, self.cache.write_count)
+        self.cache.set('second', self.response, self.cache.write_count)
+        self.cache.get('first')
+        self.cache.set('third', self.response, self.cache.write_count)
+
+        self.assertIsNotNone(self.cache.get('first'))
+        self.assertIsNone(self.cache.get('second'))
+
+    def test_write_clears_cache(self):
+        self.cache.set('key', self.response, self.cache.write_count)
+
+        self.cache.record_write()
+
+        self.assertIsNone(self.cache.get('key'))
+
+    def test_response_selected_during_write_is_not_saved(self):
+        write_count = self.cache.write_count
+
+        self.cache.record_write()
+        self.cache.set('key', self.response, write_count)
+
+        self.assertIsNone(self.cache.get('key'))
+
+    def test_write_removes_responses_that_share_a_token(self):
+        self.cache.set('weather', self.response, self.cache.write_count, 'weather today')
+        self.cache.set('greeting', self.response, self.cache.write_count, 'hello')
+
+        self.cache.record_write([Statement(text='Sunny', search_text='sunny today')])
+
+        self.assertIsNone(self.cache.get('weather'))
+        self.assertIsNotNone(self.cache.get('greeting'))
+
+    def test_write_removes_responses_that_share_a_response_token(self):
+        self.cache.set('greeting', self.response, self.cache.write_count, 'hello')
+
+        self.cache.record_write([
+            Statement(text='Hey', search_text='hey', search_in_response_to='hello')
+        ])
+
+        self.assertIsNone(self.cache.get('greeting'))
+
+    def test_write_without_search_text_clears_cache(self):
+        self.cache.set('greeting', self.response, self.cache.write_count, 'hello')
+
+        self.cache.record_write([Statement(text='Sunny')])
+
+        self.assertIsNone(self.cache.get('greeting'))
+
+    def test_learning_keeps_response(self):
+        self.cache.set('greeting', self.response, self.cache.write_count, 'hello')
+
+        with self.cache.learning('greeting'):
+            self.cache.record_write([Statement(text='Hello', search_text='hello')])
+
+        self.assertIsNotNone(self.cache.get('greeting'))
+
+    def test_invalidate_by_token_disabled(self):
+        self.cache.invalidate_by_token = False
+        self.cache.set('greeting', self.response, self.cache.write_count, 'hello')
+
+        self.cache.record_write([Statement(text='Sunny', search_text='sunny')])
+
+        self.assertIsNone(self.cache.get('greeting'))
+
+
+class ChatBotResponseCacheTests(ChatBotTestCase):
+
+    def get_kwargs(self):
+        kwargs = super().get_kwargs()
+        kwargs['read_only'] = True
+        kwargs['response_cache'] = 'chatterbot.response_cache.ResponseCache'
+        return kwargs
+
+    def test_repeated_input_uses_cache(self):
+        self.chatbot.storage.create(text='Hello', in_response_to='Hi')
+
+        first = self.chatbot.get_response('Hi')
+
+        with patch.object(self.chatbot, 'generate_response') as generate_response:
+            second = self.chatbot.get_response('Hi')
+
+        generate_response.assert_not_called()
+        self.assertEqual(second.text, first.text)
+        self.assertEqual(second.confidence, first.confidence)
+        self.assertEqual(second.in_response_to, 'Hi')
+
+    def test_cached_response_skips_tagging(self):
+        self.chatbot.storage.create(text='Hello', in_response_to='Hi')
+
+        self.chatbot.get_response('Hi')
+
+        with patch.object(self.chatbot.storage.tagger, 'get_text_index_string') as get_text_index_string:
+            self.chatbot.get_response('Hi')
+
+        get_text_index_string.assert_not_called()
+
+    def test_preprocessed_text_is_the_key(self):
+        self.chatbot.storage.create(text='Hello', in_response_to='Hi')
+
+        self.chatbot.get_response('Hi')
+        self.chatbot.get_response('  Hi ')
+
+        self.assertEqual(self.chatbot.response_cache.cache_info()['hits'], 1)
+
+    def test_additional_parameters_are_part_of_key(self):
+        self.chatbot.storage.create(text='Hello', in_response_to='Hi')
+
+        self.chatbot.get_response('Hi')
+        self.chatbot.get_response('Hi', additional_response_selection_parameters={'conversation': 'other'})
+
+        self.assertEqual(self.chatbot.response_cache.cache_info()['hits'], 0)
+
+    def test_storage_write_clears_cache(self):
+        self.chatbot.storage.create(text='Hello', in_response_to='Hi')
+
+        self.chatbot.get_response('Hi')
+        self.chatbot.storage.create(text='Hey', in_response_to='Hi')
+        self.chatbot.get_response('Hi')
+
+        self.assertEqual(self.chatbot.response_cache.cache_info()['hits'], 0)
+
+    def test_persisted_values_are_not_cached(self):
+        self.chatbot.storage.create(text='Hello', in_response_to='Hi')
+
+        self.chatbot.get_response('Hi', persist_values_to_response={'tags': ['first']})
+        response = self.chatbot.get_response('Hi')
+
+        self.assertEqual(response.get_tags(), [])
+
+    def test_response_cache_disabled_by_default(self):
+        from chatterbot import ChatBot
+
+        chatbot = ChatBot('Test Bot', **super().get_kwargs())
+
+        self.assertIsNone(chatbot.response_cache)
+
+
+class LearningChatBotResponseCacheTests(ChatBotTestCase):
+
+    def get_kwargs(self):
+        kwargs = super().get_kwargs()
+        kwargs['response_cache'] = 'chatterbot.response_cache.ResponseCache'
+        return kwargs
+
+    def test_learning_chat_bot_uses_cache(self):
+        self.chatbot.storage.create(text='Hi there', in_response_to='Hello')
+
+        responses = [self.chatbot.get_response('Hello').text for _ in range(5)]
+
+        self.assertEqual(len(set(responses)), 1)
+        self.assertEqual(self.chatbot.response_cache.cache_info()['hits'], 4)
+        self.assertEqual(self.chatbot.response_cache.cache_info()['misses'], 1)
+
+    def test_learning_from_other_input_keeps_response(self):
+        from chatterbot import ChatBot
+
+        self.chatbot = ChatBot(
+            'Test Bot', storage_adapter='chatterbot.storage.InMemoryStorageAdapter', **self.get_kwargs()
+        )
+
+        self.chatbot.response_cache.set(
+            'other', Statement(text='Hi'), self.chatbot.response_cache.write_count, 'unrelated'
+        )
+
+        self.chatbot.get_response('Hello')
+
+        self.assertIsNotNone(self.chatbot.response_cache.get('other'))
+
+    def test_create_many_generator(self):
+        self.chatbot.storage.create_many(
+            Statement(text=text, search_text=text.lower()) for text in ['A', 'B']
+        )
+
+        self.assertEqual(self.chatbot.storage.count(), 2)
+
+    def test_text_search_disables_invalidate_by_token(self):
+        from chatterbot import ChatBot
+
+        chatbot = ChatBot('Test Bot', logic_adapters=[
+            {
+                'import_path': 'chatterbot.logic.BestMatch',
+                'search_algorithm_name': 'text_search'
+            }
+        ], **self.get_kwargs())
+
+        self.assertFalse(chatbot.response_cache.invalidate_by_token)
+
+    def test_sql_storage_disables_invalidate_by_token(self):
+        self.assertFalse(self.chatbot.response_cache.invalidate_by_token)
+
+    def test_memory_storage_invalidates_by_token(self):
+        from chatterbot import ChatBot
+
+        chatbot = ChatBot(
+            'Test Bot', storage_adapter='chatterbot.storage.InMemoryStorageAdapter', **self.get_kwargs()
+        )
+
+        self.assertTrue(chatbot.response_cache.invalidate_by_token)
+
+    def test_training_part_of_a_token_clears_cache(self):
+        from chatterbot.trainers import ListTrainer
+
+        trainer = ListTrainer(self.chatbot, show_training_progress=False)
+        trainer.train(['hello', 'first answer'])
+
+        self.chatbot.get_response('hello')
+
+        # The SQL storage adapter finds "othello" when searching for "hello"
+        trainer.train(['othello', 'second answer'])
+
+        self.assertEqual(self.chatbot.response_cache.cache_info()['size'], 0)
@@ -1,6 +1,6 @@
 from tests.base_case import ChatBotTestCase
 from chatterbot.conversation import Statement
-from chatterbot.search import TextSearch, IndexedTextSearch
+from chatterbot.search import TextSearch, IndexedTextSearch, BM25Search
 from chatterbot import comparisons
 
 
@@ -284,3 +284,198 @@ class TextSearchComparisonFunctionLevenshteinDistanceComparisonTests(ChatBotTest
         results = list(self.search_algorithm.search(statement))
 
         self.assertIsLength(results, 0)
+
+
+class BM25SearchTests(ChatBotTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.search_algorithm = self.chatbot.search_algorithms[BM25Search.name]
+
+        self.chatbot.storage.create_many([
+            Statement(text='The weather is sunny', search_text='weather sunny'),
+            Statement(text='It is a sunny sunny day', search_text='sunny sunny day'),
+            Statement(text='The match ended in a draw', search_text='match end draw'),
+            Statement(text='Sunny', search_text='sunny', persona='bot:Test Bot'),
+        ])
+
+    def search(self, search_text, **additional_parameters):
+        return list(self.search_algorithm.search(
+            Statement(text=search_text, search_text=search_text), **additional_parameters
+        ))
+
+    def test_registered(self):
+        self.assertIsInstance(self.search_algorithm, BM25Search)
+
+    def test_search_no_results(self):
+        self.assertEqual(self.search('unknown'), [])
+
+    def test_results_are_ordered_by_increasing_confidence(self):
+        results = self.search('sunny weather')
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[-1].text, 'The weather is sunny')
+        self.assertLess(results[0].confidence, results[1].confidence)
+        self.assertLessEqual(results[1].confidence, 1)
+
+    def test_confidence_exact_match(self):
+        results = self.search('sunny sunny day')
+
+        self.assertEqual(results[-1].text, 'It is a sunny sunny day')
+        self.assertAlmostEqual(results[-1].confidence, 1)
+
+    def test_confidence_exact_match_reaches_threshold(self):
+        from chatterbot.logic import BestMatch
+
+        adapter = BestMatch(self.chatbot, search_algorithm_name=BM25Search.name)
+
+        results = self.search('match end draw')
+
+        self.assertGreaterEqual(results[-1].confidence, adapter.maximum_similarity_threshold)
+
+    def test_confidence_partial_match(self):
+        results = self.search('match end')
+
+        self.assertEqual(results[-1].text, 'The match ended in a draw')
+        self.assertLess(results[-1].confidence, 1)
+
+    def test_bot_statements_are_not_returned(self):
+        results = self.search('sunny')
+
+        self.assertNotIn('Sunny', [result.text for result in results])
+
+    def test_max_results(self):
+        self.search_algorithm.max_results = 1
+
+        self.assertEqual(len(self.search('sunny')), 1)
+
+    def test_additional_parameters(self):
+        self.chatbot.storage.create(
+            text='Sunny weather today', search_text='sunny weather', conversation='other'
+        )
+
+        results = self.search('sunny weather', conversation='other')
+
+        self.assertEqual([result.text for result in results], ['Sunny weather today'])
+
+    def test_additional_parameters_are_cached(self):
+        from unittest.mock import patch
+
+        self.search('sunny weather', conversation='other')
+
+        with patch.object(self.chatbot.storage, 'filter', wraps=self.chatbot.storage.filter) as storage_filter:
+            self.search('sunny weather', conversation='other')
+
+        storage_filter.assert_not_called()
+
+    def test_created_statements_match_cached_additional_parameters(self):
+        self.search('sunny weather', conversation='other')
+
+        self.chatbot.storage.create(
+            text='Sunny weather today', search_text='sunny weather', conversation='other'
+        )
+
+        results = self.search('sunny weather', conversation='other')
+
+        self.assertEqual([result.text for result in results], ['Sunny weather today'])
+
+    def test_write_during_index_build_rebuilds_index(self):
+        import threading
+        from unittest.mock import patch
+
+        storage_filter = self.chatbot.storage.filter
+        writes = []
+
+        def filter_and_write(*args, **kwargs):
+            # A write made in another thread while the index is being built
+            write = threading.Thread(target=self.search_algorithm.invalidate_index)
+            write.start()
+            write.join(0.1)
+            writes.append(write)
+
+            return storage_filter(*args, **kwargs)
+
+        with patch.object(self.chatbot.storage, 'filter', filter_and_write):
+            self.search_algorithm.build_index()
+
+        writes[0].join()
+
+        self.assertFalse(self.search_algorithm.index_is_current)
+
+    def test_created_statements_are_indexed(self):
+        self.search('sunny')
+
+        self.chatbot.storage.create(text='Draw again', search_text='draw again')
+
+        self.assertTrue(self.search_algorithm.index_is_current)
+        self.assertEqual(self.search('again')[-1].text, 'Draw again')
+
+    def test_other_writes_rebuild_index(self):
+        self.search('match')
+
+        self.chatbot.storage.remove('The match ended in a draw')
+
+        self.assertFalse(self.search_algorithm.index_is_current)
+        self.assertEqual(self.search('match'), [])
+
+    def test_selectable_by_logic_adapter(self):
+        from chatterbot.logic import BestMatch
+
+        adapter = BestMatch(self.chatbot, search_algorithm_name=BM25Search.name)
+
+        self.assertIs(adapter.search_algorithm, self.search_algorithm)
+
+
+class SearchAlgorithmRegistryTests(ChatBotTestCase):
+
+    def test_default_search_algorithms(self):
+        self.assertEqual(
+            sorted(self.chatbot.search_algorithms),
+            [BM25Search.name, IndexedTextSearch.name, TextSearch.name]
+        )
+
+    def test_search_algorithms_are_created_when_used(self):
+        self.assertNotIn(TextSearch.name, self.chatbot.search_algorithms.instances)
+
+        search_algorithm = self.chatbot.search_algorithms[TextSearch.name]
+
+        self.assertIsInstance(search_algorithm, TextSearch)
+        self.assertIs(self.chatbot.search_algorithms[TextSearch.name], search_algorithm)
+
+    def test_only_used_search_algorithms_are_created(self):
+        self.assertEqual(list(self.chatbot.search_algorithms.instances), [IndexedTextSearch.name])
+
+    def test_search_algorithms_parameter(self):
+        from chatterbot import ChatBot
+
+        chatbot = ChatBot('Test Bot', search_algorithms=[
+            'chatterbot.search.IndexedTextSearch',
+            {
+                'import_path': 'chatterbot.search.BM25Search',
+                'bm25_max_results': 3
+            }
+        ], **self.get_kwargs())
+
+        self.assertEqual(sorted(chatbot.search_algorithms), [BM25Search.name, IndexedTextSearch.name])
+        self.assertEqual(chatbot.search_algorithms[BM25Search.name].max_results, 3)
+
+    def test_search_algorithm_dictionary_requires_import_path(self):
+        from chatterbot import ChatBot
+        from chatterbot.adapters import Adapter
+
+        with self.assertRaises(Adapter.InvalidAdapterTypeException):
+            ChatBot('Test Bot', search_algorithms=[{'bm25_max_results': 3}], **self.get_kwargs())
+
+    def test_register(self):
+        self.chatbot.search_algorithms.register({
+            'import_path': 'chatterbot.search.TextSearch',
+            'search_page_size': 10
+        })
+
+        self.assertEqual(self.chatbot.search_algorithms[TextSearch.name].search_page_size, 10)
+
+    def test_unknown_search_algorithm(self):
+        from chatterbot.logic import BestMatch
+
+        with self.assertRaises(KeyError):
+            BestMatch(self.chatbot, search_algorithm_name='unknown_search')
@@ -0,0 +1,173 @@
+from unittest import TestCase
+from unittest.mock import patch
+from tests.base_case import ChatBotTestCase
+from chatterbot.conversation import Statement
+from chatterbot.tag_classifier import TagClassifier
+
+
+class TagClassifierTests(TestCase):
+
+    def setUp(self):
+        self.classifier = TagClassifier()
+        self.classifier.train([
+            Statement(text='a', search_text='rain forecast', tags=['weather']),
+            Statement(text='b', search_text='sunny forecast', tags=['weather']),
+            Statement(text='c', search_text='goal score', tags=['sports']),
+            Statement(text='d', search_text='match score', tags=['sports']),
+            Statement(text='e', search_text='hello there'),
+        ])
+
+    def test_trained(self):
+        self.assertTrue(self.classifier.trained)
+
+    def test_classify(self):
+        categories = self.classifier.classify('rain forecast')
+
+        self.assertEqual(categories[0][0], 'weather')
+        self.assertAlmostEqual(sum(probability for category, probability in categories), 1)
+
+    def test_classify_unknown_tokens(self):
+        self.assertEqual(self.classifier.classify('unknown words'), [])
+
+    def test_get_tags(self):
+        self.assertEqual(self.classifier.get_tags('match score'), ['sports'])
+
+    def test_get_tags_untagged_input(self):
+        self.assertEqual(self.classifier.get_tags('hello'), [])
+
+    def test_get_tags_max_tags(self):
+        self.classifier.max_tags = 1
+        self.classifier.min_probability = 0
+
+        self.assertEqual(len(self.classifier.get_tags('forecast score')), 1)
+
+    def test_learn(self):
+        self.classifier.learn(Statement(text='f', search_text='recipe', tags=['food']))
+
+        self.assertEqual(self.classifier.get_tags('recipe'), ['food'])
+
+    def test_ensure_trained_once(self):
+        from threading import Thread
+
+        classifier = TagClassifier()
+        statements = [Statement(text='a', search_text='rain forecast', tags=['weather'])]
+        calls = []
+
+        def get_statements():
+            calls.append(1)
+            return statements
+
+        threads = [Thread(target=classifier.ensure_trained, args=(get_statements, )) for _ in range(4)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(classifier.trained)
+
+    def test_ensure_trained_already_trained(self):
+        self.classifier.ensure_trained(lambda: self.fail('The classifier was trained again'))
+
+    def test_reset(self):
+        self.classifier.reset()
+
+        self.assertFalse(self.classifier.trained)
+        self.assertEqual(self.classifier.classify('rain forecast'), [])
+
+
+class ChatBotTagClassifierTests(ChatBotTestCase):
+
+    def get_kwargs(self):
+        kwargs = super().get_kwargs()
+        kwargs['tag_classifier'] = 'chatterbot.tag_classifier.TagClassifier'
+        return kwargs
+
+    def setUp(self):
+        super().setUp()
+
+        self.chatbot.storage.create_many([
+            Statement(text='Rain is forecast', search_text='rain forecast', tags=['weather']),
+            Statement(text='Sun is forecast', search_text='sun forecast', tags=['weather']),
+            Statement(text='The score is tied', search_text='score tie', tags=['sports']),
+            Statement(text='Rain stopped the match', search_text='rain match', tags=['sports']),
+        ])
+
+        self.search_algorithm = self.chatbot.search_algorithms['indexed_text_search']
+
+    def test_tag_classifier_initialized(self):
+        self.assertIsInstance(self.chatbot.tag_classifier, TagClassifier)
+
+    def test_tag_classifier_disabled_by_default(self):
+        from chatterbot import ChatBot
+
+        chatbot = ChatBot('Test Bot', **super().get_kwargs())
+
+        self.assertIsNone(chatbot.tag_classifier)
+
+    def test_search_uses_predicted_tags_first(self):
+        input_statement = Statement(text='Sun is forecast', search_text='sun forecast')
+
+        with patch.object(self.chatbot.storage, 'filter', wraps=self.chatbot.storage.filter) as storage_filter:
+            results = list(self.search_algorithm.search(input_statement))
+
+        self.assertEqual(storage_filter.call_args[1]['tags'], ['weather'])
+        self.assertEqual(results[-1].text, 'Sun is forecast')
+
+    def test_search_all_statements_if_tagged_search_is_empty(self):
+        self.chatbot.tag_classifier.train(self.chatbot.storage.filter())
+
+        input_statement = Statement(text='Rain', search_text='rain')
+
+        with patch.object(self.chatbot.tag_classifier, 'get_tags', return_value=['unused']):
+            results = list(self.search_algorithm.search(input_statement))
+
+        self.assertEqual(len(results), 1)
+
+    def test_search_with_tags_parameter_is_not_routed(self):
+        input_statement = Statement(text='Rain forecast', search_text='rain forecast')
+
+        results = list(self.search_algorithm.search(input_statement, tags=['sports']))
+
+        self.assertEqual(results[-1].text, 'Rain stopped the match')
+        self.assertFalse(self.chatbot.tag_classifier.trained)
+
+    def test_learned_responses_are_added(self):
+        self.chatbot.tag_classifier.train(self.chatbot.storage.filter())
+
+        self.chatbot.learn_response(
+            Statement(text='Pasta recipe', search_text='pasta recipe', tags=['food']),
+            'What should I cook?'
+        )
+
+        self.assertEqual(self.chatbot.tag_classifier.get_tags('pasta'), ['food'])
+
+    def test_search_all_statements_if_tagged_results_are_below_threshold(self):
+        self.chatbot.storage.create_many([
+            Statement(
+                text='The weather is nice today {}'.format(index),
+                search_text='VERB:weather',
+                tags=['weather']
+            ) for index in range(30)
+        ] + [
+            Statement(text='I hate the weather today', search_text='VERB:weather')
+        ])
+
+        input_statement = Statement(text='I hate the weather today', search_text='VERB:weather')
+
+        results = list(self.search_algorithm.search(input_statement))
+
+        self.assertEqual(self.chatbot.tag_classifier.get_tags('VERB:weather'), ['weather'])
+        self.assertEqual(results[-1].text, 'I hate the weather today')
+        self.assertEqual(results[-1].confidence, 1)
+
+    def test_search_stops_at_threshold_in_tagged_results(self):
+        input_statement = Statement(text='Sun is forecast', search_text='sun forecast')
+
+        with patch.object(self.chatbot.storage, 'filter', wraps=self.chatbot.storage.filter) as storage_filter:
+            list(self.search_algorithm.search(input_statement))
+
+        # One call trains the classifier and one searches the tagged statements
+        self.assertEqual(storage_filter.call_count, 2)
@@ -1,3 +1,4 @@
+import os
 from tests.base_case import ChatBotTestCase
 from chatterbot.trainers import ChatterBotCorpusTrainer
 
@@ -62,3 +63,166 @@ class ChatterBotCorpusTrainingTestCase(ChatBotTestCase):
         results = list(self.chatbot.storage.filter(text='Hello'))
 
         self.assertGreater(len(results), 1)
+
+
+class CompiledCorpusTrainingTestCase(ChatBotTestCase):
+    """
+    Test case for training with a compiled corpus.
+    """
+
+    def setUp(self):
+        import tempfile
+
+        super().setUp()
+        self.trainer = ChatterBotCorpusTrainer(
+            self.chatbot,
+            show_training_progress=False
+        )
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.compiled_corpus_path = os.path.join(
+            self.temporary_directory.name, 'greetings.corpus.gz'
+        )
+
+    def tearDown(self):
+        super().tearDown()
+        self.temporary_directory.cleanup()
+
+    def test_train_with_compiled_corpus(self):
+        self.trainer.compile_corpus(
+            self.compiled_corpus_path,
+            'chatterbot.corpus.english.greetings'
+        )
+
+        self.trainer.train(self.compiled_corpus_path)
+
+        compiled_results = [
+            (s.text, s.search_text, s.in_response_to, s.search_in_response_to, s.get_tags())
+            for s in self.chatbot.storage.filter(order_by=['id'])
+        ]
+
+        self.chatbot.storage.drop()
+        self.trainer.train('chatterbot.corpus.english.greetings')
+
+        results = [
+            (s.text, s.search_text, s.in_response_to, s.search_in_response_to, s.get_tags())
+            for s in self.chatbot.storage.filter(order_by=['id'])
+        ]
+
+        self.assertGreater(len(results), 1)
+        self.assertEqual(compiled_results, results)
+
+    def test_compiled_corpus_hash(self):
+        from chatterbot.corpus import read_compiled_corpus, list_corpus_files, get_corpus_hash
+
+        self.trainer.compile_corpus(
+            self.compiled_corpus_path,
+            'chatterbot.corpus.english.greetings'
+        )
+
+        data = read_compiled_corpus(self.compiled_corpus_path)
+
+        self.assertEqual(
+            data['hash'],
+            get_corpus_hash(*list_corpus_files('chatterbot.corpus.english.greetings'))
+        )
+
+    def test_train_with_compiled_corpus_different_tagger(self):
+        from chatterbot.tagging import LowercaseTagger
+
+        self.trainer.compile_corpus(
+            self.compiled_corpus_path,
+            'chatterbot.corpus.english.greetings'
+        )
+
+        self.chatbot.storage.tagger = LowercaseTagger()
+
+        with self.assertRaises(ChatterBotCorpusTrainer.CompiledCorpusException):
+            self.trainer.train(self.compiled_corpus_path)
+
+    def test_train_with_compiled_corpus_again(self):
+        self.trainer.skip_existing_statements = True
+
+        self.trainer.compile_corpus(
+            self.compiled_corpus_path,
+            'chatterbot.corpus.english.greetings'
+        )
+
+        self.trainer.train(self.compiled_corpus_path)
+        count = self.chatbot.storage.count()
+
+        self.trainer.train(self.compiled_corpus_path)
+
+        self.assertEqual(self.chatbot.storage.count(), count)
+
+
+class IncrementalCorpusTrainingTestCase(ChatBotTestCase):
+    """
+    Test case for training with the same corpus more than once.
+    """
+
+    def setUp(self):
+        import tempfile
+
+        super().setUp()
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.trainer = ChatterBotCorpusTrainer(
+            self.chatbot,
+            show_training_progress=False,
+            corpus_manifest_path=os.path.join(self.temporary_directory.name, 'manifest.json')
+        )
+
+    def tearDown(self):
+        super().tearDown()
+        self.temporary_directory.cleanup()
+
+    def test_train_again_skips_existing_statements(self):
+        self.trainer.skip_existing_statements = True
+        self.trainer.train('chatterbot.corpus.english.greetings')
+        count = self.chatbot.storage.count()
+
+        trainer = ChatterBotCorpusTrainer(
+            self.chatbot,
+            show_training_progress=False,
+            skip_existing_statements=True
+        )
+        trainer.train('chatterbot.corpus.english.greetings')
+
+        self.assertEqual(self.chatbot.storage.count(), count)
+
+    def test_train_again_skips_unchanged_files(self):
+        from unittest import mock
+
+        self.trainer.train('chatterbot.corpus.english.greetings')
+
+        with mock.patch('chatterbot.corpus.read_corpus') as read_corpus:
+            self.trainer.train('chatterbot.corpus.english.greetings')
+
+        self.assertFalse(read_corpus.called)
+
+    def test_train_again_without_skipping_existing_statements_uses_manifest(self):
+        from unittest import mock
+
+        trainer = ChatterBotCorpusTrainer(
+            self.chatbot,
+            show_training_progress=False,
+            skip_existing_statements=False,
+            corpus_manifest_path=self.trainer.corpus_manifest_path
+        )
+
+        trainer.train('chatterbot.corpus.english.greetings')
+        count = self.chatbot.storage.count()
+
+        with mock.patch('chatterbot.corpus.read_corpus') as read_corpus:
+            trainer.train('chatterbot.corpus.english.greetings')
+
+        self.assertFalse(read_corpus.called)
+        self.assertEqual(self.chatbot.storage.count(), count)
+
+    def test_train_after_drop_ignores_manifest(self):
+        self.trainer.train('chatterbot.corpus.english.greetings')
+        count = self.chatbot.storage.count()
+
+        self.chatbot.storage.drop()
+        self.trainer.train('chatterbot.corpus.english.greetings')
+
+        self.assertEqual(self.chatbot.storage.count(), count)
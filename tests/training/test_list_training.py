@@ -235,6 +235,89 @@ class ListTrainingTests(ChatBotTestCase):
         self.assertEqual(response2.text, "D")
 
 
+class ListTrainingExistingStatementsTests(ChatBotTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.trainer = ListTrainer(
+            self.chatbot,
+            show_training_progress=False,
+            skip_existing_statements=True
+        )
+
+    def test_training_again_skips_existing_statements(self):
+        conversation = ['Hello', 'Hi there!', 'Hello']
+
+        self.trainer.train(conversation)
+        self.trainer.train(conversation)
+
+        self.assertEqual(self.chatbot.storage.count(), 3)
+
+    def test_training_adds_new_statements(self):
+        self.trainer.train(['Hello', 'Hi there!'])
+        self.trainer.train(['Hello', 'Hi there!', 'How are you?'])
+
+        results = list(self.chatbot.storage.filter(text='How are you?'))
+
+        self.assertEqual(self.chatbot.storage.count(), 3)
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].in_response_to, 'Hi there!')
+        self.assertEqual(
+            results[0].search_in_response_to,
+            self.chatbot.storage.tagger.get_text_index_string('Hi there!')
+        )
+
+    def test_existing_fingerprints_are_read_once(self):
+        from unittest.mock import patch
+
+        with patch.object(self.chatbot.storage, 'filter', wraps=self.chatbot.storage.filter) as storage_filter:
+            self.trainer.train(['Hello', 'Hi there!'])
+            self.trainer.train(['How are you?', 'I am good.'])
+            self.trainer.train(['Hello', 'Hi there!'])
+
+        self.assertEqual(storage_filter.call_count, 1)
+        self.assertEqual(self.chatbot.storage.count(), 4)
+
+    def test_training_again_after_drop(self):
+        self.trainer.train(['Hello', 'Hi there!'])
+
+        self.chatbot.storage.drop()
+
+        self.trainer.train(['Hello', 'Hi there!'])
+
+        self.assertEqual(self.chatbot.storage.count(), 2)
+
+    def test_reset_existing_fingerprints(self):
+        self.trainer.train(['Hello', 'Hi there!'])
+
+        self.chatbot.storage.remove('Hi there!')
+        self.trainer.reset_existing_fingerprints()
+
+        self.trainer.train(['Hello', 'Hi there!'])
+
+        self.assertEqual(self.chatbot.storage.count(), 2)
+
+    def test_training_again_without_skipping_existing_statements(self):
+        trainer = ListTrainer(
+            self.chatbot,
+            show_training_progress=False,
+            skip_existing_statements=False
+        )
+
+        trainer.train(['Hello', 'Hi there!'])
+        trainer.train(['Hello', 'Hi there!'])
+
+        self.assertEqual(self.chatbot.storage.count(), 4)
+
+    def test_existing_statements_are_not_skipped_by_default(self):
+        trainer = ListTrainer(self.chatbot, show_training_progress=False)
+
+        trainer.train(['Hello', 'Hi there!'])
+        trainer.train(['Hello', 'Hi there!'])
+
+        self.assertEqual(self.chatbot.storage.count(), 4)
+
+
 class ChatterBotResponseTests(ChatBotTestCase):
 
     def setUp(self):
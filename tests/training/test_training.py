@@ -1,5 +1,9 @@
+import os
+import json
+import gzip
+import tempfile
 from tests.base_case import ChatBotTestCase
-from chatterbot.trainers import Trainer
+from chatterbot.trainers import Trainer, ListTrainer
 from chatterbot.conversation import Statement
 
 
@@ -19,8 +23,146 @@ class TrainingTests(ChatBotTestCase):
             Statement(text='Hello, how are you?'),
             Statement(text='I am good.', in_response_to='Hello, how are you?')
         ])
-        data = self.trainer._generate_export_data()
+        data = list(self.trainer._generate_export_data())
 
         self.assertEqual(
             [['Hello, how are you?', 'I am good.']], data
         )
+
+
+class ExportTrainingTests(ChatBotTestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        self.trainer = ListTrainer(self.chatbot, show_training_progress=False)
+        self.directory = tempfile.TemporaryDirectory()
+
+        self.chatbot.storage.create_many([
+            Statement(text='Hello, how are you?'),
+            Statement(text='I am good.', in_response_to='Hello, how are you?'),
+            Statement(text='Ça va bien.', in_response_to='I am good.')
+        ])
+
+    def tearDown(self):
+        super().tearDown()
+        self.directory.cleanup()
+
+    def get_path(self, file_name):
+        return os.path.join(self.directory.name, file_name)
+
+    def test_export_json(self):
+        file_path = self.get_path('export.json')
+        self.trainer.export_for_training(file_path)
+
+        with open(file_path, encoding='utf8') as export_file:
+            data = json.load(export_file)
+
+        self.assertEqual(data, {'conversations': [
+            ['Hello, how are you?', 'I am good.'],
+            ['I am good.', 'Ça va bien.']
+        ]})
+
+    def test_export_json_empty(self):
+        self.chatbot.storage.drop()
+
+        file_path = self.get_path('export.json')
+        self.trainer.export_for_training(file_path)
+
+        with open(file_path, encoding='utf8') as export_file:
+            data = json.load(export_file)
+
+        self.assertEqual(data, {'conversations': []})
+
+    def test_export_jsonl(self):
+        file_path = self.get_path('export.jsonl')
+        self.trainer.export_for_training(file_path)
+
+        with open(file_path, encoding='utf8') as export_file:
+            lines = export_file.read().splitlines()
+
+        self.assertEqual(lines, [
+            '["Hello, how are you?", "I am good."]',
+            '["I am good.", "Ça va bien."]'
+        ])
+
+    def test_export_gzip(self):
+        file_path = self.get_path('export.jsonl.gz')
+        self.trainer.export_for_training(file_path)
+
+        with gzip.open(file_path, 'rt', encoding='utf8') as export_file:
+            lines = export_file.read().splitlines()
+
+        self.assertEqual(len(lines), 2)
+
+    def test_train_from_export(self):
+        for file_name in ['export.json', 'export.jsonl', 'export.json.gz', 'export.jsonl.gz']:
+            file_path = self.get_path(file_name)
+            self.trainer.export_for_training(file_path)
+
+            self.chatbot.storage.drop()
+            self.trainer.train_from_export(file_path)
+
+            self.assertEqual(
+                list(self.trainer._generate_export_data()),
+                [['Hello, how are you?', 'I am good.'], ['I am good.', 'Ça va bien.']]
+            )
+
+    def test_train_from_export_is_tagged(self):
+        file_path = self.get_path('export.jsonl')
+        self.trainer.export_for_training(file_path)
+
+        self.chatbot.storage.drop()
+        self.trainer.train_from_export(file_path)
+
+        response = list(self.chatbot.storage.filter(
+            text='I am good.', in_response_to='Hello, how are you?'
+        ))[0]
+
+        self.assertEqual(
+            response.search_in_response_to,
+            self.chatbot.storage.tagger.get_text_index_string('Hello, how are you?')
+        )
+
+    def test_train_from_export_batches(self):
+        file_path = self.get_path('export.jsonl')
+        self.trainer.export_for_training(file_path)
+
+        self.chatbot.storage.drop()
+        self.trainer.train_from_export(file_path, batch_size=1)
+
+        # Each pair is trained as a conversation with the same number of
+        # statements as training each pair with ListTrainer.train
+        self.assertEqual(self.chatbot.storage.count(), 4)
+
+    def test_train_from_export_skips_existing_statements(self):
+        self.trainer.skip_existing_statements = True
+
+        file_path = self.get_path('export.jsonl')
+        self.trainer.export_for_training(file_path)
+
+        self.chatbot.storage.drop()
+        self.trainer.train_from_export(file_path)
+        self.trainer.train_from_export(file_path)
+
+        self.assertEqual(self.chatbot.storage.count(), 4)
+
+    def test_train_from_export_keeps_repeated_pairs(self):
+        file_path = self.get_path('export.jsonl')
+
+        with open(file_path, 'w', encoding='utf8') as export_file:
+            for _ in range(3):
+                export_file.write(json.dumps(['Hi', 'Hello']) + '\n')
+
+        self.chatbot.storage.drop()
+        self.trainer.train_from_export(file_path)
+
+        self.assertEqual(len(list(self.chatbot.storage.filter(text='Hello', in_response_to='Hi'))), 3)
+
+    def test_train_from_export_does_not_keep_fingerprints(self):
+        file_path = self.get_path('export.jsonl')
+        self.trainer.export_for_training(file_path)
+
+        self.trainer.train_from_export(file_path)
+
+        self.assertEqual(self.trainer.existing_fingerprints, {})
@@ -96,6 +96,31 @@ class DjangoStorageAdapterTests(DjangoAdapterTestCase):
         with self.assertRaises(StorageAdapter.EmptyDatabaseException):
             self.adapter.get_random()
 
+    def test_get_random_after_remove(self):
+        self.adapter.create(text="A")
+        self.adapter.create(text="B")
+        self.adapter.create(text="C")
+        self.adapter.remove("A")
+        self.adapter.remove("C")
+
+        random_statement = self.adapter.get_random()
+        self.assertEqual(random_statement.text, "B")
+
+    def test_get_random_returns_statement_after_gap(self):
+        from unittest.mock import patch
+
+        self.adapter.create(text="A")
+        self.adapter.create(text="B")
+        self.adapter.create(text="C")
+        removed_id = Statement.objects.get(text="B").id
+        self.adapter.remove("B")
+
+        # A random id inside the gap selects the statement that follows it
+        with patch('random.randint', return_value=removed_id):
+            random_statement = self.adapter.get_random()
+
+        self.assertEqual(random_statement.text, "C")
+
     def test_filter_by_text_multiple_results(self):
         self.adapter.create(
             text="Do you like this?",
@@ -230,6 +255,40 @@ class DjangoAdapterFilterTests(DjangoAdapterTestCase):
         self.assertIn("Hi everyone!", results_text_list)
         self.assertIn("The air contains Oxygen.", results_text_list)
 
+    def test_filter_fields(self):
+        from chatterbot.conversation import StatementRecord
+
+        self.adapter.create(text='Hello', in_response_to='Hi')
+
+        results = list(self.adapter.filter(fields=['id', 'text', 'in_response_to']))
+
+        self.assertEqual(len(results), 1)
+        self.assertIsInstance(results[0], StatementRecord)
+        self.assertIsNotNone(results[0].id)
+        self.assertEqual(results[0].text, 'Hello')
+        self.assertEqual(results[0].in_response_to, 'Hi')
+        self.assertIsNone(results[0].conversation)
+
+    def test_filter_fields_by_tag(self):
+        self.adapter.create(text='Hello', tags=['greeting'])
+        self.adapter.create(text='The air contains Oxygen.', tags=['fact'])
+
+        results = list(self.adapter.filter(tags=['greeting'], fields=['text']))
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].text, 'Hello')
+
+    def test_filter_prefetches_tags(self):
+        self.adapter.create(text='A', tags=['first', 'letter'])
+        self.adapter.create(text='B', tags=['second', 'letter'])
+
+        # One query for the statements and one for the tags
+        with self.assertNumQueries(2):
+            results = list(self.adapter.filter())
+            tags = [result.get_tags() for result in results]
+
+        self.assertEqual(len(tags), 2)
+
     def test_filter_page_size(self):
         self.adapter.create(text='A')
         self.adapter.create(text='B')
@@ -244,6 +303,18 @@ class DjangoAdapterFilterTests(DjangoAdapterTestCase):
         self.assertIn('B', results_text_list)
         self.assertIn('C', results_text_list)
 
+    def test_filter_pages_use_one_query(self):
+        for text in 'ABCDE':
+            self.adapter.create(text=text, tags=['letter'])
+
+        # One query for the statements and one for the tags of each page
+        with self.assertNumQueries(4):
+            results = list(self.adapter.filter(page_size=2))
+            tags = [result.get_tags() for result in results]
+
+        self.assertEqual([result.text for result in results], list('ABCDE'))
+        self.assertEqual(tags, [['letter']] * 5)
+
     def test_confidence(self):
         """
         Test that the confidence value is not saved to the database.
@@ -466,6 +537,48 @@ class StorageAdapterCreateTests(DjangoAdapterTestCase):
         self.assertEqual(len(results[0].get_tags()), 1)
         self.assertEqual(results[0].get_tags(), ['ab'])
 
+    def test_create_many_existing_tags(self):
+        self.adapter.create(text='A', tags=['letter'])
+
+        self.adapter.create_many([
+            StatementObject(text='B', tags=['letter']),
+            StatementObject(text='C')
+        ])
+
+        results = list(self.adapter.filter(tags=['letter']))
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual(self.adapter.count(), 3)
+
+    def test_create_many_tags_without_returned_rows(self):
+        from unittest.mock import patch
+        from django.db import connection
+
+        with patch.object(connection.features, 'can_return_rows_from_bulk_insert', False):
+            self.adapter.create_many([
+                StatementObject(text='A', tags=['letter']),
+                StatementObject(text='B')
+            ])
+
+        results = list(self.adapter.filter(tags=['letter']))
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].text, 'A')
+
+    def test_filter_fields_before_django_2(self):
+        from unittest.mock import patch
+
+        self.adapter.create_many([
+            StatementObject(text='A'),
+            StatementObject(text='B')
+        ])
+
+        # QuerySet.iterator only accepts a chunk_size in Django 2.0 and later
+        with patch('django.VERSION', (1, 11)):
+            results = list(self.adapter.filter(fields=['text']))
+
+        self.assertEqual([result.text for result in results], ['A', 'B'])
+
 
 class StorageAdapterUpdateTests(DjangoAdapterTestCase):
     """
@@ -497,3 +610,142 @@ class StorageAdapterUpdateTests(DjangoAdapterTestCase):
         self.assertEqual(len(statements), 1)
         self.assertEqual(len(statements[0].get_tags()), 1)
         self.assertEqual(statements[0].get_tags(), ['ab'])
+
+
+class StorageAdapterDeduplicationTests(DjangoAdapterTestCase):
+    """
+    Tests for storing one statement for each text and in_response_to pair.
+    """
+
+    def setUp(self):
+        self.adapter = DjangoStorageAdapter(deduplicate_statements=True)
+
+    def test_create_duplicate(self):
+        self.adapter.create(text='Hi', in_response_to='Hello')
+        statement = self.adapter.create(text='Hi', in_response_to='Hello', tags=['greeting'])
+
+        self.assertEqual(self.adapter.count(), 1)
+        self.assertEqual(statement.occurrences, 2)
+        self.assertEqual(statement.get_tags(), ['greeting'])
+
+    def test_create_different_in_response_to(self):
+        self.adapter.create(text='Hi', in_response_to='Hello')
+        self.adapter.create(text='Hi')
+
+        self.assertEqual(self.adapter.count(), 2)
+
+    def test_create_many_duplicates(self):
+        self.adapter.create(text='Hi', in_response_to='Hello', tags=['a'])
+
+        self.adapter.create_many([
+            StatementObject(text='Hi', in_response_to='Hello', tags=['a', 'b']),
+            StatementObject(text='Hi', in_response_to='Hello'),
+            StatementObject(text='Hello')
+        ])
+
+        results = list(self.adapter.filter(text='Hi'))
+
+        self.assertEqual(self.adapter.count(), 2)
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].occurrences, 3)
+        self.assertEqual(sorted(results[0].get_tags()), ['a', 'b'])
+
+
+    def test_create_keeps_latest_last_seen_at(self):
+        from datetime import datetime
+        from pytz import UTC
+
+        self.adapter.create(text='Hi', in_response_to='Hello', last_seen_at=datetime(2020, 2, 1, tzinfo=UTC))
+        statement = self.adapter.create(
+            text='Hi', in_response_to='Hello', last_seen_at=datetime(2020, 1, 1, tzinfo=UTC)
+        )
+
+        self.assertEqual(statement.last_seen_at, datetime(2020, 2, 1, tzinfo=UTC))
+
+    def test_unique_statement_index(self):
+        self.assertFalse(self.adapter.has_unique_statements())
+
+        self.adapter.compact()
+
+        self.adapter._has_unique_statements = None
+
+        self.assertTrue(self.adapter.has_unique_statements())
+
+    def test_create_with_unique_statement_index(self):
+        self.adapter.compact()
+
+        self.adapter.create(text='Hi', in_response_to='Hello', tags=['a'])
+        self.adapter.create_many([
+            StatementObject(text='Hi', in_response_to='Hello', tags=['b']),
+            StatementObject(text='Hello')
+        ])
+        statement = self.adapter.create(text='Hi', in_response_to='Hello')
+
+        self.assertEqual(self.adapter.count(), 2)
+        self.assertEqual(statement.occurrences, 3)
+        self.assertEqual(sorted(statement.get_tags()), ['a', 'b'])
+
+    def test_create_with_unique_statement_index_without_ignore_conflicts(self):
+        from unittest.mock import patch
+        from django.db import connection
+
+        self.adapter.compact()
+        self.adapter.create(text='Hi', in_response_to='Hello', tags=['a'])
+
+        # Versions of Django before 2.2 cannot ignore conflicts in a bulk insert
+        with patch.object(connection.features, 'supports_ignore_conflicts', False):
+            self.adapter.create_many([
+                StatementObject(text='Hi', in_response_to='Hello', tags=['b']),
+                StatementObject(text='Hello', tags=['c'])
+            ])
+
+        statement = list(self.adapter.filter(text='Hi'))[0]
+
+        self.assertEqual(self.adapter.count(), 2)
+        self.assertEqual(statement.occurrences, 2)
+        self.assertEqual(sorted(statement.get_tags()), ['a', 'b'])
+        self.assertEqual(list(self.adapter.filter(text='Hello'))[0].get_tags(), ['c'])
+
+    def test_duplicate_is_rejected_with_unique_statement_index(self):
+        from django.db import IntegrityError, transaction
+
+        self.adapter.compact()
+        self.adapter.create(text='Hi')
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Statement.objects.create(text='Hi')
+
+
+class StorageAdapterCompactTests(DjangoAdapterTestCase):
+    """
+    Tests for combining duplicate statements.
+    """
+
+    def test_compact(self):
+        self.adapter.create(text='Hi', in_response_to='Hello', tags=['a'])
+        self.adapter.create(text='Hi', in_response_to='Hello', tags=['b'])
+        self.adapter.create(text='Hi', in_response_to='Hello')
+        self.adapter.create(text='Hi')
+
+        removed_count = self.adapter.compact()
+
+        results = list(self.adapter.filter(text='Hi', in_response_to='Hello'))
+
+        self.assertEqual(removed_count, 2)
+        self.assertEqual(self.adapter.count(), 2)
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].occurrences, 3)
+        self.assertEqual(sorted(results[0].get_tags()), ['a', 'b'])
+
+    def test_compact_command(self):
+        from io import StringIO
+        from django.core.management import call_command
+
+        self.adapter.create(text='Hi', in_response_to='Hello')
+        self.adapter.create(text='Hi', in_response_to='Hello')
+
+        output = StringIO()
+        call_command('compactstatements', stdout=output)
+
+        self.assertEqual(self.adapter.count(), 1)
+        self.assertIn('Removed 1 duplicate statements.', output.getvalue())
@@ -0,0 +1,50 @@
+import os
+import tempfile
+from django.test import TestCase
+from chatterbot.conversation import Statement
+from chatterbot.storage import DjangoStorageAdapter, SQLStorageAdapter, migrate
+
+
+class DjangoMigrationTests(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+        self.source = DjangoStorageAdapter()
+
+        # The destination is written to from a background thread
+        self.dest = SQLStorageAdapter(
+            database_uri='sqlite:///' + os.path.join(self.directory.name, 'dest.sqlite3')
+        )
+
+    def tearDown(self):
+        self.source.drop()
+        self.dest.drop()
+        self.dest.engine.dispose()
+        self.directory.cleanup()
+
+    def test_migrate_from_django(self):
+        self.source.create_many([
+            Statement(text='Hello', tags=['greeting']),
+            Statement(text='Hi', in_response_to='Hello', search_text='custom:hi'),
+        ])
+
+        migrated = migrate(self.source, self.dest, batch_size=1)
+
+        statements = list(self.dest.filter(order_by=['id']))
+
+        self.assertEqual(migrated, 2)
+        self.assertEqual([statement.text for statement in statements], ['Hello', 'Hi'])
+        self.assertEqual(statements[0].get_tags(), ['greeting'])
+        self.assertEqual(statements[1].in_response_to, 'Hello')
+        self.assertEqual(statements[1].search_text, 'custom:hi')
+
+    def test_source_statements_are_not_changed(self):
+        self.source.create(text='Hello', tags=['greeting'])
+
+        migrate(self.source, self.dest)
+
+        statement = list(self.source.filter(text='Hello'))[0]
+
+        self.assertIsNotNone(statement.id)
+        self.assertEqual(statement.get_tags(), ['greeting'])